@@ -0,0 +1,7 @@
+"""
+Minimal Pokedex - Headless JSON API
+Entry point: uvicorn api:app
+"""
+from src.server.api import create_app
+
+app = create_app()
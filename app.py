@@ -6,28 +6,67 @@ import streamlit as st
 from src.ui.home import show_home_view
 from src.ui.detail import show_detail_view
 from src.ui.battle import show_battle_view
+from src.ui.team import show_team_view
+from src.ui.tournament import show_tournament_view
+from src.ui.profiles import show_profiles_view
+from src.ui.diagnostics import show_diagnostics_view
+from src.services.warmup_service import start_warmup
+from src.services.profiling_service import get_profiling_mode, profile_rerun, PROFILE_MODES
+from src.services.chat_store import get_session_id
+from src.config.constants import ADMIN_ENABLED
 
 # Set page config
 st.set_page_config(page_title="Minimal Pokedex", page_icon="🔴", layout="wide")
 
+# Prefetch common data in the background (runs once per process)
+start_warmup()
+
 # --- Sidebar Navigation ---
 with st.sidebar:
     st.title("🔴 Pokedex AI")
-    app_mode = st.radio("Menu", ["Pokedex", "Battle Analyzer"], index=0)
+    menu = ["Pokedex", "Battle Analyzer", "Team Builder", "Tournament"] + (["Profiles", "Diagnostics"] if ADMIN_ENABLED else [])
+    app_mode = st.radio("Menu", menu, index=0)
+    if ADMIN_ENABLED:
+        get_profiling_mode()
+        st.selectbox(
+            "Profile reruns", [None] + list(PROFILE_MODES), key="profiling_mode",
+            format_func=lambda m: "Off" if m is None else m.title(),
+        )
     st.markdown("---")
     st.markdown("Powered by **Groq** & **PokeAPI**")
 
 # --- Main App Logic ---
-if app_mode == "Battle Analyzer":
-    show_battle_view()
+if 'view' not in st.session_state:
+    st.session_state.view = 'home'
+if 'selected_pokemon' not in st.session_state:
+    st.session_state.selected_pokemon = None
+
+if app_mode == "Profiles":
+    view_name = 'profiles'
+elif app_mode == "Diagnostics":
+    view_name = 'diagnostics'
+elif app_mode == "Battle Analyzer":
+    view_name = 'battle'
+elif app_mode == "Team Builder":
+    view_name = 'team'
+elif app_mode == "Tournament":
+    view_name = 'tournament'
 else:
-    # Pokedex Mode (Home/Detail)
-    if 'view' not in st.session_state:
-        st.session_state.view = 'home'
-    if 'selected_pokemon' not in st.session_state:
-        st.session_state.selected_pokemon = None
+    view_name = st.session_state.view
 
-    if st.session_state.view == 'home':
+# Opt-in profiling of this session's reruns (?profile=1 or the admin toggle; admin only)
+with profile_rerun(view_name, get_profiling_mode(), get_session_id()):
+    if view_name == 'profiles':
+        show_profiles_view()
+    elif view_name == 'diagnostics':
+        show_diagnostics_view()
+    elif view_name == 'battle':
+        show_battle_view()
+    elif view_name == 'team':
+        show_team_view()
+    elif view_name == 'tournament':
+        show_tournament_view()
+    elif view_name == 'home':
         show_home_view()
-    elif st.session_state.view == 'detail':
+    elif view_name == 'detail':
         show_detail_view()
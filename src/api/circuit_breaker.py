@@ -0,0 +1,116 @@
+"""
+Circuit Breaker
+Per-endpoint breakers that stop calling a failing upstream until a probe succeeds
+"""
+import threading
+import time
+
+from src.config.constants import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After failure_threshold failures in a row the breaker opens and every
+    call fails fast. Once reset_seconds have passed, one caller is let
+    through as a probe (half-open): success closes the breaker, failure
+    opens it again for another reset_seconds.
+    """
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Check whether a call may go ahead
+
+        Raises:
+            CircuitOpen: If the breaker is open, or half-open with a probe in flight
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+        raise CircuitOpen(f"{self.name} is failing; not calling it for now")
+
+    def on_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def on_skipped(self):
+        """The call was never made (e.g. no rate-limit capacity); free the probe slot without a verdict"""
+        with self._lock:
+            self._probing = False
+
+    def on_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def stats(self):
+        """
+        Current breaker state
+
+        Returns:
+            dict: {'state', 'failures', 'rejected', 'trips'}
+        """
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures, 'rejected': self.rejected,
+                    'trips': self.trips}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint):
+    """
+    Get the process-wide breaker for an endpoint
+
+    Args:
+        endpoint (str): Endpoint name (e.g. 'pokeapi/pokemon')
+
+    Returns:
+        CircuitBreaker: Shared breaker
+    """
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint)
+        return _breakers[endpoint]
+
+
+def get_all_breaker_stats():
+    """Stats for every breaker created so far"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.stats() for name, breaker in breakers.items()}
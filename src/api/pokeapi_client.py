@@ -2,11 +2,133 @@
 PokeAPI Client
 Handles all HTTP requests to PokeAPI with caching
 """
-import streamlit as st
+import time
+from urllib.parse import urlparse
+
 import requests
+from src.config.constants import (
+    API_CONNECT_TIMEOUT,
+    API_TIMEOUT,
+    API_CACHE_TTL,
+    API_CACHE_STALE_TTL,
+    API_CACHE_MAX_ENTRIES,
+    API_MAX_RETRIES,
+    RATE_LIMIT_INTERACTIVE_WAIT,
+)
+from src.api.shared_cache import stale_while_revalidate
+from src.api.rate_limiter import (
+    get_limiter,
+    parse_retry_after,
+    current_priority,
+    RateLimitTimeout,
+    PRIORITY_INTERACTIVE,
+)
+from src.api.circuit_breaker import get_breaker, CircuitOpen
+
+
+class PokeAPIRateLimited(requests.RequestException):
+    """PokeAPI kept answering 429 after all retries"""
+
+
+class PokeAPIUnavailable(requests.RequestException):
+    """The endpoint's circuit breaker is open, so no request was made"""
+
+
+class PokeAPIError(Exception):
+    """PokeAPI could not be reached (as opposed to the resource not existing)"""
+
+
+def _endpoint(url):
+    """Breaker name for a URL: the resource type, e.g. 'pokeapi/pokemon-species'"""
+    parts = urlparse(url).path.strip('/').split('/')
+    return "pokeapi/" + (parts[2] if len(parts) > 2 else "root")
+
+
+def request_json(url):
+    """
+    Fetch a JSON document from PokeAPI without caching
+    
+    Used directly by bulk index builds so they don't flush the shared cache.
+    Every call waits for a token from the PokeAPI rate limiter at the
+    calling thread's priority, and 429s are retried after Retry-After.
+    Interactive callers wait at most RATE_LIMIT_INTERACTIVE_WAIT seconds in
+    total, and fail at once when a 429 closed the limiter for longer, so a
+    rate-limit storm can't hang page loads. Timeouts, connection errors
+    and 5xx responses count against the endpoint's circuit breaker; while
+    it is open, calls fail fast.
+    
+    Args:
+        url (str): Full PokeAPI URL
+        
+    Returns:
+        dict: Decoded JSON response
+        
+    Raises:
+        requests.RequestException: On network errors, non-2xx responses,
+            an open circuit (PokeAPIUnavailable) or no rate-limit capacity
+            (PokeAPIRateLimited)
+    """
+    breaker = get_breaker(_endpoint(url))
+    try:
+        breaker.before_call()
+    except CircuitOpen as e:
+        raise PokeAPIUnavailable(str(e)) from e
+    
+    limiter = get_limiter("pokeapi")
+    priority = current_priority()
+    deadline = time.monotonic() + RATE_LIMIT_INTERACTIVE_WAIT if priority == PRIORITY_INTERACTIVE else None
+    upstream_ok = False
+    sent = False
+    try:
+        for _ in range(API_MAX_RETRIES + 1):
+            try:
+                limiter.acquire(priority, timeout=max(0.0, deadline - time.monotonic()) if deadline else None)
+            except RateLimitTimeout as e:
+                upstream_ok = sent  # earlier attempts got 429s: busy, not broken
+                raise PokeAPIRateLimited(f"Rate limited by PokeAPI: {url}") from e
+            sent = True
+            response = requests.get(url, timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT))
+            if response.status_code == 429:
+                limiter.on_rate_limited(parse_retry_after(response.headers))
+                continue
+            limiter.on_success()
+            upstream_ok = response.status_code < 500
+            response.raise_for_status()
+            return response.json()
+        # Busy, not broken
+        upstream_ok = True
+        raise PokeAPIRateLimited(f"Rate limited by PokeAPI: {url}")
+    finally:
+        if upstream_ok:
+            breaker.on_success()
+        elif not sent:
+            breaker.on_skipped()
+        else:
+            breaker.on_failure()
+
+
+@stale_while_revalidate(ttl=API_CACHE_TTL, stale_ttl=API_CACHE_STALE_TTL, max_entries=API_CACHE_MAX_ENTRIES)
+def fetch_json(url):
+    """
+    Fetch and cache a JSON document from PokeAPI
+    
+    Failed requests raise instead of returning None so that errors are
+    never stored in the cache. Entries past API_CACHE_TTL are still
+    served while a background refresh runs, so an upstream incident only
+    affects documents that were never cached.
+    
+    Args:
+        url (str): Full PokeAPI URL
+        
+    Returns:
+        dict: Decoded JSON response
+        
+    Raises:
+        requests.RequestException: On network errors or non-2xx responses
+    """
+    return request_json(url)
 
 
-@st.cache_data
 def get_pokemon_list(limit=50, offset=0):
     """
     Fetch a list of Pokemon from PokeAPI
@@ -19,10 +141,10 @@ def get_pokemon_list(limit=50, offset=0):
         list: List of Pokemon with name and URL
     """
     url = f"https://pokeapi.co/api/v2/pokemon?limit={limit}&offset={offset}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json()['results']
-    return []
+    try:
+        return fetch_json(url)['results']
+    except requests.RequestException:
+        return []
 
 
 def get_pokemon_data(name):
@@ -34,16 +156,27 @@ def get_pokemon_data(name):
         
     Returns:
         dict: Pokemon data or None if not found
+        
+    Raises:
+        PokeAPIError: If PokeAPI is rate limiting or unreachable
     """
     url = f"https://pokeapi.co/api/v2/pokemon/{name}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        return None
+    try:
+        return fetch_json(url)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise PokeAPIError(f"PokeAPI request failed: {e}") from e
+    except requests.RequestException as e:
+        raise PokeAPIError(f"PokeAPI request failed: {e}") from e
+
+
+@stale_while_revalidate(ttl=API_CACHE_TTL, stale_ttl=API_CACHE_STALE_TTL, max_entries=1)
+def _fetch_all_pokemon_names():
+    """Names from the full Pokemon list (raises on failure so errors aren't cached)"""
+    return [p['name'] for p in request_json("https://pokeapi.co/api/v2/pokemon?limit=10000")['results']]
 
 
-@st.cache_data
 def get_all_pokemon_names():
     """
     Fetch all Pokemon names for autocomplete
@@ -51,12 +184,10 @@ def get_all_pokemon_names():
     Returns:
         list: List of all Pokemon names
     """
-    url = "https://pokeapi.co/api/v2/pokemon?limit=10000"
-    response = requests.get(url)
-    if response.status_code == 200:
-        results = response.json()['results']
-        return [p['name'] for p in results]
-    return []
+    try:
+        return _fetch_all_pokemon_names()
+    except requests.RequestException:
+        return []
 
 
 def get_species_data(species_url):
@@ -69,10 +200,10 @@ def get_species_data(species_url):
     Returns:
         dict: Species data or None if failed
     """
-    response = requests.get(species_url)
-    if response.status_code == 200:
-        return response.json()
-    return None
+    try:
+        return fetch_json(species_url)
+    except requests.RequestException:
+        return None
 
 
 def get_evolution_chain_data(evolution_chain_url):
@@ -85,7 +216,23 @@ def get_evolution_chain_data(evolution_chain_url):
     Returns:
         dict: Evolution chain data or None if failed
     """
-    response = requests.get(evolution_chain_url)
-    if response.status_code == 200:
-        return response.json()
-    return None
+    try:
+        return fetch_json(evolution_chain_url)
+    except requests.RequestException:
+        return None
+
+
+def get_move_data(move_name):
+    """
+    Fetch move data
+    
+    Args:
+        move_name (str): Move name (e.g., 'flamethrower')
+        
+    Returns:
+        dict: Move data or None if failed
+    """
+    try:
+        return fetch_json(f"https://pokeapi.co/api/v2/move/{move_name}")
+    except requests.RequestException:
+        return None
@@ -0,0 +1,251 @@
+"""
+Rate Limiter
+Adaptive client-side token buckets with priority scheduling per upstream
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from src.config.constants import RATE_LIMITS, RATE_LIMIT_DEFAULT_BACKOFF, RATE_LIMIT_MAX_BACKOFF
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PREFETCH = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_PREFETCH: "prefetch",
+    PRIORITY_BACKGROUND: "background",
+}
+
+_context = threading.local()
+
+
+@contextmanager
+def request_priority(priority):
+    """
+    Run upstream calls made by this thread at the given priority
+
+    Args:
+        priority (int): One of the PRIORITY_* constants
+    """
+    previous = getattr(_context, "priority", PRIORITY_INTERACTIVE)
+    _context.priority = priority
+    try:
+        yield
+    finally:
+        _context.priority = previous
+
+
+def current_priority():
+    """Priority of upstream calls made by this thread"""
+    return getattr(_context, "priority", PRIORITY_INTERACTIVE)
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a caller waited longer than its timeout for a token"""
+
+
+class _WaitStats:
+    """Queue wait time metrics for one priority level"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=500)
+
+    def record(self, wait):
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self.recent.append(wait)
+
+    def summary(self):
+        recent = sorted(self.recent)
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            'p95_ms': round(recent[int(len(recent) * 0.95) - 1] * 1000, 1) if recent else 0.0,
+            'max_ms': round(self.max * 1000, 1),
+        }
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket that backs off on 429s and serves waiters by priority
+
+    On a 429 the refill rate is halved and the bucket is closed until the
+    Retry-After deadline; each success then restores a fraction of the
+    configured rate (AIMD). Waiters queue in a heap ordered by priority,
+    then arrival, so interactive page loads always go before prefetch and
+    warm-up traffic.
+    """
+
+    def __init__(self, name, rate, burst, min_rate=None):
+        self.name = name
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min_rate or self.max_rate / 16
+        self.burst = burst
+        self.tokens = float(burst)
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._queue = []
+        self._tickets = itertools.count()
+        self._stats = {p: _WaitStats() for p in PRIORITY_NAMES}
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=None, timeout=None):
+        """
+        Block until a token is available for this caller
+
+        Args:
+            priority (int): PRIORITY_* constant, defaults to the thread's priority
+            timeout (float): Give up after this many seconds
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If the timeout elapsed first, or straight away
+                when the bucket is closed (after a 429) past the timeout
+        """
+        if priority is None:
+            priority = current_priority()
+        ticket = (priority, next(self._tickets))
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._queue[0] == ticket and now >= self.blocked_until and self.tokens >= 1:
+                        heapq.heappop(self._queue)
+                        self.tokens -= 1
+                        break
+                    if deadline is not None and (now >= deadline or self.blocked_until > deadline):
+                        self._queue.remove(ticket)
+                        heapq.heapify(self._queue)
+                        raise RateLimitTimeout(f"{self.name}: no capacity within {timeout}s")
+                    wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate, 0.001)
+                    if deadline is not None:
+                        wait = min(wait, deadline - now)
+                    self._cond.wait(wait)
+            finally:
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self._stats[priority].record(waited)
+            return waited
+
+    def on_success(self):
+        """Additively restore the rate after a successful call"""
+        with self._cond:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def on_rate_limited(self, retry_after=None):
+        """
+        Back off after a 429
+
+        Args:
+            retry_after (float): Seconds from the Retry-After header, if any;
+                                 capped at RATE_LIMIT_MAX_BACKOFF
+        """
+        with self._cond:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            delay = min(retry_after if retry_after is not None else RATE_LIMIT_DEFAULT_BACKOFF,
+                        RATE_LIMIT_MAX_BACKOFF)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self._cond.notify_all()
+
+    def share(self, parts):
+        """
+        Keep 1/parts of the configured rate and burst
+
+        Used by each of `parts` worker processes so together they stay
+        within the upstream's limit.
+
+        Args:
+            parts (int): Processes sharing the limit
+        """
+        with self._cond:
+            self.max_rate /= parts
+            self.rate = min(self.rate, self.max_rate)
+            self.min_rate = self.max_rate / 16
+            self.burst = max(1, self.burst // parts)
+            self.tokens = min(self.tokens, self.burst)
+
+    def stats(self):
+        """
+        Current limiter state and queue wait metrics
+
+        Returns:
+            dict: Rate, queue depth, 429 count and per-priority wait summaries
+        """
+        with self._cond:
+            return {
+                'rate': round(self.rate, 2),
+                'max_rate': self.max_rate,
+                'queued': len(self._queue),
+                'throttled': self.throttled,
+                'wait': {PRIORITY_NAMES[p]: s.summary() for p, s in self._stats.items()},
+            }
+
+
+def parse_retry_after(headers):
+    """
+    Read a Retry-After header given in seconds
+
+    Args:
+        headers (Mapping): Response headers
+
+    Returns:
+        float: Seconds to wait, or None if absent or not numeric
+    """
+    value = headers.get("retry-after") if headers else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(upstream):
+    """
+    Get the process-wide limiter for an upstream
+
+    Args:
+        upstream (str): Key in RATE_LIMITS (e.g. 'pokeapi', 'groq')
+
+    Returns:
+        AdaptiveRateLimiter: Shared limiter
+    """
+    with _limiters_lock:
+        if upstream not in _limiters:
+            config = RATE_LIMITS[upstream]
+            _limiters[upstream] = AdaptiveRateLimiter(upstream, config['rate'], config['burst'])
+        return _limiters[upstream]
+
+
+def get_all_limiter_stats():
+    """Stats for every limiter created so far"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()}
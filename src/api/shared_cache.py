@@ -0,0 +1,439 @@
+"""
+Shared Cache
+Host-local cache in shared memory so every Streamlit worker reuses the same data
+"""
+import fcntl
+import functools
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import weakref
+import zlib
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from src.config.constants import (
+    SHARED_CACHE_PATH,
+    SHARED_CACHE_SIZE_MB,
+    SHARED_CACHE_SLOTS,
+    CACHE_REFRESH_WORKERS,
+)
+from src.api.rate_limiter import request_priority, PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PKDXSHM1"
+PROBES = 8
+
+# Header: magic, slot count, data size, next write offset, write stamp
+_HEADER = struct.Struct("<8sQQQQ")
+# Slot: seqlock counter, key hash, record offset, write stamp, record length
+_SLOT = struct.Struct("<QQQQI4x")
+# Record: key hash, expiry (0 = never), payload length, payload crc32
+_RECORD = struct.Struct("<QdII")
+
+_MISS = object()
+
+
+def _reopen_after_fork(cache_ref):
+    cache = cache_ref()
+    if cache is not None:
+        cache._reopen()
+
+
+def _key_hash(key):
+    # 0 marks an empty slot, so never hand it out
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryCache:
+    """
+    Fixed-size cache in a memory-mapped file shared by every process on the host
+
+    Values are JSON payloads appended to a ring buffer, so the oldest
+    entries are overwritten first and the file never grows. A small
+    open-addressing slot table maps key hashes to records.
+
+    Reads take no lock: each slot has a seqlock counter (odd while being
+    written) and each record carries its key hash and a CRC, so a reader
+    that races a writer or follows a slot into an overwritten region sees
+    a miss instead of torn data. Writers serialize on an flock, taken on a
+    descriptor each process (forked children included) opens for itself.
+
+    A file laid out for a different size or slot count is never resized,
+    since other processes may have it mapped; the constructor raises
+    ValueError and the caller falls back to per-process caches.
+    """
+
+    def __init__(self, path=SHARED_CACHE_PATH, size_mb=SHARED_CACHE_SIZE_MB, slots=SHARED_CACHE_SLOTS):
+        self.path = path
+        self.slots = slots
+        self.data_size = size_mb * 1024 * 1024
+        self.slots_offset = _HEADER.size
+        self.data_offset = self.slots_offset + slots * _SLOT.size
+        total_size = self.data_offset + self.data_size
+
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._write_lock():
+                size = os.fstat(self._fd).st_size
+                if size == 0:
+                    os.ftruncate(self._fd, total_size)
+                elif size != total_size:
+                    raise ValueError(f"{path} is {size} bytes, expected {total_size}")
+                self._mm = mmap.mmap(self._fd, total_size)
+                magic, n_slots, data_size, _, _ = _HEADER.unpack_from(self._mm, 0)
+                if magic == bytes(len(MAGIC)):
+                    _HEADER.pack_into(self._mm, 0, MAGIC, slots, self.data_size, 0, 0)
+                elif magic != MAGIC or n_slots != slots or data_size != self.data_size:
+                    self._mm.close()
+                    raise ValueError(f"{path} has a different cache layout")
+        except (OSError, ValueError):
+            os.close(self._fd)
+            raise
+        os.register_at_fork(after_in_child=functools.partial(_reopen_after_fork, weakref.ref(self)))
+
+    def _reopen(self):
+        """
+        Give a forked child its own lock descriptor
+
+        flock locks belong to the open file, which a forked child shares
+        with its parent, so without this the two wouldn't exclude each other.
+        """
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_RDWR)
+
+    def _write_lock(self):
+        cache = self
+
+        class _Lock:
+            def __enter__(self):
+                cache._thread_lock.acquire()
+                fcntl.flock(cache._fd, fcntl.LOCK_EX)
+
+            def __exit__(self, *exc):
+                fcntl.flock(cache._fd, fcntl.LOCK_UN)
+                cache._thread_lock.release()
+
+        return _Lock()
+
+    def _slot_pos(self, index):
+        return self.slots_offset + index * _SLOT.size
+
+    def _probe(self, key_hash):
+        start = key_hash % self.slots
+        for i in range(PROBES):
+            yield (start + i) % self.slots
+
+    def _read_record(self, offset, length, key_hash):
+        """Copy out and validate a record; returns the payload or _MISS"""
+        end = self.data_offset + offset + _RECORD.size + length
+        if offset + _RECORD.size + length > self.data_size:
+            return _MISS
+        raw = self._mm[self.data_offset + offset:end]
+        rec_hash, expires, rec_length, crc = _RECORD.unpack_from(raw, 0)
+        payload = raw[_RECORD.size:]
+        if rec_hash != key_hash or rec_length != length or zlib.crc32(payload) != crc:
+            return _MISS
+        if expires and expires < time.time():
+            return _MISS
+        return payload
+
+    def get(self, key, default=None):
+        """
+        Look up a key without taking any lock
+
+        Args:
+            key (str): Cache key
+            default: Returned on a miss
+
+        Returns:
+            Decoded value or default
+        """
+        key_hash = _key_hash(key)
+        for index in self._probe(key_hash):
+            pos = self._slot_pos(index)
+            seq, slot_hash, offset, _, length = _SLOT.unpack_from(self._mm, pos)
+            if seq % 2:
+                return default  # slot is being rewritten
+            if slot_hash == 0:
+                return default
+            if slot_hash != key_hash:
+                continue
+            payload = self._read_record(offset, length, key_hash)
+            if payload is _MISS or _SLOT.unpack_from(self._mm, pos)[0] != seq:
+                return default
+            return json.loads(payload)
+        return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a JSON-serializable value
+
+        Values larger than a quarter of the ring are not cached.
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value
+            ttl (float): Seconds until expiry, None for no expiry
+        """
+        payload = json.dumps(value, separators=(',', ':')).encode()
+        length = len(payload)
+        if _RECORD.size + length > self.data_size // 4:
+            return
+        key_hash = _key_hash(key)
+        expires = time.time() + ttl if ttl else 0.0
+
+        with self._write_lock():
+            _, _, _, write_offset, stamp = _HEADER.unpack_from(self._mm, 0)
+            if write_offset + _RECORD.size + length > self.data_size:
+                write_offset = 0
+            record = _RECORD.pack(key_hash, expires, length, zlib.crc32(payload)) + payload
+            start = self.data_offset + write_offset
+            self._mm[start:start + len(record)] = record
+            stamp += 1
+            _HEADER.pack_into(self._mm, 0, MAGIC, self.slots, self.data_size,
+                              write_offset + len(record), stamp)
+
+            # Reuse this key's slot, else an empty one, else the oldest write
+            target = None
+            oldest = None
+            for index in self._probe(key_hash):
+                _, slot_hash, _, slot_stamp, _ = _SLOT.unpack_from(self._mm, self._slot_pos(index))
+                if slot_hash in (0, key_hash):
+                    target = index
+                    break
+                if oldest is None or slot_stamp < oldest[1]:
+                    oldest = (index, slot_stamp)
+            if target is None:
+                target = oldest[0]
+
+            pos = self._slot_pos(target)
+            seq = _SLOT.unpack_from(self._mm, pos)[0]
+            struct.pack_into("<Q", self._mm, pos, seq + 1)
+            _SLOT.pack_into(self._mm, pos, seq + 1, key_hash, write_offset, stamp, length)
+            struct.pack_into("<Q", self._mm, pos, seq + 2)
+
+    def clear(self):
+        """Drop every entry for all processes"""
+        with self._write_lock():
+            self._mm[:self.data_offset] = bytes(self.data_offset)
+            _HEADER.pack_into(self._mm, 0, MAGIC, self.slots, self.data_size, 0, 0)
+
+    def stats(self):
+        """
+        Summarize cache usage
+
+        Returns:
+            dict: {'entries', 'slots', 'bytes', 'capacity_bytes'}
+        """
+        entries = 0
+        payload_bytes = 0
+        for index in range(self.slots):
+            _, slot_hash, _, _, length = _SLOT.unpack_from(self._mm, self._slot_pos(index))
+            if slot_hash:
+                entries += 1
+                payload_bytes += length
+        return {'entries': entries, 'slots': self.slots, 'bytes': payload_bytes,
+                'capacity_bytes': self.data_size}
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    Get this process's handle to the host-wide cache
+
+    Returns:
+        SharedMemoryCache: Shared cache, or None when disabled or unavailable
+    """
+    global _shared_cache
+    if not SHARED_CACHE_PATH or not SHARED_CACHE_SIZE_MB:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = SharedMemoryCache()
+            except (OSError, ValueError) as e:
+                logger.warning("Shared cache unavailable at %s (%s), using per-process caches", SHARED_CACHE_PATH, e)
+                _shared_cache = False
+    return _shared_cache or None
+
+
+def shared_cache_data(ttl=None, **cache_data_kwargs):
+    """
+    Drop-in replacement for st.cache_data backed by the shared cache
+
+    Falls back to st.cache_data when the shared cache is unavailable.
+    Exceptions propagate and are never cached; return values must be
+    JSON-serializable. There is no clear(): the shared cache can only be
+    wiped as a whole, for every function and process on the host, so
+    entries are retired by ttl instead.
+
+    Args:
+        ttl (float): Seconds until entries expire
+        **cache_data_kwargs: Passed to st.cache_data on fallback
+    """
+    def decorator(func):
+        cache = get_shared_cache()
+        if cache is None:
+            return st.cache_data(ttl=ttl, **cache_data_kwargs)(func)
+
+        prefix = f"{func.__module__}.{func.__qualname__}:"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = prefix + json.dumps([args, sorted(kwargs.items())], default=str)
+            value = cache.get(key, _MISS)
+            if value is _MISS:
+                value = func(*args, **kwargs)
+                cache.set(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+class LocalCache:
+    """
+    In-process LRU with the same get/set interface as SharedMemoryCache
+
+    Used when the shared cache is unavailable. Values are stored as JSON
+    so callers get a fresh copy on every read, as with the shared cache.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires, payload)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, payload = entry
+            if expires and expires < time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+        return json.loads(payload)
+
+    def set(self, key, value, ttl=None):
+        payload = json.dumps(value, separators=(',', ':'))
+        with self._lock:
+            self._entries[key] = (time.time() + ttl if ttl else 0.0, payload)
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'slots': self.max_entries,
+                    'bytes': sum(len(p) for _, p in self._entries.values()), 'capacity_bytes': None}
+
+
+# --- Stale-while-revalidate ---
+_refresh_executor = None
+_refreshing = set()
+_swr_stats = Counter()
+_swr_lock = threading.Lock()
+
+
+def _schedule_refresh(key, refresh):
+    """Run refresh() in the background unless this key is already being refreshed"""
+    global _refresh_executor
+    with _swr_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+        _swr_stats['refreshes'] += 1
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=CACHE_REFRESH_WORKERS,
+                                                   thread_name_prefix="cache-refresh")
+
+    def run():
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                refresh()
+        except Exception:
+            logger.debug("Background refresh of %s failed; still serving stale data", key, exc_info=True)
+            with _swr_lock:
+                _swr_stats['refresh_failures'] += 1
+        finally:
+            with _swr_lock:
+                _refreshing.discard(key)
+
+    _refresh_executor.submit(run)
+
+
+def get_swr_stats():
+    """
+    Stale-while-revalidate counters for this process
+
+    Returns:
+        dict: {'fresh', 'stale', 'miss', 'refreshes', 'refresh_failures'}
+    """
+    with _swr_lock:
+        return {k: _swr_stats[k] for k in ('fresh', 'stale', 'miss', 'refreshes', 'refresh_failures')}
+
+
+def stale_while_revalidate(ttl, stale_ttl, max_entries=None):
+    """
+    Cache decorator that serves expired entries while refreshing them
+
+    Entries younger than ttl are returned as is. Older entries, up to
+    ttl + stale_ttl, are still returned immediately and a background
+    thread recomputes them, so a slow or failing upstream only delays
+    true misses. Exceptions propagate and are never cached; return values
+    must be JSON-serializable. Uses the shared cache when available, else
+    an in-process LRU of max_entries.
+
+    Args:
+        ttl (float): Seconds an entry is fresh
+        stale_ttl (float): Further seconds it may be served while stale
+        max_entries (int): Size of the in-process fallback
+    """
+    def decorator(func):
+        cache = get_shared_cache() or LocalCache(max_entries)
+        prefix = f"swr:{func.__module__}.{func.__qualname__}:"
+
+        def compute(key, args, kwargs):
+            value = func(*args, **kwargs)
+            cache.set(key, {'t': time.time(), 'v': value}, ttl + stale_ttl)
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = prefix + json.dumps([args, sorted(kwargs.items())], default=str)
+            entry = cache.get(key, _MISS)
+            if entry is _MISS:
+                with _swr_lock:
+                    _swr_stats['miss'] += 1
+                return compute(key, args, kwargs)
+            stale = time.time() - entry['t'] >= ttl
+            with _swr_lock:
+                _swr_stats['stale' if stale else 'fresh'] += 1
+            if stale:
+                _schedule_refresh(key, lambda: compute(key, args, kwargs))
+            return entry['v']
+
+        wrapper.cache_stats = cache.stats
+        return wrapper
+
+    return decorator
@@ -0,0 +1,85 @@
+"""
+Batch Report CLI
+Enrich a CSV/JSONL file of sets with stats, typing, abilities, evolutions and coverage
+
+Usage:
+    python -m src.cli.batch sets.csv [--out report.jsonl] [--teams teams.jsonl]
+                            [--format csv|jsonl] [--workers N] [--chunk-size N]
+
+Rows are written as they finish, in input order. The output format follows
+the --out extension (.csv or JSONL); without --out, JSONL goes to stdout.
+Consecutive rows with the same "team" also get a team report in --teams.
+Set POKEDEX_SHARED_CACHE_MB (on by default) so workers share fetched data.
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+
+from src.api.pokeapi_client import PokeAPIError
+from src.config.constants import BATCH_WORKERS, BATCH_CHUNK_SIZE
+from src.services.batch_service import (
+    INPUT_FORMATS,
+    OUTPUT_COLUMNS,
+    detect_format,
+    read_sets,
+    iter_enriched,
+    iter_teams,
+    flatten_row,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enrich sets with stats, type and coverage reports")
+    parser.add_argument("sets", help="CSV or JSONL file of sets ('-' for stdin)")
+    parser.add_argument("--format", choices=INPUT_FORMATS, help="input format (default: from the extension)")
+    parser.add_argument("--out", help="report file, CSV if it ends in .csv else JSONL (default: stdout)")
+    parser.add_argument("--teams", help="write one JSONL team report per team here")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE, help="sets per worker task")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or (detect_format(args.sets) if args.sets != "-" else "jsonl")
+    if fmt is None:
+        parser.error("can't tell the input format from the extension; pass --format")
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    source = sys.stdin if args.sets == "-" else open(args.sets, newline="")
+    out = open(args.out, "w", newline="") if args.out else sys.stdout
+    teams_out = open(args.teams, "w") if args.teams else None
+    as_csv = bool(args.out and args.out.endswith(".csv"))
+    writer = csv.DictWriter(out, fieldnames=OUTPUT_COLUMNS) if as_csv else None
+    if writer:
+        writer.writeheader()
+
+    rows = errors = 0
+    try:
+        results = iter_enriched(read_sets(source, fmt), workers=args.workers, chunk_size=args.chunk_size)
+        for result, team in iter_teams(results):
+            if team and teams_out:
+                teams_out.write(json.dumps(team) + "\n")
+            if result is None:
+                continue
+            if writer:
+                writer.writerow(flatten_row(result))
+            else:
+                out.write(json.dumps(result) + "\n")
+            rows += 1
+            errors += bool(result['error'])
+            if rows % args.chunk_size == 0:
+                print(f"\r{rows} rows ({errors} failed)", end="", file=sys.stderr, flush=True)
+    except PokeAPIError as e:
+        print(f"\nCould not load the type chart: {e}", file=sys.stderr)
+        return 1
+    finally:
+        for f in (source, out, teams_out):
+            if f not in (None, sys.stdin, sys.stdout):
+                f.close()
+
+    print(f"\r{rows} rows ({errors} failed)", file=sys.stderr)
+    return 0 if errors == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,31 @@
+"""
+Sprite Manifest CLI
+Refresh which sprite variants exist for every Pokemon, outside the app
+
+Usage:
+    python -m src.cli.sprites [--workers N]
+"""
+import argparse
+import logging
+
+from src.config.constants import DEX_TABLE_WORKERS
+from src.services.sprite_service import refresh_sprite_flags
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the sprite manifest in the dex table")
+    parser.add_argument("--workers", type=int, default=DEX_TABLE_WORKERS, help="parallel PokeAPI fetches")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    result = refresh_sprite_flags(workers=args.workers)
+    if result['built']:
+        status = "complete" if result['failed'] == 0 else "incomplete, run again to resume"
+        print(f"Built the dex table with sprite flags: {result['records']} Pokemon ({status})")
+    else:
+        print(f"Checked {result['records']} Pokemon: {result['changed']} changed, {result['failed']} failed")
+    return 0 if result['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+"""
+Tournament CLI
+Run a round-robin between configured sets from a JSON file
+
+Usage:
+    python -m src.cli.tournament sets.json [--workers N] [--top N] [--out results.json]
+
+The file holds a list of sets as built in the Battle Analyzer:
+    [{"name": "garchomp", "nature": "Jolly", "evs": {"attack": 252, "speed": 252},
+      "moves": ["earthquake", "dragon-claw"], "item": "Choice Scarf"}, ...]
+"""
+import argparse
+import json
+import logging
+import sys
+
+from src.api.pokeapi_client import PokeAPIError
+from src.config.constants import TOURNAMENT_WORKERS
+from src.services.tournament_service import prepare_sides, iter_tournament, summarize
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin 1v1 tournament between configured sets")
+    parser.add_argument("sets", help="JSON file with a list of sets")
+    parser.add_argument("--workers", type=int, default=TOURNAMENT_WORKERS, help="worker processes")
+    parser.add_argument("--top", type=int, default=20, help="ranking rows to print")
+    parser.add_argument("--out", help="write the full ranking and win-rate matrix here as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    with open(args.sets) as f:
+        sets = json.load(f)
+
+    sides, skipped = prepare_sides(sets)
+    if skipped:
+        print(f"Skipped sets: {'; '.join(skipped)}", file=sys.stderr)
+    total = len(sides) * (len(sides) - 1) // 2
+    results = []
+    try:
+        for chunk in iter_tournament(sides, workers=args.workers):
+            results.extend(chunk)
+            print(f"\r{len(results)}/{total} matchups", end="", file=sys.stderr, flush=True)
+    except PokeAPIError as e:
+        print(f"Could not load the type chart: {e}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+
+    summary = summarize(sides, results)
+    for rank, row in enumerate(summary['ranking'][:args.top], 1):
+        print(f"{rank:>3}. {row['label']:<40} {row['win_rate'] * 100:5.1f}%  "
+              f"{row['wins']}W {row['draws']}D {row['losses']}L")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({'labels': [side['label'] for side in sides], **summary}, f)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,123 @@
 """
 Application Constants and Configuration
 """
+import os
+
+# Local directory for persisted indexes, logs and caches
+DATA_DIR = os.environ.get(
+    "POKEDEX_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".data")
+)
+
+# PokeAPI request settings
+API_CONNECT_TIMEOUT = 3.05  # seconds
+API_TIMEOUT = 10  # seconds to read a response
+API_CACHE_TTL = 24 * 60 * 60  # seconds before an entry is refreshed in the background
+API_CACHE_STALE_TTL = 7 * 24 * 60 * 60  # seconds past the TTL an entry may still be served
+API_CACHE_MAX_ENTRIES = 512
+TYPE_CHART_TTL = 24 * 60 * 60  # seconds a derived type chart is reused before it is rebuilt
+API_MAX_RETRIES = 3  # retries after a 429
+
+# Client-side rate limits per upstream (requests per second, burst size)
+RATE_LIMITS = {
+    "pokeapi": {"rate": 20, "burst": 20},
+    "groq": {"rate": 0.5, "burst": 5},
+}
+RATE_LIMIT_DEFAULT_BACKOFF = 1.0  # seconds when a 429 has no Retry-After
+RATE_LIMIT_MAX_BACKOFF = 30.0  # cap on an upstream Retry-After
+RATE_LIMIT_INTERACTIVE_WAIT = 5.0  # seconds a page load may queue for PokeAPI, retries included
+
+# Per-endpoint circuit breakers and background cache refreshes
+BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures before failing fast
+BREAKER_RESET_SECONDS = 30  # seconds before a probe request is let through
+CACHE_REFRESH_WORKERS = 2
+
+# Host-wide shared cache (set POKEDEX_SHARED_CACHE_MB=0 to disable)
+SHARED_CACHE_PATH = os.environ.get(
+    "POKEDEX_SHARED_CACHE_PATH",
+    "/dev/shm/pokedex-cache" if os.path.isdir("/dev/shm") else ""
+)
+SHARED_CACHE_SIZE_MB = int(os.environ.get("POKEDEX_SHARED_CACHE_MB", 64))
+SHARED_CACHE_SLOTS = 4096
+
+# Background warm-up on boot
+WARMUP_WORKERS = 4
+WARMUP_TASKS_PER_SECOND = 5
+WARMUP_TOP_N = 30
+ACCESS_LOG_FLUSH_EVERY = 20  # page views between access log writes
+
+# Speculative prefetch of the detail page's navigation neighbours
+PREFETCH_WORKERS = 2
+PREFETCH_MAX_PER_PAGE = 12
+PREFETCH_SESSION_BUDGET = 60  # Pokemon per session per budget window
+PREFETCH_BUDGET_WINDOW = 5 * 60  # seconds
+PREFETCH_MAX_SESSIONS = 1000  # sessions tracked before the oldest is dropped
+
+# Chat history storage
+CHAT_MAX_MESSAGES_PER_POKEMON = 50
+CHAT_MAX_POKEMON_PER_SESSION = 10
+CHAT_SESSION_IDLE_SECONDS = 24 * 60 * 60
+CHAT_EVICT_EVERY = 100  # writes between idle-session sweeps
+CHAT_RENDER_WINDOW = 20  # messages rendered on the detail page
+
+# Matchup analysis: facts are computed locally, the LLM only writes the narrative
+MATCHUP_NARRATIVE_MAX_TOKENS = 450
+
+# Headless JSON API
+API_MAX_BATCH_SIZE = 1000
+
+# Home page "All Pokemon" browse mode
+BROWSE_PAGE_SIZE = 60
+
+# Local answers for simple chat questions (BM25 score thresholds)
+KNOWLEDGE_MIN_SCORE = 1.5
+KNOWLEDGE_MIN_MARGIN = 0.5
+KNOWLEDGE_MIN_COVERAGE = 0.75  # share of question words the answering fact must contain
+
+# LLM usage accounting and per-session budgets (0 disables a budget)
+LLM_SESSION_TOKEN_BUDGET = int(os.environ.get("POKEDEX_LLM_SESSION_TOKENS", 20000))  # tokens per window
+LLM_SESSION_CALL_BUDGET = int(os.environ.get("POKEDEX_LLM_SESSION_CALLS", 30))  # calls per window
+LLM_BUDGET_WINDOW = 60 * 60  # seconds
+LLM_MAX_TRACKED_SESSIONS = 1000  # sessions tracked before the oldest is dropped
+LLM_RECENT_CALLS = 200  # calls kept for the admin log
+
+# Admin-only pages and toggles (set POKEDEX_ADMIN=1 to enable)
+ADMIN_ENABLED = os.environ.get("POKEDEX_ADMIN", "") not in ("", "0", "false")
+
+# Per-rerun profiling (?profile=1 or ?profile=sampling, ?profile=off to stop)
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+PROFILE_TOP_N = 25
+PROFILE_MAX_FILES = 200  # oldest profiles are deleted beyond this
+
+# Admin memory diagnostics
+DIAGNOSTICS_TRACE_FRAMES = 5  # frames kept per tracemalloc allocation
+DIAGNOSTICS_TOP_N = 25
+
+# Precomputed indexes
+EVOLUTION_INDEX_WORKERS = 4
+EVOLUTION_SAVE_INTERVAL = 60  # seconds between saves of lazily added evolution chains
+DEX_TABLE_WORKERS = 4
+DEX_TABLE_SAVE_EVERY = 100  # records between checkpoint saves while building a table
+DEX_INDEX_REBUILD_EVERY = 100  # records between derived index rebuilds while a table builds
+
+# Team builder beam search
+TEAM_SIZE = 6
+TEAM_BEAM_WIDTH = 8
+TEAM_WEIGHTS = {"defense": 1.0, "offense": 0.75, "stats": 0.5}
+
+# Round-robin tournaments (pairs are split into chunks across a process pool)
+TOURNAMENT_WORKERS = min(4, os.cpu_count() or 1)
+TOURNAMENT_CHUNKS_PER_WORKER = 4
+TOURNAMENT_MAX_SETS = 200
+
+# Batch reports (rows stream through a process pool in chunks)
+BATCH_WORKERS = min(4, os.cpu_count() or 1)
+BATCH_CHUNK_SIZE = 200  # rows per task
+BATCH_PENDING_CHUNKS_PER_WORKER = 2  # chunks queued ahead per worker; bounds memory
+BATCH_PROFILE_CACHE_SIZE = 2048  # Pokemon profiles memoized per worker
+
+# Feature block weights for "similar Pokemon" search
+SIMILARITY_WEIGHTS = {"stats": 1.0, "types": 1.5, "abilities": 0.75}
 
 # Pokemon Generation Data
 GENERATIONS = {
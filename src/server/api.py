@@ -0,0 +1,284 @@
+"""
+Headless JSON API
+ASGI app exposing the services without Streamlit reruns
+"""
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.config.constants import API_MAX_BATCH_SIZE, STAT_CONFIG
+from src.config.natures import NATURES
+from src.api.pokeapi_client import get_pokemon_data, PokeAPIError
+from src.api.circuit_breaker import get_all_breaker_stats
+from src.services.dex_service import get_dex_table
+from src.services.stats_service import calculate_all_stats
+from src.services.type_service import get_type_effectiveness
+from src.services.evolution_service import ensure_species, get_evolution_index
+from src.services.learnset_service import get_learnset_index
+from src.services.ai_service import get_chatbot
+from src.services.matchup_service import build_matchup_facts, make_side
+
+
+class BadRequest(Exception):
+    """Invalid request payload (HTTP 400)"""
+
+
+class NotFound(Exception):
+    """Unknown Pokemon or resource (HTTP 404)"""
+
+
+# --- Helpers ---
+def _get_pokemon(name):
+    """Full Pokemon data, raising NotFound for unknown names"""
+    data = get_pokemon_data(str(name).lower())
+    if not data:
+        raise NotFound(f"Unknown Pokemon: {name}")
+    return data
+
+
+def _caller_id(request):
+    """
+    LLM budget key: the client address
+
+    Client-chosen values such as a session header are not used, since a
+    caller could rotate them to get a fresh budget on every request.
+    """
+    return f"api:{request.client.host if request.client else 'unknown'}"
+
+
+def _get_base_stats(name):
+    """Base stats from the dex table, falling back to PokeAPI"""
+    record = get_dex_table().get(str(name).lower())
+    if record:
+        return record['stats']
+    data = _get_pokemon(name)
+    return {s['stat']['name']: s['base_stat'] for s in data['stats']}
+
+
+def _is_int(value):
+    """Whether a JSON value is an integer (JSON true/false decode as bool, a subclass of int)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _calculate_set(item, base_stats_by_name):
+    """
+    Real stats for one set
+
+    Args:
+        item (dict): {'pokemon' or 'base_stats', 'evs', 'nature', 'level', 'ivs'}
+        base_stats_by_name (dict): Pre-resolved base stats per Pokemon name
+
+    Returns:
+        dict: Real stats
+    """
+    if not isinstance(item, dict):
+        raise BadRequest("Each set must be an object")
+    base_stats = item.get('base_stats')
+    if base_stats:
+        valid_base = (isinstance(base_stats, dict) and set(base_stats) == set(STAT_CONFIG)
+                      and all(_is_int(v) and v > 0 for v in base_stats.values()))
+        if not valid_base:
+            raise BadRequest(f"'base_stats' must map {', '.join(STAT_CONFIG)} to positive integers")
+    else:
+        base_stats = base_stats_by_name.get(str(item.get('pokemon', '')).lower())
+    if not base_stats:
+        raise BadRequest("Each set needs 'pokemon' or 'base_stats'")
+
+    nature = item.get('nature', 'Hardy')
+    if nature not in NATURES:
+        raise BadRequest(f"Unknown nature: {nature}")
+    evs = item.get('evs', {})
+    valid_evs = (isinstance(evs, dict) and set(evs) <= set(STAT_CONFIG)
+                 and all(_is_int(v) and 0 <= v <= 252 for v in evs.values()))
+    if not valid_evs or sum(evs.values()) > 510:
+        raise BadRequest(f"EVs must be 0-252 per stat ({', '.join(STAT_CONFIG)}) and 510 in total")
+    level = item.get('level', 50)
+    ivs = item.get('ivs', 31)
+    if not _is_int(level) or not _is_int(ivs) or not 1 <= level <= 100 or not 0 <= ivs <= 31:
+        raise BadRequest("Level must be 1-100 and IVs 0-31")
+
+    return calculate_all_stats(base_stats, evs, NATURES[nature], level=level, ivs=ivs)
+
+
+def _calculate_sets(sets):
+    """Resolve each distinct Pokemon once, then calculate every set"""
+    names = {str(s['pokemon']).lower() for s in sets
+             if isinstance(s, dict) and 'pokemon' in s and not s.get('base_stats')}
+    base_stats_by_name = {name: _get_base_stats(name) for name in names}
+    return [_calculate_set(item, base_stats_by_name) for item in sets]
+
+
+def _get_batch(body, key):
+    items = body.get(key)
+    if not isinstance(items, list):
+        raise BadRequest(f"'{key}' must be a list")
+    if len(items) > API_MAX_BATCH_SIZE:
+        raise BadRequest(f"At most {API_MAX_BATCH_SIZE} items per batch")
+    return items
+
+
+def _get_names(value, key):
+    """Lowercased names from a non-empty list of strings, else BadRequest"""
+    if not isinstance(value, list) or not value or not all(isinstance(v, str) for v in value):
+        raise BadRequest(f"'{key}' must be a non-empty list of strings")
+    return [v.lower() for v in value]
+
+
+async def _json_body(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise BadRequest("Request body must be JSON")
+    if not isinstance(body, dict):
+        raise BadRequest("Request body must be a JSON object")
+    return body
+
+
+# --- Endpoints ---
+async def health(request):
+    breakers = get_all_breaker_stats()
+    status = 'degraded' if any(b['state'] != 'closed' for b in breakers.values()) else 'ok'
+    # The first call loads the dex table from disk; keep that off the event loop
+    dex_entries = len(await run_in_threadpool(get_dex_table))
+    return JSONResponse({'status': status, 'dex_entries': dex_entries, 'breakers': breakers})
+
+
+async def stats(request):
+    """POST /stats - real stats for one set"""
+    body = await _json_body(request)
+    result = await run_in_threadpool(_calculate_sets, [body])
+    return JSONResponse({'stats': result[0]})
+
+
+async def stats_batch(request):
+    """POST /stats/batch - real stats for many sets in one request"""
+    sets = _get_batch(await _json_body(request), 'sets')
+    return JSONResponse({'results': await run_in_threadpool(_calculate_sets, sets)})
+
+
+async def type_effectiveness(request):
+    """POST /types/effectiveness - defensive multipliers for one type combination"""
+    body = await _json_body(request)
+    types = _get_names(body.get('types'), 'types')
+    result = await run_in_threadpool(get_type_effectiveness, types)
+    return JSONResponse({'effectiveness': result})
+
+
+async def type_effectiveness_batch(request):
+    """POST /types/effectiveness/batch - multipliers for many type combinations"""
+    items = _get_batch(await _json_body(request), 'items')
+    if not all(isinstance(item, dict) for item in items):
+        raise BadRequest("Each item must be an object")
+    type_lists = [_get_names(item.get('types'), 'types') for item in items]
+
+    def run():
+        return [get_type_effectiveness(types) for types in type_lists]
+
+    return JSONResponse({'results': await run_in_threadpool(run)})
+
+
+async def evolution(request):
+    """GET /evolution/{name} - family, next stages and pre-evolution"""
+    name = request.path_params['name'].lower()
+
+    def run():
+        data = _get_pokemon(name)
+        species_name = ensure_species(data['species']['url'])
+        if not species_name:
+            return {'family': [], 'next_stages': [], 'pre_evolution': None}
+        index = get_evolution_index()
+        return {
+            'family': index.get_family(species_name),
+            'next_stages': index.get_next_stages(species_name),
+            'pre_evolution': index.get_pre_evolution(species_name),
+        }
+
+    return JSONResponse(await run_in_threadpool(run))
+
+
+async def learnset_query(request):
+    """POST /learnset - who learns all 'moves', or common/diff between 'pokemon' pair"""
+    body = await _json_body(request)
+    if 'moves' in body:
+        moves = _get_names(body['moves'], 'moves')
+        return JSONResponse({'pokemon': await run_in_threadpool(lambda: get_learnset_index().who_learns(moves))})
+    pair = body.get('pokemon')
+    if not isinstance(pair, list) or len(pair) != 2:
+        raise BadRequest("Provide 'moves' or a 'pokemon' pair")
+    a, b = _get_names(pair, 'pokemon')
+
+    def run():
+        index = get_learnset_index()
+        return {'common': index.common_moves(a, b), 'diff': index.learnset_diff(a, b)}
+
+    return JSONResponse(await run_in_threadpool(run))
+
+
+async def matchup(request):
+    """POST /matchup - AI matchup analysis for two sets"""
+    body = await _json_body(request)
+    p1, p2 = body.get('p1'), body.get('p2')
+    if not isinstance(p1, dict) or not isinstance(p2, dict):
+        raise BadRequest("'p1' and 'p2' must be set objects")
+    for side in (p1, p2):
+        moves = side.get('moves', [])
+        if not isinstance(moves, list) or not all(isinstance(m, str) for m in moves):
+            raise BadRequest("'moves' must be a list of strings")
+
+    def run():
+        p1_data, p2_data = _get_pokemon(p1.get('pokemon')), _get_pokemon(p2.get('pokemon'))
+        p1_stats, p2_stats = _calculate_sets([p1, p2])
+        facts = build_matchup_facts(
+            make_side(p1_data['name'], p1_data, p1.get('moves', []), p1.get('item', 'None'), p1_stats, p1.get('nature', 'Hardy')),
+            make_side(p2_data['name'], p2_data, p2.get('moves', []), p2.get('item', 'None'), p2_stats, p2.get('nature', 'Hardy')),
+        )
+        analysis, win_probability = get_chatbot().analyze_matchup(facts, session_id=_caller_id(request))
+        return {
+            'speed': facts['speed'],
+            'types': facts['types'],
+            'damage': facts['damage'],
+            'analysis': analysis,
+            'win_probability': win_probability,
+        }
+
+    return JSONResponse(await run_in_threadpool(run))
+
+
+# --- Error Handling ---
+async def _bad_request(request, exc):
+    return JSONResponse({'error': str(exc)}, status_code=400)
+
+
+async def _not_found(request, exc):
+    return JSONResponse({'error': str(exc)}, status_code=404)
+
+
+async def _upstream_error(request, exc):
+    return JSONResponse({'error': str(exc)}, status_code=503)
+
+
+def create_app():
+    """
+    Build the ASGI application
+
+    Returns:
+        Starlette: App to serve with any ASGI server (e.g. uvicorn)
+    """
+    return Starlette(
+        routes=[
+            Route("/health", health),
+            Route("/stats", stats, methods=["POST"]),
+            Route("/stats/batch", stats_batch, methods=["POST"]),
+            Route("/types/effectiveness", type_effectiveness, methods=["POST"]),
+            Route("/types/effectiveness/batch", type_effectiveness_batch, methods=["POST"]),
+            Route("/evolution/{name}", evolution),
+            Route("/learnset", learnset_query, methods=["POST"]),
+            Route("/matchup", matchup, methods=["POST"]),
+        ],
+        exception_handlers={
+            BadRequest: _bad_request,
+            NotFound: _not_found,
+            PokeAPIError: _upstream_error,
+        },
+    )
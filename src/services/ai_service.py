@@ -2,8 +2,25 @@
 AI Service - Pokemon Chatbot
 Powered by Groq API (Fast & Free)
 """
+import logging
+import re
+import time
+
 import streamlit as st
-from groq import Groq
+from groq import Groq, RateLimitError
+from src.config.constants import API_MAX_RETRIES, MATCHUP_NARRATIVE_MAX_TOKENS
+from src.api.rate_limiter import get_limiter, parse_retry_after
+from src.services.llm_usage_service import get_usage_ledger, estimate_tokens, LLMBudgetExceeded
+from src.services.knowledge_service import answer_locally
+from src.services.matchup_service import format_fact_sheet, estimate_win_probability
+
+logger = logging.getLogger(__name__)
+
+
+def _format_wait(seconds):
+    """Human-readable wait, e.g. '12 minutes'"""
+    minutes = max(1, round(seconds / 60))
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
 
 
 class PokemonChatbot:
@@ -13,7 +30,56 @@ class PokemonChatbot:
         """Initialize Groq client with API key from secrets"""
         self.client = Groq(api_key=st.secrets["GROQ_API_KEY"])
     
-    def chat(self, pokemon_name, pokemon_data, user_message, chat_history=[]):
+    def _complete(self, feature, session_id, **kwargs):
+        """
+        Create a chat completion through the shared Groq rate limiter
+        
+        The session's LLM budget is checked first (LLMBudgetExceeded is
+        raised without calling Groq). 429 responses slow the limiter down
+        and are retried after Retry-After; the last one is re-raised.
+        Tokens, latency and outcome are recorded either way.
+        
+        Args:
+            feature (str): Feature making the call, for usage accounting
+            session_id (str): Caller's session, for accounting and budgets
+            **kwargs: Passed to chat.completions.create
+        """
+        ledger = get_usage_ledger()
+        model = kwargs.get('model')
+        reservation = ledger.reserve(session_id, feature, model,
+                                     estimate_tokens(kwargs.get('messages', []), kwargs.get('max_tokens')))
+        limiter = get_limiter("groq")
+        outcome, usage = "error", None
+        queue_seconds = response_seconds = 0.0
+        try:
+            for attempt in range(API_MAX_RETRIES + 1):
+                started = time.monotonic()
+                limiter.acquire()
+                sent = time.monotonic()
+                queue_seconds += sent - started
+                try:
+                    response = self.client.chat.completions.create(**kwargs)
+                except RateLimitError as e:
+                    response_seconds += time.monotonic() - sent
+                    limiter.on_rate_limited(parse_retry_after(e.response.headers))
+                    if attempt == API_MAX_RETRIES:
+                        outcome = "rate_limited"
+                        raise
+                    continue
+                response_seconds += time.monotonic() - sent
+                limiter.on_success()
+                outcome, usage = "ok", response.usage
+                return response
+        finally:
+            ledger.record(
+                session_id, feature, model, reservation, outcome,
+                prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+                completion_tokens=getattr(usage, 'completion_tokens', 0) or 0,
+                queue_seconds=queue_seconds,
+                response_seconds=response_seconds,
+            )
+    
+    def chat(self, pokemon_name, pokemon_data, user_message, chat_history=[], session_id=None):
         """
         Chat about a Pokemon with AI context
         
@@ -22,10 +88,21 @@ class PokemonChatbot:
             pokemon_data (dict): Full Pokemon data from API
             user_message (str): User's question
             chat_history (list): Previous conversation messages
+            session_id (str): Caller's session, for LLM usage budgets
             
         Returns:
             str: AI response
         """
+        # Simple factual questions are answered from local data without a Groq call;
+        # if the local lookup fails (e.g. PokeAPI is down), the LLM still gets a go
+        try:
+            local_answer = answer_locally(pokemon_name, user_message)
+        except Exception:
+            logger.warning("Local answer lookup failed for %s; asking the LLM", pokemon_name, exc_info=True)
+            local_answer = None
+        if local_answer:
+            return local_answer
+        
         # Build Pokemon context
         types = [t['type']['name'] for t in pokemon_data.get('types', [])]
         abilities = [a['ability']['name'] for a in pokemon_data.get('abilities', [])]
@@ -69,99 +146,81 @@ Guidelines:
         
         # Generate response with Groq
         try:
-            response = self.client.chat.completions.create(
+            response = self._complete(
+                "chat", session_id,
                 model="llama-3.3-70b-versatile",  # Latest stable model (Dec 2024)
                 messages=messages,
                 temperature=0.7,
                 max_tokens=500
             )
             return response.choices[0].message.content
+        except LLMBudgetExceeded as e:
+            return f"⏳ You've reached the AI chat limit for now. Please try again in {_format_wait(e.retry_after)}."
         except Exception as e:
             error_msg = str(e)
             if "401" in error_msg or "authentication" in error_msg.lower():
                 return f"⚠️ AI service authentication failed. Please check the Groq API key in settings."
             return f"Sorry, I encountered an error: {error_msg}. Please try again!"
 
-    def analyze_matchup(self, p1_name, p1_data, p1_moves, p1_item, p1_stats, p1_nature, p2_name, p2_data, p2_moves, p2_item, p2_stats, p2_nature):
-        """
-        Analyze battle matchup between two Pokemon with Moves, Items, and Real Stats
+    def analyze_matchup(self, facts, session_id=None):
         """
-        # Helper to format stats
-        def format_stats(data, moves, item, real_stats, nature):
-            types = [t['type']['name'] for t in data.get('types', [])]
-            abilities = [a['ability']['name'] for a in data.get('abilities', [])]
-            
-            moves_str = ", ".join(moves) if moves else "Standard Competitive Set (AI Prediction)"
-            item_str = item if item and item != "None" else "Standard Competitive Item (AI Prediction)"
+        Write the strategy and verdict for a matchup
+        
+        Speed order, type interaction and damage ranges are computed
+        locally (matchup_service); only a compact fact sheet is sent, and
+        the model is asked for the narrative the numbers can't give.
+        
+        Args:
+            facts (dict): Output of build_matchup_facts
+            session_id (str): Caller's session, for LLM usage budgets
             
-            return f"""
-            Types: {', '.join(types)}
-            Abilities: {', '.join(abilities)}
-            Base Stats: HP={data['stats'][0]['base_stat']}, Atk={data['stats'][1]['base_stat']}, Def={data['stats'][2]['base_stat']}, ...
-            REAL STATS (Lv 50): HP={real_stats.get('hp')}, Atk={real_stats.get('attack')}, Def={real_stats.get('defense')}, 
-                                SpA={real_stats.get('special-attack')}, SpD={real_stats.get('special-defense')}, Spd={real_stats.get('speed')}
-            Nature: {nature}
-            Held Item: {item_str}
-            Moveset: {moves_str}
-            """
-
-        context = f"""
-        POKEMON 1 (USER): {p1_name.upper()}
-        {format_stats(p1_data, p1_moves, p1_item, p1_stats, p1_nature)}
-
-        POKEMON 2 (OPPONENT): {p2_name.upper()}
-        {format_stats(p2_data, p2_moves, p2_item, p2_stats, p2_nature)}
+        Returns:
+            tuple: (analysis markdown, user's win probability %)
         """
+        p1_name, p2_name = facts['p1']['name'], facts['p2']['name']
+        system_prompt = f"""You are a competitive Pokemon VGC/Smogon analyst. The facts below were calculated exactly at Level 50; trust them and do not redo the math.
 
-        system_prompt = f"""You are a world-class Competitive Pokemon VGC/Smogon Analyst.
-        Analyze the matchup between {p1_name} and {p2_name} in extreme detail.
-        
-        CRITICAL: Use the provided REAL STATS (at Level 50) for all calculations, NOT the Base Stats.
-        Consider the Moves, Items, and Nature provided.
-        
-        DATA:
-        {context}
-        
-        OUTPUT FORMAT (Use Markdown):
-        
-        ### 1. 📊 Matchup Overview
-        Briefly describe the dynamic. Mention how the **Nature/EVs** and **Items** affect the matchup.
-        
-        ### 2. ⚡ Speed & Turn Order
-        - Who moves first? (Compare REAL Speed stats: {p1_stats.get('speed')} vs {p2_stats.get('speed')}).
-        - Does the Item (e.g. Choice Scarf) change this?
-        
-        ### 3. 🛡️ Type Interaction
-        - Analyze Weaknesses/Resistances.
-        
-        ### 4. ⚔️ Damage Potential
-        - Analyze the specific moves provided.
-        - Can {p1_name} OHKO {p2_name} given the Real Attack/SpA vs Real Def/SpD?
-        
-        ### 5. 🧠 Strategy for {p1_name} (User)
-        - How to use the selected moveset effectively.
-        - Win Condition based on the current loadout.
-        
-        ### 6. 🔮 Final Verdict
-        - **Winning Probability:** {p1_name}'s win chance %.
-        - **Winner Prediction:** Who wins 1v1?
-        
-        Keep the tone professional but engaging. Use bolding for key terms."""
+FACTS:
+{format_fact_sheet(facts)}
+
+Write in Markdown, concise, bold key terms:
+### 🧠 Strategy for {p1_name}
+2-4 bullets: how to play the user's set, what to watch out for, win condition.
+### 🔮 Final Verdict
+- **Winning Probability:** {p1_name}'s win chance as N%
+- **Winner Prediction:** one sentence."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._complete(
+                "matchup", session_id,
                 model="llama-3.3-70b-versatile",
                 messages=[{"role": "system", "content": system_prompt}],
                 temperature=0.5,
-                max_tokens=1500
+                max_tokens=MATCHUP_NARRATIVE_MAX_TOKENS
             )
             analysis_text = response.choices[0].message.content
             
-            # Extract win probability using regex
-            import re
-            win_prob_match = re.search(r'Winning Probability[:\s]*(\d+)%', analysis_text, re.IGNORECASE)
-            win_probability = int(win_prob_match.group(1)) if win_prob_match else 50  # Default to 50% if not found
+            # Extract win probability; fall back to the local estimate
+            win_prob_match = re.search(r'Winning Probability[:\s*]*(\d+)%', analysis_text, re.IGNORECASE)
+            win_probability = int(win_prob_match.group(1)) if win_prob_match else estimate_win_probability(facts)
             
             return analysis_text, win_probability
+        except LLMBudgetExceeded as e:
+            return (f"⏳ AI analysis limit reached for now; try again in {_format_wait(e.retry_after)}. "
+                    "The facts above are still exact."), estimate_win_probability(facts)
         except Exception as e:
-            return f"Error analyzing matchup: {str(e)}", 50
+            return f"Error analyzing matchup: {str(e)}", estimate_win_probability(facts)
+
+
+@st.cache_resource(show_spinner=False)
+def get_chatbot():
+    """
+    Get the process-wide chatbot
+    
+    The chatbot holds no per-user state, so one instance (and one Groq
+    client) is shared by every session.
+    
+    Returns:
+        PokemonChatbot: Shared chatbot
+    """
+    return PokemonChatbot()
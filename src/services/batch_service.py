@@ -0,0 +1,409 @@
+"""
+Batch Service
+Enrich large CSV/JSONL files of sets with stats, typing, abilities, evolutions and coverage
+"""
+import csv
+import functools
+import json
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import requests
+
+from src.config.constants import (
+    BATCH_WORKERS,
+    BATCH_CHUNK_SIZE,
+    BATCH_PENDING_CHUNKS_PER_WORKER,
+    BATCH_PROFILE_CACHE_SIZE,
+)
+from src.config.natures import NATURES
+from src.api.pokeapi_client import get_pokemon_data, fetch_json, PokeAPIError
+from src.api.rate_limiter import get_limiter
+from src.services.stats_service import calculate_all_stats, STAT_NAMES, MAX_IV, MAX_EV
+from src.services.type_service import get_type_chart
+from src.services.pokemon_service import get_abilities_info
+from src.services.evolution_service import ensure_species, get_evolution_index
+from src.services.dex_service import get_move_table, make_move_record
+from src.services.matchup_service import type_multiplier
+from src.services.damage_service import DAMAGE_CLASSES, TYPES
+
+INPUT_FORMATS = ("csv", "jsonl")
+
+# Flat columns of a CSV report; lists are joined with "/" and mappings written as "key:value"
+OUTPUT_COLUMNS = (
+    ["row", "team", "name", "id", "nature", "level", "types", "abilities", "hidden_ability",
+     "evolution_stage", "evolves_from", "evolves_to", "fully_evolved", "base_total"]
+    + [f"stat_{stat}" for stat in STAT_NAMES]
+    + ["weaknesses", "resistances", "immunities", "moves", "unknown_moves", "attacking_types",
+       "coverage_assumed", "super_effective", "error"]
+)
+
+
+def _slug(name):
+    return str(name).strip().lower().replace(' ', '-')
+
+
+# --- Input ---
+
+def detect_format(path):
+    """Input format from a file extension, or None if it can't be told"""
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def read_sets(lines, fmt):
+    """
+    Stream raw sets from an open file, one at a time
+
+    JSONL lines are objects such as {"name": "garchomp", "nature": "Jolly",
+    "level": 50, "ivs": 31, "evs": {"attack": 252, "speed": 252},
+    "moves": ["earthquake", "dragon-claw"], "team": "sun-1"}. CSV files use
+    the same column names, with moves separated by "/" and one EV column
+    per stat (ev_hp, ev_attack, ... ev_speed).
+
+    Args:
+        lines (iterable): Open text file
+        fmt (str): One of INPUT_FORMATS
+
+    Yields:
+        dict: Raw set, validated later by normalize_set; a JSONL line that
+              isn't valid JSON yields {'error': ...}
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            raw = {'error': f"invalid JSON: {e}"}
+        yield raw if isinstance(raw, dict) else {'error': "each line must be a JSON object"}
+
+
+def _int(value, default, low, high, field):
+    if value in (None, ""):
+        return default
+    number = int(value)
+    if not low <= number <= high:
+        raise ValueError(f"{field} must be between {low} and {high}")
+    return number
+
+
+def normalize_set(raw):
+    """
+    Validate a raw set and fill in defaults
+
+    Returns:
+        dict: {'name', 'team', 'nature', 'level', 'ivs', 'evs', 'moves'}
+
+    Raises:
+        ValueError: On a missing name, unknown nature or out-of-range number
+    """
+    if raw.get('error'):
+        raise ValueError(raw['error'])
+    if not raw.get('name'):
+        raise ValueError("missing name")
+
+    nature = str(raw.get('nature') or "Hardy").strip().title()
+    if nature not in NATURES:
+        raise ValueError(f"unknown nature {raw['nature']!r}")
+
+    evs = raw.get('evs') or {}
+    if not isinstance(evs, dict):
+        raise ValueError("evs must be an object of stat: value")
+    evs = {stat: _int(evs.get(stat, raw.get(f"ev_{stat}")), 0, 0, MAX_EV, f"{stat} EVs") for stat in STAT_NAMES}
+
+    moves = raw.get('moves') or []
+    if isinstance(moves, str):
+        moves = moves.split('/')
+    return {
+        'name': _slug(raw['name']),
+        'team': raw.get('team') or None,
+        'nature': nature,
+        'level': _int(raw.get('level'), 50, 1, 100, "level"),
+        'ivs': _int(raw.get('ivs'), MAX_IV, 0, MAX_IV, "ivs"),
+        'evs': evs,
+        'moves': [_slug(m) for m in moves if str(m).strip()],
+    }
+
+
+# --- Enrichment (runs in worker processes) ---
+
+_worker_chart = None
+
+
+def _init_worker(chart, workers):
+    global _worker_chart
+    _worker_chart = chart
+    if workers > 1:
+        get_limiter("pokeapi").share(workers)
+
+
+@functools.lru_cache(maxsize=BATCH_PROFILE_CACHE_SIZE)
+def _profile(name):
+    """
+    Per-Pokemon facts shared by every set of it
+
+    The '/pokemon' payload comes through the shared cache and only the
+    fields reports need are kept, so the memo stays small.
+
+    Returns:
+        dict: Profile, or None if the Pokemon doesn't exist
+
+    Raises:
+        PokeAPIError: If PokeAPI can't be reached, including for the
+            evolution chain (not memoized)
+    """
+    data = get_pokemon_data(name)
+    if not data:
+        return None
+    types = [t['type']['name'] for t in data['types']]
+    abilities = get_abilities_info(data)
+    species = data['species']['name']
+    # ensure_species returns None when the species or chain can't be fetched
+    species_name = ensure_species(data['species']['url'])
+    if not species_name:
+        raise PokeAPIError(f"could not load the evolution chain of {name}")
+    family = get_evolution_index().get_family(species_name)
+    entry = next((e for e in family if e['name'] == species), None)
+    defense = {t: type_multiplier(t, types, _worker_chart) for t in TYPES}
+    return {
+        'id': data['id'],
+        'types': types,
+        'base_stats': {s['stat']['name']: s['base_stat'] for s in data['stats']},
+        'abilities': abilities['normal'],
+        'hidden_ability': abilities['hidden'],
+        'evolution_stage': entry['stage'] + 1 if entry else None,
+        'evolves_from': entry['from'] if entry else None,
+        'evolves_to': [e['name'] for e in family if e['from'] == species] if entry else None,
+        'defense': defense,
+    }
+
+
+def _move_record(name):
+    """
+    Compact move record from the move table, falling back to PokeAPI
+
+    Unlike get_move_data, a failed request is not mistaken for an unknown move.
+
+    Returns:
+        dict: Move record, or None if the move doesn't exist
+
+    Raises:
+        PokeAPIError: If PokeAPI can't be reached
+    """
+    record = get_move_table().get(name)
+    if record:
+        return record
+    try:
+        return make_move_record(fetch_json(f"https://pokeapi.co/api/v2/move/{name}"))
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise PokeAPIError(f"PokeAPI request failed: {e}") from e
+    except requests.RequestException as e:
+        raise PokeAPIError(f"PokeAPI request failed: {e}") from e
+
+
+@functools.lru_cache(maxsize=BATCH_PROFILE_CACHE_SIZE)
+def _move_types(moves):
+    """
+    (unknown moves, attacking types of the damaging ones) of a move list; sets often repeat them
+
+    Raises:
+        PokeAPIError: If a move can't be fetched (not memoized)
+    """
+    records = [record for record in map(_move_record, moves) if record]
+    known = {m['name'] for m in records}
+    attacking = {m['type'] for m in records if m['damage_class'] in DAMAGE_CLASSES and m['power']}
+    return [m for m in moves if m not in known], sorted(attacking)
+
+
+@functools.lru_cache(maxsize=BATCH_PROFILE_CACHE_SIZE)
+def _super_effective(attacking):
+    return [t for t in TYPES if any(type_multiplier(a, [t], _worker_chart) > 1 for a in attacking)]
+
+
+def _coverage(pokemon_set, profile):
+    """Attacking types of a set's damaging moves (STAB when it has none) and what they hit"""
+    if pokemon_set['moves']:
+        unknown, attacking = _move_types(tuple(pokemon_set['moves']))
+    else:
+        unknown, attacking = [], list(profile['types'])
+    return {'unknown_moves': unknown, 'attacking_types': attacking, 'coverage_assumed': not pokemon_set['moves'],
+            'super_effective': _super_effective(tuple(attacking))}
+
+
+def enrich_set(row, raw):
+    """
+    Build the report row of one set
+
+    Args:
+        row (int): 1-based position in the input
+        raw (dict): Set as read by read_sets
+
+    Returns:
+        dict: Input fields plus id, types, abilities, evolution, real stats,
+              defensive multipliers and move coverage; on failure only the
+              input fields and 'error'
+    """
+    result = {'row': row, 'team': raw.get('team') or None, 'name': raw.get('name'), 'error': None}
+    try:
+        pokemon_set = normalize_set(raw)
+        result.update(name=pokemon_set['name'], nature=pokemon_set['nature'], level=pokemon_set['level'])
+        profile = _profile(pokemon_set['name'])
+        if profile is None:
+            return dict(result, error="unknown Pokemon")
+        coverage = _coverage(pokemon_set, profile)
+    except (ValueError, TypeError) as e:
+        return dict(result, error=str(e))
+    except PokeAPIError as e:
+        return dict(result, error=f"PokeAPI unavailable: {e}")
+
+    defense = profile['defense']
+    result.update(
+        id=profile['id'],
+        types=profile['types'],
+        abilities=profile['abilities'],
+        hidden_ability=profile['hidden_ability'],
+        evolution_stage=profile['evolution_stage'],
+        evolves_from=profile['evolves_from'],
+        evolves_to=profile['evolves_to'],
+        fully_evolved=None if profile['evolves_to'] is None else not profile['evolves_to'],
+        base_total=sum(profile['base_stats'].values()),
+        stats=calculate_all_stats(profile['base_stats'], pokemon_set['evs'], NATURES[pokemon_set['nature']],
+                                  level=pokemon_set['level'], ivs=pokemon_set['ivs']),
+        evs=pokemon_set['evs'],
+        weaknesses={t: m for t, m in defense.items() if m > 1},
+        resistances={t: m for t, m in defense.items() if 0 < m < 1},
+        immunities=[t for t, m in defense.items() if m == 0],
+        moves=pokemon_set['moves'],
+        **coverage,
+    )
+    return result
+
+
+def _enrich_chunk(chunk):
+    return [enrich_set(row, raw) for row, raw in chunk]
+
+
+def iter_enriched(sets, workers=BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE,
+                  pending_per_worker=BATCH_PENDING_CHUNKS_PER_WORKER):
+    """
+    Enrich a stream of sets across worker processes, in input order
+
+    Input is read lazily and at most workers * pending_per_worker chunks
+    are in flight, so memory stays flat however long the file is.
+    Workers are spawned (not forked) so each opens its own handle to the
+    shared cache, and they split the PokeAPI rate limit between them.
+    With one worker everything runs in-process.
+
+    Args:
+        sets (iterable): Raw sets, e.g. from read_sets
+        workers (int): Worker processes
+        chunk_size (int): Sets per task
+        pending_per_worker (int): Chunks queued ahead per worker
+
+    Yields:
+        dict: enrich_set() row per input set
+    """
+    chart = get_type_chart()
+    numbered = enumerate(sets, 1)
+    chunks = iter(lambda: list(islice(numbered, chunk_size)), [])
+    if workers <= 1:
+        _init_worker(chart, 1)
+        for chunk in chunks:
+            yield from _enrich_chunk(chunk)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(chart, workers)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_enrich_chunk, chunk))
+            if len(pending) >= workers * pending_per_worker:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# --- Output ---
+
+def _cell(value):
+    if isinstance(value, dict):
+        return "/".join(f"{k}:{v:g}" if isinstance(v, float) else f"{k}:{v}" for k, v in value.items())
+    if isinstance(value, list):
+        return "/".join(map(str, value))
+    return "" if value is None else value
+
+
+def flatten_row(result):
+    """Report row as a flat dict of OUTPUT_COLUMNS for CSV output"""
+    flat = {column: _cell(result.get(column)) for column in OUTPUT_COLUMNS}
+    for stat in STAT_NAMES:
+        flat[f"stat_{stat}"] = (result.get('stats') or {}).get(stat, "")
+    return flat
+
+
+def team_report(team, results):
+    """
+    Summarize the consecutive rows of one team
+
+    Args:
+        team (str): Team id
+        results (list): Its enrich_set() rows
+
+    Returns:
+        dict: {'team', 'members', 'errors', 'weaknesses' (types more members are
+              weak to than resist), 'uncovered' (types no member hits super
+              effectively), 'average_speed'}
+    """
+    members = [r for r in results if not r['error']]
+    weaknesses = [
+        t for t in TYPES
+        if sum(t in r['weaknesses'] for r in members)
+        > sum(t in r['resistances'] or t in r['immunities'] for r in members)
+    ]
+    covered = set().union(*(r['super_effective'] for r in members))
+    return {
+        'team': team,
+        'members': [r['name'] for r in members],
+        'errors': len(results) - len(members),
+        'weaknesses': weaknesses,
+        'uncovered': [t for t in TYPES if t not in covered],
+        'average_speed': round(sum(r['stats']['speed'] for r in members) / len(members), 1) if members else None,
+    }
+
+
+def iter_teams(results):
+    """
+    Pass rows through, collecting consecutive rows with the same team
+
+    Args:
+        results (iterable): enrich_set() rows in input order
+
+    Yields:
+        tuple: (row, team report or None); a report is emitted with the
+               first row after its team ends, and with (None, report) at the end
+    """
+    team, members = None, []
+    for result in results:
+        report = None
+        if result['team'] != team:
+            if team is not None:
+                report = team_report(team, members)
+            team, members = result['team'], []
+        if team is not None:
+            members.append(result)
+        yield result, report
+    if team is not None:
+        yield None, team_report(team, members)
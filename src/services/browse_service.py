@@ -0,0 +1,131 @@
+"""
+Browse Service
+Server-side paging, filtering and sorting over the whole dex
+"""
+import bisect
+
+import streamlit as st
+
+from src.config.constants import GENERATIONS, STAT_CONFIG
+from src.services.dex_service import get_dex_table, get_dex_index_key
+
+SORT_KEYS = ["id", "name", "total"] + list(STAT_CONFIG.keys())
+
+# Species id where each generation starts, for bisecting
+_GENERATION_NAMES = list(GENERATIONS.keys())
+_GENERATION_STARTS = [params['offset'] + 1 for params in GENERATIONS.values()]
+
+
+def get_generation(species_id):
+    """
+    Get the generation a species was introduced in
+
+    Args:
+        species_id (int): National dex number of the species
+
+    Returns:
+        str: Key of GENERATIONS
+    """
+    return _GENERATION_NAMES[max(0, bisect.bisect_right(_GENERATION_STARTS, species_id) - 1)]
+
+
+class BrowseIndex:
+    """
+    Dex table indexed for browsing
+
+    Rows are positions in the id-ordered record list. Type and
+    generation filters are precomputed row sets, and every sort key has
+    a precomputed row order, so a query is a few set operations and one
+    pass over the sort order.
+    """
+
+    def __init__(self, records):
+        self.records = sorted(records, key=lambda r: r['id'])
+        self.by_type = {}
+        self.by_generation = {}
+        for row, record in enumerate(self.records):
+            for t in record['types']:
+                self.by_type.setdefault(t, set()).add(row)
+            self.by_generation.setdefault(get_generation(record['species_id']), set()).add(row)
+
+        def sort_value(key):
+            if key == "name":
+                return lambda row: self.records[row]['name']
+            if key == "total":
+                return lambda row: sum(self.records[row]['stats'].values())
+            if key == "id":
+                return lambda row: self.records[row]['id']
+            return lambda row: self.records[row]['stats'].get(key, 0)
+
+        rows = range(len(self.records))
+        self.sort_orders = {key: sorted(rows, key=sort_value(key)) for key in SORT_KEYS}
+
+    def query(self, types=(), generations=(), stat_ranges=None, sort="id", descending=False,
+              page=0, page_size=60):
+        """
+        Get one page of matching Pokemon
+
+        Args:
+            types (iterable): Required types (all must match)
+            generations (iterable): Allowed generations (any may match)
+            stat_ranges (dict): {stat_name or 'total': (min, max)}
+            sort (str): One of SORT_KEYS
+            descending (bool): Reverse the sort order
+            page (int): Zero-based page number
+            page_size (int): Results per page
+
+        Returns:
+            dict: {'total', 'page', 'pages', 'results': [records]}
+        """
+        candidates = None
+        for t in types:
+            rows = self.by_type.get(t, set())
+            candidates = rows if candidates is None else candidates & rows
+        if generations:
+            rows = set().union(*(self.by_generation.get(g, set()) for g in generations))
+            candidates = rows if candidates is None else candidates & rows
+
+        order = self.sort_orders[sort]
+        if descending:
+            order = reversed(order)
+
+        matches = []
+        for row in order:
+            if candidates is not None and row not in candidates:
+                continue
+            if stat_ranges and not self._in_ranges(self.records[row], stat_ranges):
+                continue
+            matches.append(row)
+
+        pages = max(1, -(-len(matches) // page_size))
+        page = min(max(page, 0), pages - 1)
+        page_rows = matches[page * page_size:(page + 1) * page_size]
+        return {
+            'total': len(matches),
+            'page': page,
+            'pages': pages,
+            'results': [self.records[row] for row in page_rows],
+        }
+
+    @staticmethod
+    def _in_ranges(record, stat_ranges):
+        for stat, (low, high) in stat_ranges.items():
+            value = sum(record['stats'].values()) if stat == "total" else record['stats'].get(stat, 0)
+            if not low <= value <= high:
+                return False
+        return True
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_browse_index(dex_key):
+    return BrowseIndex(get_dex_table().snapshot())
+
+
+def get_browse_index():
+    """
+    Get the browse index for the current dex table
+
+    Returns:
+        BrowseIndex: Rebuilt only when the dex table changes
+    """
+    return _build_browse_index(get_dex_index_key())
@@ -0,0 +1,192 @@
+"""
+Chat Store
+Bounded SQLite store for per-session chat history
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+from src.config.constants import (
+    DATA_DIR,
+    CHAT_MAX_MESSAGES_PER_POKEMON,
+    CHAT_MAX_POKEMON_PER_SESSION,
+    CHAT_SESSION_IDLE_SECONDS,
+    CHAT_EVICT_EVERY,
+)
+
+CHAT_DB_PATH = os.path.join(DATA_DIR, "chat_history.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    pokemon TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages (session_id, pokemon, id);
+"""
+
+
+class ChatStore:
+    """
+    Chat history kept on disk instead of in session_state
+
+    Each (session, Pokemon) conversation keeps at most
+    `max_messages` messages, each session keeps at most `max_pokemon`
+    conversations (oldest dropped first), and sessions idle for longer
+    than `idle_seconds` are evicted.
+    """
+
+    def __init__(self, path=CHAT_DB_PATH, max_messages=CHAT_MAX_MESSAGES_PER_POKEMON,
+                 max_pokemon=CHAT_MAX_POKEMON_PER_SESSION, idle_seconds=CHAT_SESSION_IDLE_SECONDS):
+        self.path = path
+        self.max_messages = max_messages
+        self.max_pokemon = max_pokemon
+        self.idle_seconds = idle_seconds
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        """One connection per thread (sqlite3 connections are not shareable)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def touch(self, session_id):
+        """Mark a session as active"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sessions (session_id, last_seen) VALUES (?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET last_seen = excluded.last_seen",
+                (session_id, time.time())
+            )
+
+    def append(self, session_id, pokemon, role, content):
+        """
+        Add a message and enforce the caps
+
+        Args:
+            session_id (str): Browser session id
+            pokemon (str): Pokemon the conversation is about
+            role (str): 'user' or 'assistant'
+            content (str): Message text
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO messages (session_id, pokemon, role, content) VALUES (?, ?, ?, ?)",
+                (session_id, pokemon, role, content)
+            )
+            # Per-Pokemon cap: keep the newest messages
+            conn.execute(
+                "DELETE FROM messages WHERE session_id = ? AND pokemon = ? AND id NOT IN ("
+                "SELECT id FROM messages WHERE session_id = ? AND pokemon = ? ORDER BY id DESC LIMIT ?)",
+                (session_id, pokemon, session_id, pokemon, self.max_messages)
+            )
+            # Per-session cap: drop the least recently used conversations
+            conn.execute(
+                "DELETE FROM messages WHERE session_id = ? AND pokemon NOT IN ("
+                "SELECT pokemon FROM messages WHERE session_id = ? "
+                "GROUP BY pokemon ORDER BY MAX(id) DESC LIMIT ?)",
+                (session_id, session_id, self.max_pokemon)
+            )
+        self.touch(session_id)
+
+        self._writes += 1
+        if self._writes % CHAT_EVICT_EVERY == 0:
+            self.evict_idle()
+
+    def load_window(self, session_id, pokemon, limit):
+        """
+        Load only the newest messages of a conversation
+
+        Args:
+            session_id (str): Browser session id
+            pokemon (str): Pokemon name
+            limit (int): Number of messages to load
+
+        Returns:
+            list: [{'role', 'content'}, ...] oldest first
+        """
+        rows = self._connect().execute(
+            "SELECT role, content FROM messages WHERE session_id = ? AND pokemon = ? "
+            "ORDER BY id DESC LIMIT ?",
+            (session_id, pokemon, limit)
+        ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def count(self, session_id, pokemon):
+        """Number of stored messages in a conversation"""
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM messages WHERE session_id = ? AND pokemon = ?",
+            (session_id, pokemon)
+        ).fetchone()[0]
+
+    def evict_idle(self):
+        """
+        Delete sessions idle for longer than idle_seconds
+
+        Returns:
+            int: Number of sessions evicted
+        """
+        cutoff = time.time() - self.idle_seconds
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM messages WHERE session_id IN "
+                "(SELECT session_id FROM sessions WHERE last_seen < ?)",
+                (cutoff,)
+            )
+            return conn.execute("DELETE FROM sessions WHERE last_seen < ?", (cutoff,)).rowcount
+
+    def stats(self):
+        """
+        Summarize what the store holds
+
+        Returns:
+            dict: {'sessions', 'messages', 'content_bytes', 'file_bytes'}
+        """
+        conn = self._connect()
+        sessions = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        messages, content_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(content AS BLOB))), 0) FROM messages"
+        ).fetchone()
+        file_bytes = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {'sessions': sessions, 'messages': messages, 'content_bytes': content_bytes,
+                'file_bytes': file_bytes}
+
+
+@st.cache_resource(show_spinner=False)
+def get_chat_store():
+    """
+    Get the process-wide chat store
+
+    Returns:
+        ChatStore: Store backed by the local SQLite database
+    """
+    return ChatStore()
+
+
+def get_session_id():
+    """
+    Get a stable id for the current browser session
+
+    Returns:
+        str: Random id kept in session_state
+    """
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
@@ -0,0 +1,237 @@
+"""
+Damage Service
+Damage formula and a vectorized dex-wide threat scan
+"""
+import math
+
+import numpy as np
+import streamlit as st
+
+from src.config.constants import TYPE_ID_MAP
+from src.services.dex_service import get_dex_table, get_move_table, get_dex_index_key, get_move_index_key
+from src.services.type_service import get_type_chart
+from src.services.tier_service import SPREADS
+
+TYPES = list(TYPE_ID_MAP)
+DAMAGE_CLASSES = ("physical", "special")
+ATTACK_STATS = {"physical": "attack", "special": "special-attack"}
+DEFENSE_STATS = {"physical": "defense", "special": "special-defense"}
+STAB = 1.5
+MIN_ROLL = 0.85
+
+# Moves whose listed power overstates what they do in a normal turn
+# (self-KO, recharge, charge-up or conditional moves)
+UNREALISTIC_MOVES = {
+    "explosion", "self-destruct", "misty-explosion", "mind-blown", "steel-beam", "final-gambit",
+    "hyper-beam", "giga-impact", "blast-burn", "frenzy-plant", "hydro-cannon", "rock-wrecker",
+    "roar-of-time", "prismatic-laser", "eternabeam", "meteor-assault", "focus-punch",
+    "dream-eater", "belch", "shell-trap", "skull-bash", "sky-attack", "solar-blade",
+}
+
+
+def calculate_damage(level, power, attack, defense, modifier=1.0):
+    """
+    Main-series damage formula (maximum roll)
+
+    Formula:
+    floor(floor(floor(2 * Level / 5 + 2) * Power * A / D) / 50) + 2, times modifiers
+
+    Args:
+        level (int): Attacker level
+        power (int): Move base power
+        attack (int): Attacker's real Attack or Sp. Atk
+        defense (int): Defender's real Defense or Sp. Def
+        modifier (float): STAB, type effectiveness and other multipliers
+
+    Returns:
+        int: Damage before the random roll
+    """
+    base = math.floor(math.floor(math.floor(2 * level / 5 + 2) * power * attack / defense) / 50) + 2
+    return math.floor(base * modifier)
+
+
+def _damage_array(level, power, attack, defense):
+    """calculate_damage before modifiers, over numpy arrays"""
+    return np.floor(np.floor(np.floor(2 * level / 5 + 2) * power * attack / defense) / 50) + 2
+
+
+def _spread_stats(base, stat_name, level, spread):
+    """Real stats for an array of base stats under a standard spread (see tier_service)"""
+    iv, ev, modifier = SPREADS[spread]
+    if stat_name == "hp":
+        return np.floor((2 * base + iv + ev // 4) * level / 100) + level + 10
+    value = np.floor((2 * base + iv + ev // 4) * level / 100) + 5
+    if modifier != 1.0:
+        value = np.floor(value * modifier)
+    return value
+
+
+class ThreatIndex:
+    """
+    Per-Pokemon STAB power and stat arrays for scanning the whole dex
+
+    stab_type[row, slot] is the type index of each of a Pokemon's types
+    (-1 when it has one type) and stab_power[row, slot, class] is the
+    best usable power it learns of that type and damage class. taken[row,
+    t] is the multiplier it takes from attacking type t. A scan is a few
+    array operations over every row at once.
+    """
+
+    def __init__(self, records, move_table, type_chart):
+        self.records = records
+        self.names = [r['name'] for r in records]
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        type_rows = {t: i for i, t in enumerate(TYPES)}
+
+        self.chart = np.ones((len(TYPES), len(TYPES)), dtype=np.float32)  # [attacking, defending]
+        for i, attacking in enumerate(TYPES):
+            for j, defending in enumerate(TYPES):
+                self.chart[i, j] = type_chart.get(attacking, {}).get(defending, 1.0)
+
+        n = len(records)
+        self.base = {stat: np.array([r['stats'].get(stat, 0) for r in records], dtype=np.float32)
+                     for stat in ("hp", "attack", "defense", "special-attack", "special-defense")}
+        self.stab_type = np.full((n, 2), -1, dtype=np.int16)
+        self.stab_power = np.zeros((n, 2, len(DAMAGE_CLASSES)), dtype=np.float32)
+        self.taken = np.ones((n, len(TYPES)), dtype=np.float32)
+
+        for row, r in enumerate(records):
+            types = [type_rows[t] for t in r['types'] if t in type_rows][:2]
+            for slot, t in enumerate(types):
+                self.stab_type[row, slot] = t
+                self.taken[row] *= self.chart[:, t]
+            self.stab_power[row] = self.best_stab_powers(r['moves'], types, move_table)
+
+    @staticmethod
+    def best_stab_powers(moves, types, move_table):
+        """
+        Best usable power per STAB type and damage class
+
+        Args:
+            moves (iterable): Move names the Pokemon learns
+            types (list): Type indexes of the Pokemon
+            move_table (MoveTable): Move records
+
+        Returns:
+            numpy.ndarray: [slot, class] powers, 0 where it has no such move
+        """
+        powers = np.zeros((2, len(DAMAGE_CLASSES)), dtype=np.float32)
+        slots = {TYPES[t]: slot for slot, t in enumerate(types)}
+        for move_name in moves:
+            move = move_table.get(move_name)
+            if (not move or not move['power'] or move['name'] in UNREALISTIC_MOVES
+                    or move['type'] not in slots or move['damage_class'] not in DAMAGE_CLASSES):
+                continue
+            slot = slots[move['type']]
+            cls = DAMAGE_CLASSES.index(move['damage_class'])
+            powers[slot, cls] = max(powers[slot, cls], move['power'])
+        return powers
+
+    def _best(self, damage, move_types):
+        """Pick each row's best slot/class: returns (damage, type index, class index)"""
+        flat = damage.reshape(len(damage), -1)
+        best = flat.argmax(axis=1)
+        rows = np.arange(len(damage))
+        slot, cls = np.unravel_index(best, damage.shape[1:])
+        return flat[rows, best], move_types[rows, slot], cls
+
+    def _results(self, percent, move_types, classes, exclude, limit):
+        percent[[self.rows[n] for n in exclude if n in self.rows]] = -1
+        results = []
+        for row in np.argsort(percent)[::-1][:limit]:
+            if percent[row] <= 0:
+                break
+            results.append({
+                'name': self.names[row],
+                'move_type': TYPES[move_types[row]],
+                'damage_class': DAMAGE_CLASSES[classes[row]],
+                'min_percent': float(percent[row] * MIN_ROLL),
+                'max_percent': float(percent[row]),
+            })
+        return results
+
+    def threats_to(self, defender_types, defender_stats, level=50, spread="max_plus", limit=10, exclude=()):
+        """
+        Rank every Pokemon by its best STAB hit on one defender
+
+        Args:
+            defender_types (list): Defender's type names
+            defender_stats (dict): Defender's real stats (calculate_all_stats)
+            level (int): Level of the attackers
+            spread (str): Key of tier_service.SPREADS the attackers run
+            limit (int): Number of results
+            exclude (iterable): Names to leave out (e.g. the defender)
+
+        Returns:
+            list: [{'name', 'move_type', 'damage_class', 'min_percent', 'max_percent'}, ...]
+        """
+        multiplier = np.ones(len(TYPES), dtype=np.float32)
+        for t in defender_types:
+            if t in TYPE_ID_MAP:
+                multiplier *= self.chart[:, TYPES.index(t)]
+
+        effectiveness = np.where(self.stab_type >= 0, multiplier[self.stab_type], 0)  # [row, slot]
+        damage = np.zeros(self.stab_power.shape, dtype=np.float32)
+        for c, cls in enumerate(DAMAGE_CLASSES):
+            attack = _spread_stats(self.base[ATTACK_STATS[cls]], ATTACK_STATS[cls], level, spread)
+            base = _damage_array(level, self.stab_power[:, :, c], attack[:, None], defender_stats[DEFENSE_STATS[cls]])
+            damage[:, :, c] = np.where(self.stab_power[:, :, c] > 0, np.floor(base * STAB) * effectiveness, 0)
+
+        best, move_types, classes = self._best(damage, np.maximum(self.stab_type, 0))
+        return self._results(best / defender_stats['hp'] * 100, move_types, classes, exclude, limit)
+
+    def targets_of(self, attacker_name, attacker_stats, level=50, spread="max_neutral", limit=10):
+        """
+        Rank every Pokemon by how hard one attacker's best STAB hits it
+
+        Args:
+            attacker_name (str): Attacker's name (must be in the dex)
+            attacker_stats (dict): Attacker's real stats (calculate_all_stats)
+            level (int): Level of the targets
+            spread (str): Key of tier_service.SPREADS the targets run for HP and defenses
+            limit (int): Number of results
+
+        Returns:
+            list: [{'name', 'move_type', 'damage_class', 'min_percent', 'max_percent'}, ...]
+        """
+        attacker = self.rows.get(attacker_name)
+        if attacker is None:
+            return []
+        n = len(self.names)
+        damage = np.zeros((n, 2, len(DAMAGE_CLASSES)), dtype=np.float32)
+        move_types = np.zeros((n, 2), dtype=np.int16)
+        for slot, t in enumerate(self.stab_type[attacker]):
+            if t < 0:
+                continue
+            move_types[:, slot] = t
+            for c, cls in enumerate(DAMAGE_CLASSES):
+                power = self.stab_power[attacker, slot, c]
+                if power <= 0:
+                    continue
+                defense = _spread_stats(self.base[DEFENSE_STATS[cls]], DEFENSE_STATS[cls], level, spread)
+                base = _damage_array(level, power, attacker_stats[ATTACK_STATS[cls]], defense)
+                damage[:, slot, c] = np.floor(base * STAB) * self.taken[:, t]
+
+        best, best_types, classes = self._best(damage, move_types)
+        hp = _spread_stats(self.base['hp'], 'hp', level, spread)
+        return self._results(best / hp * 100, best_types, classes, [attacker_name], limit)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_threat_index(dex_key, move_key):
+    return ThreatIndex(get_dex_table().snapshot(), get_move_table(), get_type_chart())
+
+
+def get_threat_index():
+    """
+    Get the threat index for the current dex and move tables
+
+    Returns:
+        ThreatIndex: Rebuilt only when either table changes
+    """
+    return _build_threat_index(get_dex_index_key(), get_move_index_key())
+
+
+def is_threat_scan_ready():
+    """Whether both the dex and move tables have been built"""
+    return get_dex_table().complete and get_move_table().complete
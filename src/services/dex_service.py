@@ -0,0 +1,363 @@
+"""
+Dex Service
+Compact, persisted table of every Pokemon for whole-dex queries
+"""
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+
+from src.config.constants import DATA_DIR, DEX_TABLE_WORKERS, DEX_TABLE_SAVE_EVERY, DEX_INDEX_REBUILD_EVERY
+from src.api.pokeapi_client import request_json
+from src.api.rate_limiter import request_priority, PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+DEX_TABLE_PATH = os.path.join(DATA_DIR, "dex_table.json")
+DEX_SCHEMA_VERSION = 2
+POKEMON_LIST_URL = "https://pokeapi.co/api/v2/pokemon?limit=10000"
+
+MOVE_TABLE_PATH = os.path.join(DATA_DIR, "move_table.json")
+MOVE_SCHEMA_VERSION = 1
+MOVE_LIST_URL = "https://pokeapi.co/api/v2/move?limit=10000"
+
+# Sprite variants tracked per Pokemon: variant -> key path in the '/pokemon' sprites payload
+SPRITE_KEYS = {
+    "gif": ("other", "showdown", "front_default"),
+    "png": ("front_default",),
+    "artwork": ("other", "official-artwork", "front_default"),
+    "shiny": ("front_shiny",),
+    "shiny_artwork": ("other", "official-artwork", "front_shiny"),
+}
+
+
+def sprite_flags(sprites):
+    """
+    Sprite variants that exist for a Pokemon
+
+    Args:
+        sprites (dict): 'sprites' field of a '/pokemon' payload
+
+    Returns:
+        list: Keys of SPRITE_KEYS whose URL is set
+    """
+    flags = []
+    for variant, path in SPRITE_KEYS.items():
+        value = sprites
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value:
+            flags.append(variant)
+    return flags
+
+
+def make_dex_record(pokemon_data):
+    """
+    Reduce a full '/pokemon' payload to the fields whole-dex features need
+
+    Args:
+        pokemon_data (dict): Pokemon data from API
+
+    Returns:
+        dict: Compact record
+    """
+    abilities = pokemon_data.get('abilities', [])
+    return {
+        'id': pokemon_data['id'],
+        'name': pokemon_data['name'],
+        'species': pokemon_data['species']['name'],
+        'species_id': int(pokemon_data['species']['url'].rstrip('/').split('/')[-1]),
+        'types': [t['type']['name'] for t in pokemon_data['types']],
+        'stats': {s['stat']['name']: s['base_stat'] for s in pokemon_data['stats']},
+        'abilities': [a['ability']['name'] for a in abilities if not a['is_hidden']],
+        'hidden_ability': next((a['ability']['name'] for a in abilities if a['is_hidden']), None),
+        'moves': [m['move']['name'] for m in pokemon_data.get('moves', [])],
+        'height': pokemon_data.get('height', 0),
+        'weight': pokemon_data.get('weight', 0),
+        'sprites': sprite_flags(pokemon_data.get('sprites') or {}),
+    }
+
+
+class DexTable:
+    """Every Pokemon (including forms) as compact records, saved ordered by id"""
+
+    def __init__(self, records=None, complete=False):
+        self.records = []
+        self.by_name = {}
+        self.complete = complete
+        self.revision = 0
+        self._lock = threading.Lock()
+        for record in records or []:
+            self.add(record)
+
+    def add(self, record):
+        with self._lock:
+            if record['name'] in self.by_name:
+                self.records[self.records.index(self.by_name[record['name']])] = record
+            else:
+                self.records.append(record)
+            self.by_name[record['name']] = record
+            self.revision += 1
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def snapshot(self):
+        """
+        Copy of the records, safe to iterate while the table is still building
+
+        Returns:
+            list: Records ordered by id
+        """
+        with self._lock:
+            records = list(self.records)
+        return sorted(records, key=lambda r: r['id'])
+
+    def __len__(self):
+        return len(self.records)
+
+    def save(self, path=DEX_TABLE_PATH):
+        """Persist the table as JSON, ordered by id"""
+        with self._lock:
+            records = sorted(self.records, key=lambda r: r['id'])
+            payload = {'version': DEX_SCHEMA_VERSION, 'complete': self.complete, 'records': records}
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEX_TABLE_PATH):
+        """Load a persisted table; stale schema versions load as empty"""
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if payload.get('version') != DEX_SCHEMA_VERSION:
+            return cls()
+        return cls(payload['records'], payload.get('complete', False))
+
+
+@st.cache_resource(show_spinner=False)
+def get_dex_table():
+    """
+    Get the process-wide dex table
+
+    Returns:
+        DexTable: Loaded from disk; may be empty until build_dex_table runs
+    """
+    return DexTable.load()
+
+
+def is_dex_ready():
+    """Whether the full dex table has been built"""
+    return get_dex_table().complete
+
+
+def _index_key(table):
+    """
+    Cache key for indexes derived from a table
+
+    While the table is building, the key only changes every
+    DEX_INDEX_REBUILD_EVERY records so derived indexes aren't rebuilt on
+    every added record.
+
+    Returns:
+        tuple: Hashable key that changes when derived indexes are stale
+    """
+    if table.complete:
+        return ('complete', table.revision)
+    return ('building', table.revision // DEX_INDEX_REBUILD_EVERY)
+
+
+def get_dex_index_key():
+    """Cache key for indexes built from the dex table"""
+    return _index_key(get_dex_table())
+
+
+def _checkpointer(table, every=DEX_TABLE_SAVE_EVERY):
+    """
+    Make a callback that saves the table after every few added records
+
+    Args:
+        table (DexTable | MoveTable): Table being built
+        every (int): Added records between saves
+
+    Returns:
+        callable: Call once per added record; safe from worker threads
+    """
+    lock = threading.Lock()
+    added = [0]
+
+    def checkpoint():
+        with lock:
+            added[0] += 1
+            due = added[0] % every == 0
+        if due:
+            table.save()
+
+    return checkpoint
+
+
+def build_dex_table(workers=DEX_TABLE_WORKERS):
+    """
+    Fetch every Pokemon once and persist the compact table
+
+    Records already in the table are skipped, so an interrupted build
+    resumes where it stopped.
+
+    Args:
+        workers (int): Parallel Pokemon fetches
+
+    Returns:
+        DexTable: The completed table
+    """
+    table = get_dex_table()
+    if table.complete:
+        return table
+
+    names = [p['name'] for p in request_json(POKEMON_LIST_URL)['results']]
+    missing = [name for name in names if table.get(name) is None]
+    checkpoint = _checkpointer(table)
+
+    def add(name):
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                table.add(make_dex_record(request_json(f"https://pokeapi.co/api/v2/pokemon/{name}")))
+        except requests.RequestException:
+            logger.warning("Could not fetch %s for the dex table", name)
+            return False
+        checkpoint()
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(add, missing))
+
+    table.complete = all(results)
+    table.save()
+    return table
+
+
+def make_move_record(move_data):
+    """
+    Reduce a full '/move' payload to the fields damage math needs
+
+    Args:
+        move_data (dict): Move data from API
+
+    Returns:
+        dict: {'name', 'type', 'power', 'damage_class'}; power is None for
+              status and variable-power moves
+    """
+    return {
+        'name': move_data['name'],
+        'type': move_data['type']['name'],
+        'power': move_data.get('power'),
+        'damage_class': move_data['damage_class']['name'] if move_data.get('damage_class') else None,
+    }
+
+
+class MoveTable:
+    """Every move as a compact record, keyed by name"""
+
+    def __init__(self, records=None, complete=False):
+        self.by_name = {}
+        self.complete = complete
+        self.revision = 0
+        self._lock = threading.Lock()
+        for record in records or []:
+            self.add(record)
+
+    def add(self, record):
+        with self._lock:
+            self.by_name[record['name']] = record
+            self.revision += 1
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def __len__(self):
+        return len(self.by_name)
+
+    def save(self, path=MOVE_TABLE_PATH):
+        """Persist the table as JSON"""
+        with self._lock:
+            records = sorted(self.by_name.values(), key=lambda r: r['name'])
+            payload = {'version': MOVE_SCHEMA_VERSION, 'complete': self.complete, 'records': records}
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=MOVE_TABLE_PATH):
+        """Load a persisted table; stale schema versions load as empty"""
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if payload.get('version') != MOVE_SCHEMA_VERSION:
+            return cls()
+        return cls(payload['records'], payload.get('complete', False))
+
+
+@st.cache_resource(show_spinner=False)
+def get_move_table():
+    """
+    Get the process-wide move table
+
+    Returns:
+        MoveTable: Loaded from disk; may be empty until build_move_table runs
+    """
+    return MoveTable.load()
+
+
+def get_move_index_key():
+    """Cache key for indexes built from the move table"""
+    return _index_key(get_move_table())
+
+
+def build_move_table(workers=DEX_TABLE_WORKERS):
+    """
+    Fetch every move once and persist the compact table
+
+    Like build_dex_table, an interrupted build resumes where it stopped.
+
+    Args:
+        workers (int): Parallel move fetches
+
+    Returns:
+        MoveTable: The completed table
+    """
+    table = get_move_table()
+    if table.complete:
+        return table
+
+    names = [m['name'] for m in request_json(MOVE_LIST_URL)['results']]
+    missing = [name for name in names if table.get(name) is None]
+    checkpoint = _checkpointer(table)
+
+    def add(name):
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                table.add(make_move_record(request_json(f"https://pokeapi.co/api/v2/move/{name}")))
+        except requests.RequestException:
+            logger.warning("Could not fetch move %s for the move table", name)
+            return False
+        checkpoint()
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(add, missing))
+
+    table.complete = all(results)
+    table.save()
+    return table
@@ -0,0 +1,301 @@
+"""
+Diagnostics Service
+Memory accounting for caches, sessions and allocations (admin only)
+"""
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import deque
+
+from src.api.pokeapi_client import fetch_json, _fetch_all_pokemon_names
+from src.api.shared_cache import get_shared_cache, get_swr_stats
+from src.api.rate_limiter import get_all_limiter_stats
+from src.api.circuit_breaker import get_all_breaker_stats
+from src.services.chat_store import get_chat_store
+from src.config.constants import DIAGNOSTICS_TRACE_FRAMES, DIAGNOSTICS_TOP_N
+
+# Objects that belong to the interpreter rather than to a session or cache
+_SKIP_TYPES = (types.ModuleType, type, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, types.CodeType, types.FrameType, threading.Thread)
+DEEP_SIZEOF_MAX_OBJECTS = 500_000
+
+# Functions cached with stale_while_revalidate (these aren't in Streamlit's registry)
+SWR_FUNCTIONS = {
+    "fetch_json (get_pokemon_list, get_pokemon_data, ...)": fetch_json,
+    "get_all_pokemon_names": _fetch_all_pokemon_names,
+}
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def deep_sizeof(obj, seen=None, max_objects=DEEP_SIZEOF_MAX_OBJECTS):
+    """
+    Approximate bytes reachable from an object
+
+    Walks containers and instance attributes, counting each object once.
+    Modules, classes, functions and threads are not followed.
+
+    Args:
+        obj: Root object
+        seen (set): ids already counted, shared across calls to avoid double counting
+        max_objects (int): Stop walking after this many objects
+
+    Returns:
+        int: Bytes (a lower bound when max_objects was reached)
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    visited = 0
+    while stack and visited < max_objects:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+        visited += 1
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        if hasattr(current, '__dict__') and not isinstance(current, dict):
+            stack.append(vars(current))
+        for slot in getattr(type(current), '__slots__', ()):
+            if isinstance(slot, str) and hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+def _streamlit_caches(attr):
+    """Per-function caches registered with st.cache_data or st.cache_resource"""
+    try:
+        if attr == "data":
+            from streamlit.runtime.caching.cache_data_api import _data_caches as registry
+        else:
+            from streamlit.runtime.caching.cache_resource_api import _resource_caches as registry
+        with registry._caches_lock:
+            return [cache for caches in registry._function_caches.values() for cache in caches.values()]
+    except (ImportError, AttributeError):
+        # Private Streamlit internals; report nothing rather than break the page
+        return []
+
+
+def get_cache_stats(measure_resources=False):
+    """
+    Entries and approximate bytes held by each cache
+
+    st.cache_data sizes are the pickled entry sizes Streamlit tracks.
+    st.cache_resource values are live objects and are only measured
+    (deep_sizeof) when asked, since walking them can take a while.
+
+    Args:
+        measure_resources (bool): Whether to size st.cache_resource values
+
+    Returns:
+        list: [{'kind', 'name', 'entries', 'bytes'}, ...] sorted by bytes, bytes None when unknown
+    """
+    rows = []
+    for cache in _streamlit_caches("data"):
+        stats = [s for family in cache.get_stats().values() for s in family]
+        name = stats[0].cache_name if stats else getattr(cache, 'function_display_name', "?")
+        rows.append({'kind': "st.cache_data", 'name': name, 'entries': len(stats),
+                     'bytes': sum(s.byte_length for s in stats)})
+
+    seen = set()
+    for cache in _streamlit_caches("resource"):
+        with cache._mem_cache_lock:
+            values = [entry.value for entry in cache._mem_cache.values()]
+        rows.append({'kind': "st.cache_resource", 'name': cache.display_name, 'entries': len(values),
+                     'bytes': sum(deep_sizeof(v, seen) for v in values) if measure_resources else None})
+
+    shared = get_shared_cache()
+    if shared is None:
+        # Each function has its own in-process LRU
+        for name, func in SWR_FUNCTIONS.items():
+            stats = func.cache_stats()
+            rows.append({'kind': "stale-while-revalidate", 'name': name,
+                         'entries': stats['entries'], 'bytes': stats['bytes']})
+    else:
+        # One mmap shared by every process and every cached function
+        stats = shared.stats()
+        rows.append({'kind': "shared memory", 'name': "host-wide cache",
+                     'entries': stats['entries'], 'bytes': stats['bytes']})
+
+    return sorted(rows, key=lambda r: r['bytes'] or 0, reverse=True)
+
+
+def get_counter_stats():
+    """
+    Hit counters of the fetch pipeline
+
+    Returns:
+        dict: {'swr', 'limiters', 'breakers', 'chat_store'}
+    """
+    return {
+        'swr': get_swr_stats(),
+        'limiters': get_all_limiter_stats(),
+        'breakers': get_all_breaker_stats(),
+        'chat_store': get_chat_store().stats(),
+    }
+
+
+def _active_sessions():
+    try:
+        from streamlit.runtime import Runtime
+        return Runtime.instance()._session_mgr.list_active_sessions()
+    except (ImportError, RuntimeError, AttributeError):
+        return []
+
+
+def get_session_stats(top_keys=5):
+    """
+    Size of every live session's session_state
+
+    Objects shared by several sessions (cached resources, for instance)
+    are counted in each session that references them.
+
+    Args:
+        top_keys (int): Largest keys listed per session
+
+    Returns:
+        list: [{'session', 'keys', 'bytes', 'largest': [(key, bytes), ...]}, ...] largest first
+    """
+    sessions = []
+    for info in _active_sessions():
+        try:
+            state = info.session.session_state.filtered_state
+        except (AttributeError, KeyError):
+            continue
+        seen = set()
+        sizes = {key: deep_sizeof(value, seen) for key, value in state.items()}
+        sessions.append({
+            'session': state.get('session_id') or info.session.id,
+            'keys': len(sizes),
+            'bytes': sum(sizes.values()),
+            'largest': sorted(sizes.items(), key=lambda kv: kv[1], reverse=True)[:top_keys],
+        })
+    return sorted(sessions, key=lambda s: s['bytes'], reverse=True)
+
+
+def get_process_memory():
+    """
+    Resident memory of this process
+
+    Returns:
+        dict: {'rss_bytes', 'peak_rss_bytes', 'sessions'} (rss None off Linux)
+    """
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024  # kilobytes on Linux, bytes on macOS
+    return {'rss_bytes': rss, 'peak_rss_bytes': peak, 'sessions': len(_active_sessions())}
+
+
+# --- tracemalloc ---
+
+def is_tracing():
+    return tracemalloc.is_tracing()
+
+
+def start_tracing():
+    """Start tracing allocations (slows the process down while on)"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(DIAGNOSTICS_TRACE_FRAMES)
+
+
+def stop_tracing():
+    """Stop tracing and drop the stored snapshots"""
+    tracemalloc.stop()
+    with _snapshots_lock:
+        _snapshots.clear()
+
+
+def _filtered(snapshot):
+    return snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+
+def take_snapshot(label):
+    """
+    Store a tracemalloc snapshot under a label ('baseline' or 'latest')
+
+    Args:
+        label (str): Slot to store it in
+
+    Returns:
+        float: Time the snapshot was taken
+    """
+    start_tracing()
+    snapshot = _filtered(tracemalloc.take_snapshot())
+    taken = time.time()
+    with _snapshots_lock:
+        _snapshots[label] = (taken, snapshot)
+    return taken
+
+
+def get_snapshot_times():
+    """Labels of the stored snapshots mapped to when they were taken"""
+    with _snapshots_lock:
+        return {label: taken for label, (taken, _) in _snapshots.items()}
+
+
+def _location(stat_traceback):
+    frame = stat_traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def top_allocators(label="latest", limit=DIAGNOSTICS_TOP_N):
+    """
+    Source lines holding the most traced memory in a snapshot
+
+    Returns:
+        list: [{'location', 'bytes', 'count'}, ...] or [] when there is no such snapshot
+    """
+    with _snapshots_lock:
+        entry = _snapshots.get(label)
+    if entry is None:
+        return []
+    return [
+        {'location': _location(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+        for stat in entry[1].statistics('lineno')[:limit]
+    ]
+
+
+def snapshot_diff(limit=DIAGNOSTICS_TOP_N):
+    """
+    Source lines whose traced memory grew most from 'baseline' to 'latest'
+
+    Returns:
+        list: [{'location', 'bytes', 'bytes_diff', 'count_diff'}, ...] or [] without both snapshots
+    """
+    with _snapshots_lock:
+        baseline = _snapshots.get('baseline')
+        latest = _snapshots.get('latest')
+    if baseline is None or latest is None:
+        return []
+    return [
+        {'location': _location(stat.traceback), 'bytes': stat.size,
+         'bytes_diff': stat.size_diff, 'count_diff': stat.count_diff}
+        for stat in latest[1].compare_to(baseline[1], 'lineno')[:limit]
+    ]
@@ -0,0 +1,354 @@
+"""
+Evolution Service
+Precomputed evolution graph with constant-time family lookups
+"""
+import copy
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+
+from src.config.constants import DATA_DIR, EVOLUTION_INDEX_WORKERS, EVOLUTION_SAVE_INTERVAL
+from src.api.pokeapi_client import request_json, get_species_data
+from src.api.rate_limiter import request_priority, PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+EVOLUTION_INDEX_PATH = os.path.join(DATA_DIR, "evolution_index.json")
+EVOLUTION_CHAIN_LIST_URL = "https://pokeapi.co/api/v2/evolution-chain?limit=10000"
+
+
+def _id_from_url(url):
+    """Extract the trailing numeric id from a PokeAPI resource URL"""
+    return int(url.rstrip('/').split('/')[-1])
+
+
+def _title(name):
+    return name.replace('-', ' ').title()
+
+
+def describe_evolution(details):
+    """
+    Summarize PokeAPI evolution details as a short condition
+
+    Args:
+        details (list): 'evolution_details' entries of a chain node
+
+    Returns:
+        str: e.g. "Level 16", "Use Thunder Stone", "Trade holding Metal Coat"
+    """
+    if not details:
+        return ""
+
+    d = details[0]
+    trigger = d['trigger']['name']
+    parts = []
+
+    if trigger == 'trade':
+        parts.append("Trade")
+    if d.get('min_level'):
+        parts.append(f"Level {d['min_level']}")
+    if d.get('item'):
+        parts.append(f"Use {_title(d['item']['name'])}")
+    if d.get('held_item'):
+        parts.append(f"holding {_title(d['held_item']['name'])}")
+    if d.get('min_happiness'):
+        parts.append("High Friendship")
+    if d.get('min_affection'):
+        parts.append("High Affection")
+    if d.get('known_move'):
+        parts.append(f"knowing {_title(d['known_move']['name'])}")
+    if d.get('known_move_type'):
+        parts.append(f"knowing a {_title(d['known_move_type']['name'])} move")
+    if d.get('location'):
+        parts.append(f"at {_title(d['location']['name'])}")
+    if d.get('time_of_day'):
+        parts.append(f"({d['time_of_day'].title()})")
+
+    if not parts:
+        parts.append(_title(trigger))
+    return " ".join(parts)
+
+
+class EvolutionIndex:
+    """
+    Evolution graph over all chains
+
+    Species are keyed by name. Each species maps to its chain id, its
+    predecessor and its successors, each edge carrying the evolution
+    condition, so every lookup is a dict access.
+    """
+
+    def __init__(self):
+        self.species_ids = {}     # species name -> species id
+        self.species_names = {}   # species id -> species name
+        self.species_chain = {}   # species name -> chain id
+        self.chains = {}          # chain id -> species names in stage order
+        self.stage = {}           # species name -> depth in its chain
+        self.parent = {}          # species name -> {'name', 'condition'}
+        self.children = {}        # species name -> [{'name', 'condition'}, ...]
+        self.complete = False
+        self._lock = threading.Lock()
+        self._dirty = False       # chains added since the last save
+        self._saving = threading.Lock()
+        self._saved_at = 0.0
+
+    def add_chain(self, chain_id, chain):
+        """
+        Add one parsed '/evolution-chain' payload to the graph
+
+        Args:
+            chain_id (int): Evolution chain id
+            chain (dict): The 'chain' root node
+        """
+        members = []
+        queue = deque([(chain, None, 0)])
+        with self._lock:
+            # Breadth-first so members are ordered by stage
+            while queue:
+                node, parent_name, depth = queue.popleft()
+                name = node['species']['name']
+                species_id = _id_from_url(node['species']['url'])
+
+                self.species_ids[name] = species_id
+                self.species_names[species_id] = name
+                self.species_chain[name] = chain_id
+                self.stage[name] = depth
+                self.children[name] = []
+                if parent_name:
+                    condition = describe_evolution(node.get('evolution_details'))
+                    self.parent[name] = {'name': parent_name, 'condition': condition}
+                    self.children[parent_name].append({'name': name, 'condition': condition})
+                members.append(name)
+
+                for next_node in node.get('evolves_to', []):
+                    queue.append((next_node, name, depth + 1))
+
+            self.chains[chain_id] = members
+            self._dirty = True
+
+    def _entry(self, name):
+        entry = {'name': name, 'id': str(self.species_ids[name]), 'stage': self.stage[name]}
+        parent = self.parent.get(name)
+        entry['from'] = parent['name'] if parent else None
+        entry['condition'] = parent['condition'] if parent else ""
+        return entry
+
+    def has_species(self, name):
+        return name in self.species_chain
+
+    def get_family(self, name):
+        """
+        Get every member of a species' evolution family
+
+        Args:
+            name (str): Species name
+
+        Returns:
+            list: Stage-ordered dicts with name, id, stage, from and condition
+        """
+        chain_id = self.species_chain.get(name)
+        if chain_id is None:
+            return []
+        return [self._entry(member) for member in self.chains[chain_id]]
+
+    def get_next_stages(self, name):
+        """
+        Get the direct evolutions of a species
+
+        Args:
+            name (str): Species name
+
+        Returns:
+            list: Dicts with name, id, stage, from and condition
+        """
+        return [self._entry(child['name']) for child in self.children.get(name, [])]
+
+    def get_pre_evolution(self, name):
+        """
+        Get the species a Pokemon evolves from
+
+        Args:
+            name (str): Species name
+
+        Returns:
+            dict: Entry of the predecessor or None for base stages
+        """
+        parent = self.parent.get(name)
+        return self._entry(parent['name']) if parent else None
+
+    def to_dict(self):
+        """Snapshot of the graph, copied under the lock so builders can keep adding chains"""
+        with self._lock:
+            return copy.deepcopy({
+                'complete': self.complete,
+                'species_ids': self.species_ids,
+                'species_chain': self.species_chain,
+                'chains': {str(k): v for k, v in self.chains.items()},
+                'stage': self.stage,
+                'parent': self.parent,
+                'children': self.children,
+            })
+
+    def merge(self, other):
+        """Add the chains of another index (e.g. the copy on disk) that this one lacks"""
+        with self._lock:
+            for attr in ('species_ids', 'species_chain', 'chains', 'stage', 'parent', 'children'):
+                mine = getattr(self, attr)
+                for key, value in getattr(other, attr).items():
+                    mine.setdefault(key, value)
+            self.species_names = {v: k for k, v in self.species_ids.items()}
+            self.complete = self.complete or other.complete
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls()
+        index.complete = data.get('complete', False)
+        index.species_ids = data['species_ids']
+        index.species_names = {v: k for k, v in index.species_ids.items()}
+        index.species_chain = data['species_chain']
+        index.chains = {int(k): v for k, v in data['chains'].items()}
+        index.stage = data['stage']
+        index.parent = data['parent']
+        index.children = data['children']
+        return index
+
+    def save(self, path=EVOLUTION_INDEX_PATH):
+        """
+        Persist the index as JSON
+
+        Every Streamlit and batch worker process keeps its own copy, so the
+        file on disk is merged in first (under a file lock) instead of being
+        overwritten with only this process's chains.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.merge(self.load(path))
+            with self._lock:
+                self._dirty = False
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(self.to_dict(), f)
+                os.replace(tmp_path, path)
+            except OSError:
+                with self._lock:
+                    self._dirty = True
+                raise
+        self._saved_at = time.monotonic()
+
+    def save_soon(self):
+        """
+        Save lazily added chains in the background, at most every EVOLUTION_SAVE_INTERVAL
+
+        Chains added since are saved by a later call or by the next full save.
+        """
+        if not self._dirty or time.monotonic() - self._saved_at < EVOLUTION_SAVE_INTERVAL:
+            return
+        if not self._saving.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.save()
+            except OSError:
+                logger.warning("Could not save the evolution index", exc_info=True)
+            finally:
+                self._saving.release()
+
+        threading.Thread(target=run, name="evolution-index-save", daemon=True).start()
+
+    @classmethod
+    def load(cls, path=EVOLUTION_INDEX_PATH):
+        """Load a persisted index, or an empty one if none exists"""
+        try:
+            with open(path) as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+
+@st.cache_resource(show_spinner=False)
+def get_evolution_index():
+    """
+    Get the process-wide evolution index
+
+    Returns:
+        EvolutionIndex: Loaded from disk; filled lazily or by a full build
+    """
+    return EvolutionIndex.load()
+
+
+def ensure_species(species_url):
+    """
+    Make sure a species' chain is in the index, fetching it on a miss
+
+    Args:
+        species_url (str): URL to species endpoint
+
+    Returns:
+        str: Species name or None if it could not be resolved
+    """
+    index = get_evolution_index()
+    name = index.species_names.get(_id_from_url(species_url))
+    if name:
+        return name
+
+    species_data = get_species_data(species_url)
+    if not species_data:
+        return None
+    evo_chain_url = species_data.get('evolution_chain', {}).get('url')
+    if not evo_chain_url:
+        return None
+    try:
+        evo_data = request_json(evo_chain_url)
+    except requests.RequestException:
+        return None
+
+    index.add_chain(_id_from_url(evo_chain_url), evo_data['chain'])
+    index.save_soon()
+    return species_data['name']
+
+
+def build_evolution_index(workers=EVOLUTION_INDEX_WORKERS):
+    """
+    Fetch every evolution chain and persist the complete index
+
+    Does nothing if a complete index is already loaded.
+
+    Args:
+        workers (int): Parallel chain fetches
+
+    Returns:
+        EvolutionIndex: The completed index
+    """
+    index = get_evolution_index()
+    if index.complete:
+        return index
+
+    chain_urls = [c['url'] for c in request_json(EVOLUTION_CHAIN_LIST_URL)['results']]
+    missing = [url for url in chain_urls if _id_from_url(url) not in index.chains]
+
+    def add(url):
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                index.add_chain(_id_from_url(url), request_json(url)['chain'])
+            return True
+        except requests.RequestException:
+            logger.warning("Could not fetch evolution chain %s", url)
+            return False
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(add, missing))
+
+    index.complete = all(results)
+    index.save()
+    return index
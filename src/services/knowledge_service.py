@@ -0,0 +1,221 @@
+"""
+Knowledge Service
+Local BM25 fact index that answers simple chat questions without the LLM
+"""
+import math
+import re
+from collections import Counter
+
+import streamlit as st
+
+from src.config.constants import STAT_CONFIG, KNOWLEDGE_MIN_SCORE, KNOWLEDGE_MIN_MARGIN, KNOWLEDGE_MIN_COVERAGE
+from src.api.pokeapi_client import get_pokemon_data, get_species_data
+from src.services.pokemon_service import (
+    get_pokemon_description,
+    get_abilities_info,
+    get_gender_ratio,
+    get_capture_rate,
+    get_evolution_chain,
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "its", "it", "it's", "s", "of", "to", "does", "do", "what",
+    "whats", "which", "in", "on", "and", "or", "me", "tell", "this", "pokemon", "has", "have",
+}
+
+# Questions with these words want reasoning, not a lookup
+OPEN_ENDED_WORDS = {
+    "why", "should", "best", "better", "strategy", "team", "counter", "counters", "moveset",
+    "build", "compare", "vs", "versus", "beat", "good", "recommend", "explain", "tips", "story",
+}
+
+# Topics the fact index has no answer for (matchups, movesets, locations)
+LLM_ONLY_WORDS = {
+    "weak", "weakness", "weaknesses", "resist", "resists", "resistant", "resistance", "immune",
+    "effective", "learn", "learns", "move", "moves", "where", "location", "locations", "find",
+}
+
+
+def tokenize(text):
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a small list of documents"""
+
+    def __init__(self, documents, k1=1.2, b=0.75):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(doc['text'])) for doc in documents]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+
+        # Inverted index: term -> [(doc index, term frequency)]
+        self.postings = {}
+        for i, tf in enumerate(self.term_freqs):
+            for term, freq in tf.items():
+                self.postings.setdefault(term, []).append((i, freq))
+        n = len(documents)
+        self.idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+                    for term, p in self.postings.items()}
+
+    def search(self, query, k=3):
+        """
+        Rank documents for a query
+
+        Args:
+            query (str): Free-text query
+            k (int): Number of results
+
+        Returns:
+            list: [(score, document), ...] best first
+        """
+        scores = Counter()
+        for term in set(tokenize(query)):
+            for i, freq in self.postings.get(term, []):
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / self.avg_length)
+                scores[i] += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+        return [(score, self.documents[i]) for i, score in scores.most_common(k)]
+
+
+def build_fact_documents(pokemon_data, species_data, evolution_family):
+    """
+    Turn Pokemon data into small fact documents
+
+    Each document's 'text' holds the words a question about it would use
+    and 'answer' is the reply shown to the user. Answers aren't indexed,
+    so words like "level" in an evolution condition can't pull in a fact.
+
+    Args:
+        pokemon_data (dict): Pokemon data from API
+        species_data (dict): Species data from API (may be None)
+        evolution_family (list): Output of get_evolution_chain
+
+    Returns:
+        list: [{'text', 'answer'}, ...]
+    """
+    name = pokemon_data['name'].replace('-', ' ').title()
+    docs = []
+
+    def add(keywords, answer):
+        docs.append({'text': keywords, 'answer': answer})
+
+    abilities = get_abilities_info(pokemon_data)
+    if abilities['hidden']:
+        add("hidden ability secret ha dream", f"🔮 {name}'s hidden ability is **{abilities['hidden']}**.")
+    else:
+        add("hidden ability secret ha dream", f"🔮 {name} has no hidden ability.")
+    add("abilities ability normal regular what abilities",
+        f"✨ {name}'s abilities: **{', '.join(abilities['normal'])}**"
+        + (f" (Hidden: **{abilities['hidden']}**)." if abilities['hidden'] else "."))
+
+    types = [t['type']['name'].title() for t in pokemon_data['types']]
+    add("type types typing element what type", f"🏷️ {name} is **{' / '.join(types)}** type.")
+    add("height tall how tall size big", f"📏 {name} is **{pokemon_data['height'] / 10} m** tall.")
+    add("weight heavy how heavy weigh mass", f"⚖️ {name} weighs **{pokemon_data['weight'] / 10} kg**.")
+
+    stats = {s['stat']['name']: s['base_stat'] for s in pokemon_data['stats']}
+    stat_words = {
+        'hp': "hp health hit points", 'attack': "attack atk physical", 'defense': "defense def physical",
+        'special-attack': "special attack spa sp atk spatk", 'special-defense': "special defense spd sp def spdef",
+        'speed': "speed spe fast quick how fast",
+    }
+    for stat, value in stats.items():
+        label = STAT_CONFIG.get(stat, {}).get('name', stat)
+        add(f"base stat {stat_words.get(stat, stat)}", f"📊 {name}'s base {label} is **{value}**.")
+    stat_line = ", ".join(f"{STAT_CONFIG.get(s, {}).get('name', s)} {v}" for s, v in stats.items())
+    add("base stats stat total bst all stats",
+        f"📊 {name}'s base stats: {stat_line} (Total **{sum(stats.values())}**).")
+
+    if species_data:
+        add("pokedex entry description flavor text dex entry about lore",
+            f"📖 {get_pokemon_description(species_data)}")
+        gender = get_gender_ratio(species_data)
+        if gender.get('genderless'):
+            add("gender ratio male female genderless", f"⚧️ {name} is genderless.")
+        else:
+            add("gender ratio male female",
+                f"⚧️ {name} is ♂ {gender['male']:.1f}% / ♀ {gender['female']:.1f}%.")
+        add("capture rate catch rate catch how hard to catch",
+            f"🎯 {name}'s capture rate is **{get_capture_rate(species_data)}** (out of 255).")
+
+    species_name = pokemon_data['species']['name']
+    member = next((m for m in evolution_family if m['name'] == species_name), None)
+    if member is not None:
+        next_stages = [m for m in evolution_family if m['from'] == species_name]
+        if next_stages:
+            evolutions = "; ".join(
+                f"**{m['name'].title()}**" + (f" ({m['condition']})" if m['condition'] else "")
+                for m in next_stages
+            )
+            add("evolve evolves into evolution next evolution become when level", f"🧬 {name} evolves into {evolutions}.")
+        else:
+            add("evolve evolves into evolution next evolution become", f"🧬 {name} does not evolve any further.")
+        if member['from']:
+            condition = f" ({member['condition']})" if member['condition'] else ""
+            add("evolve evolves from pre evolution previous comes from",
+                f"🧬 {name} evolves from **{member['from'].title()}**{condition}.")
+        else:
+            add("evolve evolves from pre evolution previous comes from",
+                f"🧬 {name} doesn't evolve from another Pokemon.")
+
+    return docs
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def get_fact_index(pokemon_name):
+    """
+    Cached fact index for one Pokemon
+
+    Args:
+        pokemon_name (str): Pokemon name
+
+    Returns:
+        BM25Index: Index over the Pokemon's facts, or None if not found
+    """
+    pokemon_data = get_pokemon_data(pokemon_name)
+    if not pokemon_data:
+        return None
+    species_url = pokemon_data['species']['url']
+    docs = build_fact_documents(pokemon_data, get_species_data(species_url), get_evolution_chain(species_url))
+    return BM25Index(docs)
+
+
+def answer_locally(pokemon_name, question):
+    """
+    Answer a simple factual question from local data
+
+    Only short questions without open-ended or LLM-only wording are
+    considered. The best fact must score above KNOWLEDGE_MIN_SCORE,
+    clearly beat the runner-up and contain at least KNOWLEDGE_MIN_COVERAGE
+    of the question's words (the Pokemon's name aside); everything else
+    goes to the LLM.
+
+    Args:
+        pokemon_name (str): Pokemon being discussed
+        question (str): User's question
+
+    Returns:
+        str: Answer, or None to fall back to the LLM
+    """
+    name_tokens = set(tokenize(pokemon_name.replace('-', ' ')))
+    tokens = [t for t in tokenize(question) if t not in name_tokens]
+    if not tokens or len(tokens) > 12 or (OPEN_ENDED_WORDS | LLM_ONLY_WORDS).intersection(tokens):
+        return None
+
+    index = get_fact_index(pokemon_name)
+    if index is None:
+        return None
+    query = " ".join(tokens)
+    results = index.search(query, k=2)
+    if not results or results[0][0] < KNOWLEDGE_MIN_SCORE:
+        return None
+    if len(results) > 1 and results[0][0] - results[1][0] < KNOWLEDGE_MIN_MARGIN:
+        return None
+    best = results[0][1]
+    matched = set(tokenize(best['text'])).intersection(tokens)
+    if len(matched) < KNOWLEDGE_MIN_COVERAGE * len(set(tokens)):
+        return None
+    return best['answer']
@@ -0,0 +1,127 @@
+"""
+Learnset Service
+Bitset index over every Pokemon's learnset for fast move queries
+"""
+import streamlit as st
+
+from src.services.dex_service import get_dex_table, get_dex_index_key
+
+
+def _iter_bits(bits):
+    """Yield the positions of set bits, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class LearnsetIndex:
+    """
+    Interned move ids with learnsets stored as Python int bitsets
+
+    learnsets[row] has bit m set when Pokemon `row` learns move `m`;
+    learners[m] is the transposed bitset over Pokemon rows, so a
+    "who learns all of these" query is one AND per move.
+    """
+
+    def __init__(self, records):
+        self.move_ids = {}
+        self.move_names = []
+        self.pokemon_rows = {}
+        self.pokemon_names = []
+        self.learnsets = []
+        self.learners = []
+
+        for row, record in enumerate(records):
+            self.pokemon_rows[record['name']] = row
+            self.pokemon_names.append(record['name'])
+            bits = 0
+            for move in record['moves']:
+                move_id = self.move_ids.get(move)
+                if move_id is None:
+                    move_id = len(self.move_names)
+                    self.move_ids[move] = move_id
+                    self.move_names.append(move)
+                    self.learners.append(0)
+                bits |= 1 << move_id
+                self.learners[move_id] |= 1 << row
+            self.learnsets.append(bits)
+
+    def _learnset(self, pokemon_name):
+        row = self.pokemon_rows.get(pokemon_name)
+        return self.learnsets[row] if row is not None else 0
+
+    def _move_list(self, bits):
+        return sorted(self.move_names[m] for m in _iter_bits(bits))
+
+    def has_pokemon(self, pokemon_name):
+        return pokemon_name in self.pokemon_rows
+
+    def get_moves(self, pokemon_name):
+        """
+        Get a Pokemon's learnset
+
+        Args:
+            pokemon_name (str): Pokemon name
+
+        Returns:
+            list: Sorted move names
+        """
+        return self._move_list(self._learnset(pokemon_name))
+
+    def who_learns(self, moves):
+        """
+        Find every Pokemon that learns all the given moves
+
+        Args:
+            moves (list): Move names (e.g., ['trick-room', 'protect'])
+
+        Returns:
+            list: Pokemon names in dex order
+        """
+        if not moves:
+            return []
+        bits = -1
+        for move in moves:
+            move_id = self.move_ids.get(move)
+            if move_id is None:
+                return []
+            bits &= self.learners[move_id]
+        return [self.pokemon_names[row] for row in _iter_bits(bits)]
+
+    def common_moves(self, pokemon_a, pokemon_b):
+        """
+        Get the moves two Pokemon share
+
+        Returns:
+            list: Sorted move names
+        """
+        return self._move_list(self._learnset(pokemon_a) & self._learnset(pokemon_b))
+
+    def learnset_diff(self, pokemon_a, pokemon_b):
+        """
+        Compare two learnsets (e.g. a base form and a regional form)
+
+        Returns:
+            dict: {'only_a': [...], 'only_b': [...]} sorted move names
+        """
+        a = self._learnset(pokemon_a)
+        b = self._learnset(pokemon_b)
+        return {'only_a': self._move_list(a & ~b), 'only_b': self._move_list(b & ~a)}
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_learnset_index(dex_key):
+    return LearnsetIndex(get_dex_table().snapshot())
+
+
+def get_learnset_index():
+    """
+    Get the learnset index for the current dex table
+
+    Rebuilt when the dex table changes (in batches while it is still building).
+
+    Returns:
+        LearnsetIndex: Index over every Pokemon in the dex table
+    """
+    return _build_learnset_index(get_dex_index_key())
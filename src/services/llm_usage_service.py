@@ -0,0 +1,239 @@
+"""
+LLM Usage Service
+Token and latency accounting for LLM calls, with per-session budgets
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+from src.config.constants import (
+    LLM_SESSION_TOKEN_BUDGET,
+    LLM_SESSION_CALL_BUDGET,
+    LLM_BUDGET_WINDOW,
+    LLM_MAX_TRACKED_SESSIONS,
+    LLM_RECENT_CALLS,
+)
+
+OUTCOMES = ("ok", "error", "rate_limited", "over_budget")
+ANONYMOUS_SESSION = "anonymous"
+
+
+class LLMBudgetExceeded(Exception):
+    """Raised before an LLM call when the session is out of tokens or calls"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_tokens(messages, max_tokens=0):
+    """
+    Rough upper bound of a call's tokens, used for budget checks
+
+    Args:
+        messages (list): Chat messages ({'role', 'content'})
+        max_tokens (int): Completion limit of the call
+
+    Returns:
+        int: About 4 characters per prompt token, plus the full completion
+    """
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return math.ceil(chars / 4) + (max_tokens or 0)
+
+
+class _Totals:
+    """Aggregated usage for one scope (global, a feature or a session)"""
+
+    def __init__(self):
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.queue_seconds = 0.0
+        self.response_seconds = 0.0
+        self.max_response_seconds = 0.0
+
+    def add(self, outcome, prompt_tokens, completion_tokens, queue_seconds, response_seconds):
+        self.outcomes[outcome] += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.queue_seconds += queue_seconds
+        self.response_seconds += response_seconds
+        self.max_response_seconds = max(self.max_response_seconds, response_seconds)
+
+    def summary(self):
+        calls = sum(n for outcome, n in self.outcomes.items() if outcome != "over_budget")
+        return {
+            'calls': calls,
+            'outcomes': dict(self.outcomes),
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'avg_queue_ms': round(self.queue_seconds / calls * 1000, 1) if calls else 0.0,
+            'avg_response_ms': round(self.response_seconds / calls * 1000, 1) if calls else 0.0,
+            'max_response_ms': round(self.max_response_seconds * 1000, 1),
+        }
+
+
+class _SessionUsage:
+    """A session's totals plus its sliding budget window"""
+
+    def __init__(self):
+        self.totals = _Totals()
+        self.window = deque()  # [started, tokens] per call, tokens are estimates until recorded
+
+    def prune(self, now, window):
+        while self.window and self.window[0][0] <= now - window:
+            self.window.popleft()
+
+    def used(self):
+        return sum(tokens for _, tokens in self.window), len(self.window)
+
+
+class UsageLedger:
+    """
+    Records every LLM call and enforces per-session budgets
+
+    reserve() runs before a call: it rejects the call if the session's
+    tokens or calls in the last `window` seconds would exceed the budget,
+    and otherwise holds the call's estimated tokens. record() replaces
+    the estimate with the real usage and adds the call to the global,
+    per-feature and per-session totals.
+    """
+
+    def __init__(self, token_budget=LLM_SESSION_TOKEN_BUDGET, call_budget=LLM_SESSION_CALL_BUDGET,
+                 window=LLM_BUDGET_WINDOW, max_sessions=LLM_MAX_TRACKED_SESSIONS, recent=LLM_RECENT_CALLS):
+        self.token_budget = token_budget
+        self.call_budget = call_budget
+        self.window = window
+        self.max_sessions = max_sessions
+        self.totals = _Totals()
+        self.features = {}
+        self.sessions = OrderedDict()
+        self.recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = _SessionUsage()
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def _add(self, session_id, feature, model, outcome, prompt_tokens=0, completion_tokens=0,
+             queue_seconds=0.0, response_seconds=0.0):
+        args = (outcome, prompt_tokens, completion_tokens, queue_seconds, response_seconds)
+        self.totals.add(*args)
+        self.features.setdefault(feature, _Totals()).add(*args)
+        self._session(session_id).totals.add(*args)
+        self.recent.append({
+            'time': time.time(), 'session': session_id, 'feature': feature, 'model': model,
+            'outcome': outcome, 'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+            'queue_ms': round(queue_seconds * 1000, 1), 'response_ms': round(response_seconds * 1000, 1),
+        })
+
+    def reserve(self, session_id, feature, model, estimated_tokens):
+        """
+        Check a session's budget and hold tokens for a call
+
+        Args:
+            session_id (str): Caller's session (None counts as anonymous)
+            feature (str): Feature making the call (e.g. 'chat')
+            model (str): Model name
+            estimated_tokens (int): estimate_tokens() of the call
+
+        Returns:
+            list: Reservation to pass to record()
+
+        Raises:
+            LLMBudgetExceeded: If the call would go over the session's budget
+        """
+        session_id = session_id or ANONYMOUS_SESSION
+        now = time.monotonic()
+        with self._lock:
+            session = self._session(session_id)
+            session.prune(now, self.window)
+            tokens, calls = session.used()
+            over_calls = self.call_budget and calls + 1 > self.call_budget
+            # A single call bigger than the whole budget is still allowed into an empty window
+            over_tokens = self.token_budget and tokens and tokens + estimated_tokens > self.token_budget
+            if over_calls or over_tokens:
+                retry_after = max(0.0, session.window[0][0] + self.window - now)
+                self._add(session_id, feature, model, "over_budget")
+                limit = "call" if over_calls else "token"
+                raise LLMBudgetExceeded(f"Session {limit} budget reached; retry in {retry_after:.0f}s",
+                                        retry_after)
+            reservation = [now, estimated_tokens]
+            session.window.append(reservation)
+            return reservation
+
+    def record(self, session_id, feature, model, reservation, outcome, prompt_tokens=0, completion_tokens=0,
+               queue_seconds=0.0, response_seconds=0.0):
+        """
+        Record a finished call
+
+        Args:
+            reservation (list): From reserve(); its tokens become the real usage
+            outcome (str): One of OUTCOMES
+            prompt_tokens (int): Reported prompt tokens (0 if the call failed)
+            completion_tokens (int): Reported completion tokens
+            queue_seconds (float): Time waiting for the rate limiter, including retries
+            response_seconds (float): Time waiting for the API
+        """
+        with self._lock:
+            reservation[1] = prompt_tokens + completion_tokens
+            self._add(session_id or ANONYMOUS_SESSION, feature, model, outcome, prompt_tokens,
+                      completion_tokens, queue_seconds, response_seconds)
+
+    def session_usage(self, session_id):
+        """
+        A session's usage in the current budget window
+
+        Returns:
+            dict: {'tokens', 'calls', 'token_budget', 'call_budget'}
+        """
+        with self._lock:
+            session = self.sessions.get(session_id or ANONYMOUS_SESSION)
+            if session is None:
+                tokens, calls = 0, 0
+            else:
+                session.prune(time.monotonic(), self.window)
+                tokens, calls = session.used()
+        return {'tokens': tokens, 'calls': calls, 'token_budget': self.token_budget,
+                'call_budget': self.call_budget}
+
+    def stats(self, top_sessions=20):
+        """
+        Usage aggregated globally, per feature and per session
+
+        Returns:
+            dict: {'global', 'features', 'sessions' (heaviest first), 'recent' (newest first)}
+        """
+        with self._lock:
+            sessions = [(session_id, s.totals.summary()) for session_id, s in self.sessions.items()]
+            sessions.sort(key=lambda s: s[1]['prompt_tokens'] + s[1]['completion_tokens'], reverse=True)
+            return {
+                'global': self.totals.summary(),
+                'features': {name: totals.summary() for name, totals in self.features.items()},
+                'sessions': sessions[:top_sessions],
+                'recent': list(reversed(self.recent)),
+            }
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger():
+    """
+    Get the process-wide LLM usage ledger
+
+    Returns:
+        UsageLedger: Shared by the Streamlit app and the JSON API
+    """
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger()
+        return _ledger
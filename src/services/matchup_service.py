@@ -0,0 +1,261 @@
+"""
+Matchup Service
+Deterministic 1v1 facts (speed, types, damage) for the battle analyzer
+"""
+import math
+
+from src.api.pokeapi_client import get_move_data
+from src.services.dex_service import get_move_table, make_move_record
+from src.services.type_service import get_type_chart
+from src.services.damage_service import (
+    calculate_damage,
+    get_threat_index,
+    is_threat_scan_ready,
+    DAMAGE_CLASSES,
+    ATTACK_STATS,
+    DEFENSE_STATS,
+    STAB,
+    MIN_ROLL,
+    TYPES,
+)
+
+# Held item effects the fact sheet accounts for
+SPEED_ITEMS = {"Choice Scarf": 1.5}
+ATTACK_ITEMS = {"Choice Band": ("physical", 1.5), "Choice Specs": ("special", 1.5)}
+DAMAGE_ITEMS = {"Life Orb": 1.3}
+SUPER_EFFECTIVE_ITEMS = {"Expert Belt": 1.2}
+DEFENSE_ITEMS = {"Assault Vest": ("special", 1.5), "Eviolite": (None, 1.5)}
+
+
+def make_side(name, data, moves, item, stats, nature):
+    """
+    Bundle one side of a matchup
+
+    Returns:
+        dict: {'name', 'types', 'abilities', 'moves', 'item', 'stats', 'nature'}
+    """
+    return {
+        'name': name,
+        'types': [t['type']['name'] for t in data.get('types', [])],
+        'abilities': [a['ability']['name'] for a in data.get('abilities', [])],
+        'moves': list(moves or []),
+        'item': item or "None",
+        'stats': stats,
+        'nature': nature,
+    }
+
+
+def _move_record(move_name):
+    record = get_move_table().get(move_name)
+    if record:
+        return record
+    move_data = get_move_data(move_name)
+    return make_move_record(move_data) if move_data else None
+
+
+def type_multiplier(move_type, defender_types, chart):
+    """Multiplier of an attacking type against one or two defending types"""
+    multiplier = 1.0
+    for t in defender_types:
+        multiplier *= chart.get(move_type, {}).get(t, 1.0)
+    return multiplier
+
+
+def effective_speed(side):
+    """Real speed after speed-boosting items"""
+    return math.floor(side['stats']['speed'] * SPEED_ITEMS.get(side['item'], 1.0))
+
+
+def _assumed_moves(side):
+    """Best STAB move per type and class from the learnset, when no moves were picked"""
+    if not is_threat_scan_ready():
+        return []
+    index = get_threat_index()
+    row = index.rows.get(side['name'])
+    if row is None:
+        return []
+    moves = []
+    for slot, t in enumerate(index.stab_type[row]):
+        if t < 0:
+            continue
+        for c, cls in enumerate(DAMAGE_CLASSES):
+            power = int(index.stab_power[row, slot, c])
+            if power:
+                moves.append({'name': f"best {TYPES[t]} {cls} STAB", 'type': TYPES[t],
+                              'power': power, 'damage_class': cls})
+    return moves
+
+
+def move_damage(attacker, defender, move, chart):
+    """
+    Damage range of one move, as a share of the defender's HP
+
+    Returns:
+        dict: {'move', 'type', 'damage_class', 'power', 'multiplier',
+               'min_percent', 'max_percent', 'hits_to_ko'} or None for status moves
+    """
+    cls = move['damage_class']
+    if cls not in DAMAGE_CLASSES or not move['power']:
+        return None
+
+    attack = attacker['stats'][ATTACK_STATS[cls]]
+    item_class, item_boost = ATTACK_ITEMS.get(attacker['item'], (None, 1.0))
+    if item_class == cls:
+        attack = math.floor(attack * item_boost)
+    defense = defender['stats'][DEFENSE_STATS[cls]]
+    defense_class, defense_boost = DEFENSE_ITEMS.get(defender['item'], (cls, 1.0))
+    if defense_class in (None, cls):
+        defense = math.floor(defense * defense_boost)
+
+    multiplier = type_multiplier(move['type'], defender['types'], chart)
+    modifier = (STAB if move['type'] in attacker['types'] else 1.0) * multiplier
+    modifier *= DAMAGE_ITEMS.get(attacker['item'], 1.0)
+    if multiplier > 1:
+        modifier *= SUPER_EFFECTIVE_ITEMS.get(attacker['item'], 1.0)
+
+    max_damage = calculate_damage(50, move['power'], attack, defense, modifier)
+    min_damage = math.floor(max_damage * MIN_ROLL)
+    if multiplier:
+        # A hit that isn't immune always deals at least 1 HP, even on the lowest roll
+        max_damage, min_damage = max(1, max_damage), max(1, min_damage)
+    hp = defender['stats']['hp']
+    return {
+        'move': move['name'],
+        'type': move['type'],
+        'damage_class': cls,
+        'power': move['power'],
+        'multiplier': multiplier,
+        'min_percent': min_damage / hp * 100,
+        'max_percent': max_damage / hp * 100,
+        'hits_to_ko': (math.ceil(hp / max_damage) if max_damage else None,
+                       math.ceil(hp / min_damage) if min_damage else None),
+    }
+
+
+def side_moves(side):
+    """
+    Move records a side attacks with
+
+    Returns:
+        tuple: (moves, assumed) - its picked moves, or its best STAB moves
+               from the learnset (assumed=True) when none were picked
+    """
+    if side['moves']:
+        return [m for m in (_move_record(name) for name in side['moves']) if m], False
+    return _assumed_moves(side), True
+
+
+def _damage_table(attacker, defender, chart):
+    moves, assumed = side_moves(attacker)
+    rows = [row for row in (move_damage(attacker, defender, m, chart) for m in moves) if row]
+    rows.sort(key=lambda r: r['max_percent'], reverse=True)
+    return {'assumed': assumed, 'moves': rows}
+
+
+def build_matchup_facts(p1, p2):
+    """
+    Compute the deterministic facts of a Lv. 50 1v1
+
+    Args:
+        p1 (dict): User's side (make_side)
+        p2 (dict): Opponent's side (make_side)
+
+    Returns:
+        dict: {'p1', 'p2', 'speed', 'types', 'damage'}; speed['first'] is the
+              side key ('p1' or 'p2') that moves first, None on a tie, so
+              mirror matchups stay unambiguous
+    """
+    chart = get_type_chart()
+    p1_speed, p2_speed = effective_speed(p1), effective_speed(p2)
+    if p1_speed == p2_speed:
+        first = None
+    else:
+        first = 'p1' if p1_speed > p2_speed else 'p2'
+
+    return {
+        'p1': p1,
+        'p2': p2,
+        'speed': {'p1': p1_speed, 'p2': p2_speed, 'first': first},
+        'types': {
+            'p1_to_p2': {t: type_multiplier(t, p2['types'], chart) for t in p1['types']},
+            'p2_to_p1': {t: type_multiplier(t, p1['types'], chart) for t in p2['types']},
+        },
+        'damage': {
+            'p1_to_p2': _damage_table(p1, p2, chart),
+            'p2_to_p1': _damage_table(p2, p1, chart),
+        },
+    }
+
+
+def _fewest_hits(table):
+    """(guaranteed, possible) hits to KO with the best move, or None"""
+    hits = [r['hits_to_ko'] for r in table['moves'] if r['hits_to_ko'][0]]
+    if not hits:
+        return None
+    return min(h[1] for h in hits), min(h[0] for h in hits)
+
+
+def estimate_win_probability(facts):
+    """
+    Rough 1v1 win chance for the user from hits-to-KO and turn order
+
+    Used when the narrative doesn't state a probability.
+
+    Returns:
+        int: Percentage from 5 to 95
+    """
+    p1_hits = _fewest_hits(facts['damage']['p1_to_p2'])
+    p2_hits = _fewest_hits(facts['damage']['p2_to_p1'])
+    if not p1_hits and not p2_hits:
+        return 50
+    if not p1_hits:
+        return 10
+    if not p2_hits:
+        return 90
+    p1_turns = sum(p1_hits) / 2
+    p2_turns = sum(p2_hits) / 2
+    speed = facts['speed']
+    if speed['first'] == 'p1':
+        p1_turns -= 0.5
+    elif speed['first'] == 'p2':
+        p2_turns -= 0.5
+    return int(min(95, max(5, 50 + 20 * (p2_turns - p1_turns))))
+
+
+def format_fact_sheet(facts):
+    """
+    Compact plain-text summary of the facts for the LLM
+
+    Returns:
+        str: A few short lines
+    """
+    def side_line(label, side, speed):
+        stats = side['stats']
+        return (f"{label} {side['name']} ({'/'.join(side['types'])}) {side['nature']} @ {side['item']}; "
+                f"abilities {', '.join(side['abilities'])}; HP {stats['hp']} Atk {stats['attack']} "
+                f"Def {stats['defense']} SpA {stats['special-attack']} SpD {stats['special-defense']} "
+                f"Spe {speed}")
+
+    def damage_line(attacker, defender, table):
+        if not table['moves']:
+            return f"{attacker} -> {defender}: no damaging moves"
+        parts = []
+        for r in table['moves'][:4]:
+            best, worst = r['hits_to_ko']
+            ko = f"{best}HKO" if best == worst else f"{best}-{worst}HKO"
+            parts.append(f"{r['move']} ({r['type']}, x{r['multiplier']:g}) "
+                         f"{r['min_percent']:.0f}-{r['max_percent']:.0f}% {ko}")
+        suffix = " (assumed from learnset)" if table['assumed'] else ""
+        return f"{attacker} -> {defender}{suffix}: " + "; ".join(parts)
+
+    p1, p2 = facts['p1'], facts['p2']
+    speed = facts['speed']
+    labels = {'p1': "USER", 'p2': "OPPONENT"}
+    first = f"{labels[speed['first']]} {facts[speed['first']]['name']} moves first" if speed['first'] else "speed tie"
+    return "\n".join([
+        side_line("USER", p1, speed['p1']),
+        side_line("OPPONENT", p2, speed['p2']),
+        f"Speed: {first} ({speed['p1']} vs {speed['p2']})",
+        damage_line(p1['name'], p2['name'], facts['damage']['p1_to_p2']),
+        damage_line(p2['name'], p1['name'], facts['damage']['p2_to_p1']),
+    ])
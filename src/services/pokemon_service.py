@@ -2,7 +2,7 @@
 Pokemon Service
 Business logic for Pokemon operations
 """
-from src.api.pokeapi_client import get_species_data, get_evolution_chain_data
+from src.services.evolution_service import ensure_species, get_evolution_index
 
 
 def get_pokemon_description(species_data):
@@ -46,38 +46,21 @@ def get_pokemon_varieties(species_data, current_name):
 
 def get_evolution_chain(species_url):
     """
-    Fetch and parse evolution chain
+    Get the evolution family from the precomputed evolution index
+    
+    Branching chains (Eevee, Tyrogue) are kept intact: members are ordered
+    by stage and each one records which species it evolves from.
     
     Args:
         species_url (str): URL to species endpoint
         
     Returns:
-        list: List of evolution stages with name and id
+        list: List of evolution stages with name, id, stage, from and condition
     """
-    species_data = get_species_data(species_url)
-    if not species_data:
+    species_name = ensure_species(species_url)
+    if not species_name:
         return []
-    
-    evo_chain_url = species_data.get('evolution_chain', {}).get('url')
-    if not evo_chain_url:
-        return []
-    
-    evo_data = get_evolution_chain_data(evo_chain_url)
-    if not evo_data:
-        return []
-    
-    chain = evo_data.get('chain', {})
-    evo_list = []
-    
-    def parse_evolution(chain_node):
-        species_name = chain_node['species']['name']
-        species_id = chain_node['species']['url'].split('/')[-2]
-        evo_list.append({'name': species_name, 'id': species_id})
-        for next_node in chain_node.get('evolves_to', []):
-            parse_evolution(next_node)
-    
-    parse_evolution(chain)
-    return evo_list
+    return get_evolution_index().get_family(species_name)
 
 
 def get_abilities_info(pokemon_data):
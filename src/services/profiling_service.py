@@ -0,0 +1,343 @@
+"""
+Profiling Service
+Opt-in per-rerun profiling with flame graphs and hot-function tables
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from html import escape
+
+import streamlit as st
+
+from src.config.constants import ADMIN_ENABLED, DATA_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_TOP_N, PROFILE_MAX_FILES
+
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles")
+PROFILE_MODES = ("deterministic", "sampling")
+
+# cProfile hooks are per thread, but only one deterministic profile runs at a
+# time so concurrent sessions don't skew each other's timings
+_deterministic_lock = threading.Lock()
+
+
+def get_profiling_mode():
+    """
+    Get this session's profiling mode
+
+    ?profile=1 (or ?profile=deterministic) turns on cProfile plus stack
+    sampling, ?profile=sampling turns on sampling only and ?profile=off
+    turns profiling off. The choice is kept in session_state, so it
+    sticks for the session's reruns. Profiling is admin-only: without
+    ADMIN_ENABLED the param is ignored and profiling is always off.
+
+    Returns:
+        str: One of PROFILE_MODES, or None when profiling is off
+    """
+    if not ADMIN_ENABLED:
+        return None
+    requested = st.query_params.get("profile")
+    if requested is not None:
+        # Consume the param so later toggles aren't overridden on rerun
+        del st.query_params["profile"]
+        requested = requested.lower()
+        if requested in ("", "0", "off", "false"):
+            st.session_state.profiling_mode = None
+        elif requested == "sampling":
+            st.session_state.profiling_mode = "sampling"
+        else:
+            st.session_state.profiling_mode = "deterministic"
+    return st.session_state.get("profiling_mode")
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples one thread's call stack on a timer
+
+    Samples are kept as folded stacks (root-first frame labels joined by
+    ';') with their counts, the input format for flame graphs.
+    """
+
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def top_functions_from_stats(profiler, n=PROFILE_TOP_N):
+    """
+    Hot functions from a cProfile run
+
+    Args:
+        profiler (cProfile.Profile): Finished profiler
+        n (int): Rows per ranking (by own time and by cumulative time)
+
+    Returns:
+        list: [{'function', 'calls', 'own', 'cumulative'}, ...] in seconds
+    """
+    rows = [
+        {
+            'function': f"{func} ({os.path.basename(filename)}:{line})",
+            'calls': calls,
+            'own': own,
+            'cumulative': cumulative,
+        }
+        for (filename, line, func), (_, calls, own, cumulative, _) in pstats.Stats(profiler).stats.items()
+    ]
+    by_own = sorted(rows, key=lambda r: r['own'], reverse=True)[:n]
+    by_cumulative = sorted(rows, key=lambda r: r['cumulative'], reverse=True)[:n]
+    hot = {r['function']: r for r in by_own + by_cumulative}
+    return sorted(hot.values(), key=lambda r: r['cumulative'], reverse=True)
+
+
+def top_functions_from_samples(samples, interval, n=PROFILE_TOP_N):
+    """
+    Hot functions estimated from stack samples
+
+    Args:
+        samples (dict): Folded stack -> sample count
+        interval (float): Seconds between samples
+        n (int): Number of rows
+
+    Returns:
+        list: [{'function', 'calls', 'own', 'cumulative'}, ...] in seconds
+    """
+    own = Counter()
+    cumulative = Counter()
+    for stack, count in samples.items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        for frame in set(frames):
+            cumulative[frame] += count
+    return [
+        {'function': func, 'calls': None, 'own': own[func] * interval, 'cumulative': total * interval}
+        for func, total in cumulative.most_common(n)
+    ]
+
+
+def render_flame_graph(samples, width=1200, row_height=18):
+    """
+    Render folded stacks as an SVG flame graph
+
+    Args:
+        samples (dict): Folded stack -> sample count
+        width (int): SVG width in pixels
+        row_height (int): Height of one stack level in pixels
+
+    Returns:
+        str: SVG document, or "" when there are no samples
+    """
+    total = sum(samples.values())
+    if not total:
+        return ""
+
+    # Merge stacks into a tree: label -> [count, children]
+    root = [0, {}]
+    for stack, count in samples.items():
+        root[0] += count
+        node = root
+        for frame in stack.split(";"):
+            node = node[1].setdefault(frame, [0, {}])
+            node[0] += count
+
+    rects = []
+    max_depth = 0
+
+    def layout(children, x, depth):
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+        for label, (count, grandchildren) in sorted(children.items()):
+            w = count / total * width
+            if w >= 0.5:
+                rects.append((x, depth, w, label, count))
+                layout(grandchildren, x, depth + 1)
+            x += w
+
+    layout(root[1], 0.0, 0)
+    height = (max_depth + 1) * row_height
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+    ]
+    for x, depth, w, label, count in rects:
+        # Flame graphs grow upwards from the root at the bottom
+        y = height - (depth + 1) * row_height
+        hue = 10 + zlib.crc32(label.split(" ")[0].encode()) % 40
+        text = escape(label)
+        parts.append(
+            f'<g><title>{text} — {count} samples ({count / total * 100:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" '
+            f'fill="hsl({hue}, 85%, 60%)" rx="2"/>'
+        )
+        if w > 40:
+            chars = int(w / 7)
+            shown = text if len(label) <= chars else escape(label[:max(chars - 2, 0)]) + ".."
+            parts.append(f'<text x="{x + 3:.1f}" y="{y + row_height - 5}">{shown}</text>')
+        parts.append('</g>')
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def save_profile(profile, flame_graph):
+    """
+    Persist a profile and its flame graph, pruning the oldest beyond PROFILE_MAX_FILES
+
+    Args:
+        profile (dict): Profile metadata and hot-function table
+        flame_graph (str): SVG document
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, profile['id'])
+    with open(base + ".svg", "w") as f:
+        f.write(flame_graph)
+    tmp_path = base + ".json.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(profile, f)
+    os.replace(tmp_path, base + ".json")
+
+    # Ids start with a timestamp, so name order is age order
+    ids = sorted((n[:-len(".json")] for n in os.listdir(PROFILE_DIR) if n.endswith(".json")), reverse=True)
+    for stale_id in ids[PROFILE_MAX_FILES:]:
+        for ext in (".json", ".svg"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, stale_id + ext))
+            except OSError:
+                pass
+
+
+def list_profiles():
+    """
+    List saved profiles
+
+    Returns:
+        list: Profile summaries (without the hot-function table), newest first
+    """
+    try:
+        names = [n for n in os.listdir(PROFILE_DIR) if n.endswith(".json")]
+    except OSError:
+        return []
+    profiles = []
+    for name in names:
+        profile = load_profile(name[:-len(".json")])
+        if profile:
+            profile.pop('top', None)
+            profiles.append(profile)
+    return sorted(profiles, key=lambda p: p['started'], reverse=True)
+
+
+def load_profile(profile_id):
+    """
+    Load a saved profile
+
+    Args:
+        profile_id (str): Profile id
+
+    Returns:
+        dict: Profile with 'top' table, or None if missing
+    """
+    try:
+        with open(os.path.join(PROFILE_DIR, os.path.basename(profile_id) + ".json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_flame_graph(profile_id):
+    """
+    Load a saved profile's flame graph
+
+    Returns:
+        str: SVG document, or "" if missing
+    """
+    try:
+        with open(os.path.join(PROFILE_DIR, os.path.basename(profile_id) + ".svg")) as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+@contextmanager
+def profile_rerun(view, mode, session_id=None):
+    """
+    Profile the code run inside the block and save the result
+
+    Stack sampling always runs and feeds the flame graph. In
+    'deterministic' mode cProfile also runs and provides exact call
+    counts and timings for the hot-function table; if another session
+    holds the deterministic profiler, this rerun falls back to sampling.
+
+    Args:
+        view (str): View being rendered ('home', 'detail', 'battle', ...)
+        mode (str): One of PROFILE_MODES, or None to run unprofiled
+        session_id (str): Session the rerun belongs to
+    """
+    if mode not in PROFILE_MODES:
+        yield
+        return
+
+    profiler = None
+    if mode == "deterministic" and _deterministic_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident())
+
+    started = time.time()
+    sampler.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            _deterministic_lock.release()
+        sampler.stop()
+        elapsed = time.time() - started
+
+        samples = dict(sampler.samples)
+        if profiler:
+            top = top_functions_from_stats(profiler)
+        else:
+            top = top_functions_from_samples(samples, sampler.interval)
+        profile = {
+            'id': f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}-{view}-{uuid.uuid4().hex[:6]}",
+            'view': view,
+            'mode': "deterministic" if profiler else "sampling",
+            'session': session_id,
+            'started': started,
+            'duration': elapsed,
+            'samples': sum(samples.values()),
+            'top': top,
+        }
+        try:
+            save_profile(profile, render_flame_graph(samples))
+        except OSError:
+            pass
@@ -0,0 +1,118 @@
+"""
+Similarity Service
+Nearest-neighbour "similar Pokemon" search over stat, type and ability vectors
+"""
+import numpy as np
+import streamlit as st
+
+from src.config.constants import STAT_CONFIG, TYPE_ID_MAP, SIMILARITY_WEIGHTS
+from src.services.dex_service import get_dex_table, get_dex_index_key
+
+
+class SimilarityIndex:
+    """
+    Normalized feature matrix for brute-force k-nearest-neighbour queries
+
+    Each Pokemon is a row of z-scored base stats, type one-hots and
+    ability one-hots, each block scaled by SIMILARITY_WEIGHTS. A query
+    is one matrix-vector product over the whole dex.
+    """
+
+    def __init__(self, records):
+        self.names = [r['name'] for r in records]
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        self.species_rows = {}
+        for row, r in enumerate(records):
+            self.species_rows.setdefault(r['species'], []).append(row)
+        self.species = [r['species'] for r in records]
+
+        stats = np.array([[r['stats'].get(s, 0) for s in STAT_CONFIG] for r in records], dtype=np.float32)
+        stats = (stats - stats.mean(axis=0)) / (stats.std(axis=0) + 1e-6)
+
+        type_index = {t: i for i, t in enumerate(TYPE_ID_MAP)}
+        types = np.zeros((len(records), len(type_index)), dtype=np.float32)
+
+        ability_index = {}
+        for r in records:
+            for a in r['abilities'] + [r['hidden_ability']]:
+                if a and a not in ability_index:
+                    ability_index[a] = len(ability_index)
+        abilities = np.zeros((len(records), max(len(ability_index), 1)), dtype=np.float32)
+
+        for row, r in enumerate(records):
+            for t in r['types']:
+                if t in type_index:
+                    types[row, type_index[t]] = 1.0
+            for a in r['abilities'] + [r['hidden_ability']]:
+                if a:
+                    abilities[row, ability_index[a]] = 1.0
+
+        self.features = np.hstack([
+            stats * SIMILARITY_WEIGHTS['stats'],
+            types * SIMILARITY_WEIGHTS['types'],
+            abilities * SIMILARITY_WEIGHTS['abilities'],
+        ])
+        self.sq_norms = (self.features ** 2).sum(axis=1)
+
+    def nearest(self, name, k=5, exclude_same_species=True):
+        """
+        Find the Pokemon closest to another in feature space
+
+        Args:
+            name (str): Pokemon name
+            k (int): Number of results
+            exclude_same_species (bool): Skip other forms of the same species
+
+        Returns:
+            list: [(name, distance), ...] closest first
+        """
+        row = self.rows.get(name)
+        if row is None:
+            return []
+
+        # Squared distances to every row: |a|^2 - 2ab + |b|^2
+        distances = self.sq_norms - 2 * (self.features @ self.features[row]) + self.sq_norms[row]
+        distances[row] = np.inf
+        if exclude_same_species:
+            distances[self.species_rows[self.species[row]]] = np.inf
+
+        k = min(k, len(self.names) - 1)
+        if k <= 0:
+            return []
+        candidates = np.argpartition(distances, k)[:k]
+        candidates = candidates[np.argsort(distances[candidates])]
+        return [(self.names[i], float(np.sqrt(max(distances[i], 0.0))))
+                for i in candidates if np.isfinite(distances[i])]
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_similarity_index(dex_key):
+    return SimilarityIndex(get_dex_table().snapshot())
+
+
+def get_similarity_index():
+    """
+    Get the similarity index for the current dex table
+
+    Returns:
+        SimilarityIndex: Rebuilt only when the dex table changes
+    """
+    return _build_similarity_index(get_dex_index_key())
+
+
+@st.cache_data(show_spinner=False, max_entries=2000)
+def get_similar_pokemon(name, k=5, dex_revision=None):
+    """
+    Cached nearest neighbours of a Pokemon
+
+    Args:
+        name (str): Pokemon name
+        k (int): Number of results
+        dex_revision (int): Dex table revision, part of the cache key
+
+    Returns:
+        list: [{'name', 'id', 'distance'}, ...] closest first
+    """
+    table = get_dex_table()
+    return [{'name': n, 'id': table.get(n)['id'], 'distance': d}
+            for n, d in get_similarity_index().nearest(name, k)]
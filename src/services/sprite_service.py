@@ -0,0 +1,130 @@
+"""
+Sprite Service
+Manifest of which sprite files exist, so the UI only requests real images
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+
+from src.config.constants import DEX_TABLE_WORKERS
+from src.api.pokeapi_client import request_json
+from src.api.rate_limiter import request_priority, PRIORITY_BACKGROUND
+from src.services.dex_service import get_dex_table, get_dex_index_key, build_dex_table, sprite_flags
+
+logger = logging.getLogger(__name__)
+
+SPRITE_BASE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/"
+
+# Path of each variant (see dex_service.SPRITE_KEYS) under SPRITE_BASE_URL
+SPRITE_PATHS = {
+    "gif": "other/showdown/{id}.gif",
+    "png": "{id}.png",
+    "artwork": "other/official-artwork/{id}.png",
+    "shiny": "shiny/{id}.png",
+    "shiny_artwork": "other/official-artwork/shiny/{id}.png",
+}
+
+# Assumed for ids the manifest doesn't know yet (the dex table is still building)
+DEFAULT_VARIANT = "png"
+
+GRID_VARIANTS = ("gif", "png")
+THUMBNAIL_VARIANTS = ("png", "artwork")
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_sprite_manifest(dex_key):
+    return {r['id']: frozenset(r.get('sprites', ())) for r in get_dex_table().snapshot()}
+
+
+def get_sprite_manifest():
+    """
+    Get the available sprite variants of every Pokemon id
+
+    Returns:
+        dict: {id: frozenset of variants}, rebuilt when the dex table changes
+    """
+    return _build_sprite_manifest(get_dex_index_key())
+
+
+def best_variant(pokemon_id, variants=GRID_VARIANTS, manifest=None):
+    """
+    First variant in preference order that exists for a Pokemon
+
+    Args:
+        pokemon_id (int): Pokemon id
+        variants (tuple): Keys of SPRITE_PATHS, most preferred first
+        manifest (dict): get_sprite_manifest(), to avoid repeated lookups in loops
+
+    Returns:
+        str: Variant key, DEFAULT_VARIANT when the id isn't in the manifest,
+             or None when it has none of the variants
+    """
+    available = (manifest if manifest is not None else get_sprite_manifest()).get(int(pokemon_id))
+    if available is None:
+        return DEFAULT_VARIANT
+    return next((v for v in variants if v in available), None)
+
+
+def sprite_url(pokemon_id, variants=THUMBNAIL_VARIANTS, pokemon_data=None):
+    """
+    URL of the best existing sprite for a Pokemon
+
+    Args:
+        pokemon_id (int): Pokemon id
+        variants (tuple): Keys of SPRITE_PATHS, most preferred first
+        pokemon_data (dict): Its '/pokemon' payload when already loaded; its
+                             sprite metadata is used instead of the manifest
+
+    Returns:
+        str: Sprite URL, or None when none of the variants exist
+    """
+    manifest = {int(pokemon_id): sprite_flags(pokemon_data.get('sprites') or {})} if pokemon_data else None
+    variant = best_variant(pokemon_id, variants, manifest)
+    if variant is None:
+        return None
+    return SPRITE_BASE_URL + SPRITE_PATHS[variant].format(id=pokemon_id)
+
+
+def refresh_sprite_flags(workers=DEX_TABLE_WORKERS):
+    """
+    Re-read every Pokemon's sprite metadata and update the manifest
+
+    Builds the dex table first if needed (new records already carry
+    fresh flags). Otherwise every record's flags are fetched again, so
+    sprites added upstream since the table was built are picked up.
+
+    Args:
+        workers (int): Parallel Pokemon fetches
+
+    Returns:
+        dict: {'built', 'records', 'changed', 'failed'}; 'built' is True when
+              the dex table was (re)built instead, then only 'records' is counted
+    """
+    table = get_dex_table()
+    if not table.complete:
+        table = build_dex_table(workers)
+        return {'built': True, 'records': len(table), 'changed': 0, 'failed': 0 if table.complete else None}
+
+    def refresh(record):
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                data = request_json(f"https://pokeapi.co/api/v2/pokemon/{record['id']}")
+        except requests.RequestException:
+            logger.warning("Could not fetch sprite metadata for %s", record['name'])
+            return None
+        flags = sprite_flags(data.get('sprites') or {})
+        if flags == record.get('sprites'):
+            return False
+        table.add(dict(record, sprites=flags))
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(refresh, table.snapshot()))
+
+    changed = sum(1 for r in results if r)
+    if changed:
+        table.save()
+    return {'built': False, 'records': len(results), 'changed': changed,
+            'failed': sum(1 for r in results if r is None)}
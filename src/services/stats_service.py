@@ -4,6 +4,10 @@ Calculates actual Pokemon stats based on Base Stats, IVs, EVs, Level, and Nature
 """
 import math
 
+import numpy as np
+
+from src.config.natures import NATURES
+
 def calculate_stat(stat_name, base, iv, ev, level, nature_modifier):
     """
     Calculate the actual value of a stat.
@@ -63,3 +67,138 @@ def calculate_all_stats(base_stats, evs, nature_data, level=50, ivs=31):
         final_stats[stat_name] = calculate_stat(stat_name, base_val, ivs, ev, level, modifier)
         
     return final_stats
+
+
+# --- Reverse calculation (scouting) ---
+
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+MAX_IV = 31
+MAX_EV = 252
+MAX_TOTAL_EVS = 510
+
+_EV_STEPS = MAX_EV // 4 + 1  # only floor(EV / 4) affects a stat
+_MODIFIERS = np.array([0.9, 1.0, 1.1])
+
+
+def _nature_patterns():
+    """Natures grouped by effect: [((plus, minus), [names]), ...] (the five neutral natures share one)"""
+    patterns = {}
+    for name, nature in NATURES.items():
+        patterns.setdefault((nature["plus"], nature["minus"]), []).append(name)
+    return list(patterns.items())
+
+
+_PATTERNS = _nature_patterns()
+# Index into _MODIFIERS for every nature pattern and stat
+_PATTERN_MODIFIERS = np.array([
+    [2 if plus == stat else 0 if minus == stat else 1 for stat in STAT_NAMES]
+    for (plus, minus), _ in _PATTERNS
+])
+
+
+def _stat_table(stat_name, base, level):
+    """
+    Every stat value reachable for one stat
+
+    Returns:
+        numpy.ndarray: [modifier, iv, ev // 4] real stat values
+    """
+    iv = np.arange(MAX_IV + 1)[:, None]
+    ev_step = np.arange(_EV_STEPS)[None, :]
+    raw = np.floor((2 * base + iv + ev_step) * level / 100)
+    if stat_name == "hp":
+        return np.broadcast_to(raw + level + 10, (len(_MODIFIERS),) + raw.shape)
+    value = raw + 5
+    # Same float arithmetic as calculate_stat, so results agree exactly
+    return np.floor(value[None, :, :] * _MODIFIERS[:, None, None])
+
+
+def infer_spreads(base_stats, observed, level=50, iv_range=(0, MAX_IV)):
+    """
+    Find every nature, EV and IV combination consistent with observed stats
+
+    Each stat is checked over all IVs and EVs at once (EVs in steps of 4,
+    the only granularity that changes a stat). Every nature then gets a
+    per-stat EV interval, which is narrowed until the 510 EV budget holds:
+    a stat can use at most what the other stats' minimums leave over.
+    Natures that don't fit are dropped. Spreads are counted by
+    convolving the per-stat EV distributions, so nothing is enumerated
+    one combination at a time.
+
+    Args:
+        base_stats (dict): Base stats by PokeAPI stat name
+        observed (dict): Known real stats by stat name; missing or None stats are unconstrained
+        level (int): Pokemon level
+        iv_range (tuple): (min, max) IVs to consider, e.g. (31, 31) to assume perfect IVs
+
+    Returns:
+        list: One entry per consistent nature effect, most plausible first:
+              [{'natures', 'plus', 'minus', 'spreads',
+                'stats': {stat: {'ev': (min, max), 'iv': (min, max)}},
+                'likely': {stat: EVs} or None}, ...]
+              'likely' is the smallest-EV spread with IVs of iv_range's max,
+              when that fits the budget. 'spreads' is approximate past 2**53.
+    """
+    iv_allowed = np.zeros(MAX_IV + 1, dtype=bool)
+    iv_allowed[iv_range[0]:iv_range[1] + 1] = True
+
+    # match[stat, modifier, iv, ev_step]
+    match = np.empty((len(STAT_NAMES), len(_MODIFIERS), MAX_IV + 1, _EV_STEPS), dtype=bool)
+    for s, stat in enumerate(STAT_NAMES):
+        target = observed.get(stat)
+        if target is None:
+            match[s] = True
+        else:
+            match[s] = _stat_table(stat, base_stats[stat], level) == target
+    match &= iv_allowed[None, None, :, None]
+
+    # consistent[pattern, stat, iv, ev_step]
+    consistent = match[np.arange(len(STAT_NAMES))[None, :], _PATTERN_MODIFIERS]
+    ev_ok = consistent.any(axis=2)  # [pattern, stat, ev_step]
+    feasible = ev_ok.any(axis=2).all(axis=1)
+
+    steps = np.arange(_EV_STEPS)
+    budget = MAX_TOTAL_EVS // 4
+    min_step = np.where(ev_ok, steps, _EV_STEPS).min(axis=2)
+    feasible &= min_step.sum(axis=1) <= budget
+    # Interval pruning: a stat's EVs are capped by what the others' minimums leave
+    max_allowed = budget - (min_step.sum(axis=1, keepdims=True) - min_step)
+    ev_ok &= steps[None, None, :] <= max_allowed[:, :, None]
+    consistent &= ev_ok[:, :, None, :]
+    max_step = np.where(ev_ok, steps, -1).max(axis=2)
+
+    iv_counts = consistent.sum(axis=2)  # [pattern, stat, ev_step] IVs per EV step
+    iv_ok = consistent.any(axis=3)  # [pattern, stat, iv]
+    ivs = np.arange(MAX_IV + 1)
+
+    results = []
+    for p in np.flatnonzero(feasible):
+        # Number of (EV, IV) spreads within the budget
+        total = np.ones(1)  # float: counts can exceed int64 when few stats are known
+        for s in range(len(STAT_NAMES)):
+            total = np.convolve(total, iv_counts[p, s])[:budget + 1]
+        spreads = int(total.sum())
+        if not spreads:
+            continue
+
+        stats = {}
+        for s, stat in enumerate(STAT_NAMES):
+            stat_ivs = ivs[iv_ok[p, s]]
+            stats[stat] = {'ev': (int(min_step[p, s]) * 4, int(max_step[p, s]) * 4),
+                           'iv': (int(stat_ivs.min()), int(stat_ivs.max()))}
+
+        top_iv = consistent[p, :, iv_range[1], :]  # [stat, ev_step]
+        likely = None
+        if top_iv.any(axis=1).all():
+            likely_steps = np.where(top_iv, steps, _EV_STEPS).min(axis=1)
+            if likely_steps.sum() <= budget:
+                likely = {stat: int(likely_steps[s]) * 4 for s, stat in enumerate(STAT_NAMES)}
+
+        (plus, minus), names = _PATTERNS[p]
+        results.append({'natures': names, 'plus': plus, 'minus': minus, 'spreads': spreads,
+                        'stats': stats, 'likely': likely})
+
+    results.sort(key=lambda r: (r['likely'] is None,
+                                sum(r['likely'].values()) if r['likely'] else MAX_TOTAL_EVS,
+                                r['spreads']))
+    return results
@@ -0,0 +1,213 @@
+"""
+Team Service
+Team-builder suggestions by beam search over the dex
+"""
+import numpy as np
+import streamlit as st
+
+from src.config.constants import TYPE_ID_MAP, TEAM_SIZE, TEAM_BEAM_WIDTH, TEAM_WEIGHTS
+from src.services.dex_service import get_dex_table, get_dex_index_key
+from src.services.type_service import get_type_chart
+from src.services.browse_service import get_generation
+
+TYPES = list(TYPE_ID_MAP)
+
+
+class TeamIndex:
+    """
+    Per-Pokemon type and stat arrays for scoring many teams at once
+
+    defense[row, t] is the log2 damage multiplier the Pokemon takes from
+    attacking type t (immunities count as -2), and offense[row, t] is
+    whether its STAB hits defending type t super effectively. A team is
+    summarized by weakness/resistance counts and a coverage mask, so
+    adding any candidate is one vector operation over all rows.
+    """
+
+    def __init__(self, records, type_chart):
+        self.records = records
+        self.names = [r['name'] for r in records]
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        self.species = np.array([r['species_id'] for r in records])
+        self.speed = np.array([r['stats'].get('speed', 0) for r in records])
+        self.total = np.array([sum(r['stats'].values()) for r in records], dtype=np.float32)
+        self.generations = np.array([get_generation(r['species_id']) for r in records])
+
+        multipliers = np.ones((len(TYPES), len(TYPES)), dtype=np.float32)  # [attacking, defending]
+        for i, attacking in enumerate(TYPES):
+            for j, defending in enumerate(TYPES):
+                multipliers[i, j] = type_chart.get(attacking, {}).get(defending, 1.0)
+        type_rows = {t: i for i, t in enumerate(TYPES)}
+
+        self.defense = np.zeros((len(records), len(TYPES)), dtype=np.float32)
+        self.offense = np.zeros((len(records), len(TYPES)), dtype=bool)
+        for row, r in enumerate(records):
+            taken = np.ones(len(TYPES), dtype=np.float32)
+            for t in r['types']:
+                if t in type_rows:
+                    taken *= multipliers[:, type_rows[t]]
+                    self.offense[row] |= multipliers[type_rows[t]] > 1
+            self.defense[row] = np.where(taken == 0, -2.0, np.log2(np.maximum(taken, 1e-6)))
+        self.weak = (self.defense > 0).astype(np.int16)
+        self.resist = (self.defense < 0).astype(np.int16)
+        self.double_weak = (self.defense >= 2).astype(np.int16)
+
+    def candidate_mask(self, banned=(), min_speed=0, generations=()):
+        """
+        Rows allowed by the constraints
+
+        Args:
+            banned (iterable): Pokemon names that may not be suggested
+            min_speed (int): Minimum base speed
+            generations (iterable): Allowed generations (all when empty)
+
+        Returns:
+            numpy.ndarray: Boolean mask over rows
+        """
+        mask = self.speed >= min_speed
+        if generations:
+            mask &= np.isin(self.generations, list(generations))
+        for name in banned:
+            if name in self.rows:
+                mask[self.rows[name]] = False
+        return mask
+
+    def _summary(self, rows):
+        rows = list(rows)
+        return (
+            self.weak[rows].sum(axis=0),
+            self.resist[rows].sum(axis=0),
+            self.double_weak[rows].sum(axis=0),
+            self.offense[rows].any(axis=0),
+            float(self.total[rows].sum()),
+        )
+
+    def score_additions(self, rows, candidates):
+        """
+        Score the team made by adding each candidate to a team
+
+        Args:
+            rows (list): Rows already on the team
+            candidates (numpy.ndarray): Candidate rows
+
+        Returns:
+            numpy.ndarray: Team score for each candidate
+        """
+        weak, resist, double_weak, covered, total = self._summary(rows)
+        size = len(rows) + 1
+
+        # Each attacking type hurts by how far its weaknesses outnumber resistances
+        open_weak = np.maximum(weak + self.weak[candidates] - resist - self.resist[candidates], 0)
+        defense = -(open_weak.astype(np.float32) ** 2).sum(axis=1)
+        defense -= (double_weak + self.double_weak[candidates]).sum(axis=1)
+
+        offense = (covered | self.offense[candidates]).sum(axis=1).astype(np.float32)
+        stats = (total + self.total[candidates]) / size / 100
+
+        return (TEAM_WEIGHTS['defense'] * defense
+                + TEAM_WEIGHTS['offense'] * offense
+                + TEAM_WEIGHTS['stats'] * stats)
+
+    def team_report(self, rows):
+        """
+        Describe a team's remaining holes
+
+        Returns:
+            dict: {'weaknesses': [types weak > resist], 'uncovered': [types not hit super effectively]}
+        """
+        if not rows:
+            return {'weaknesses': [], 'uncovered': list(TYPES)}
+        weak, resist, _, covered, _ = self._summary(rows)
+        return {
+            'weaknesses': [TYPES[t] for t in np.flatnonzero(weak > resist)],
+            'uncovered': [TYPES[t] for t in np.flatnonzero(~covered)],
+        }
+
+    def suggest(self, team, banned=(), min_speed=0, generations=(), team_size=TEAM_SIZE,
+                beam_width=TEAM_BEAM_WIDTH, picks=5):
+        """
+        Suggest next members and completed teams for a partial team
+
+        Beam search fills the free slots one at a time. Each step scores
+        every allowed candidate against every team in the beam, keeps the
+        best beam_width distinct teams and repeats. Only one member per
+        species is allowed.
+
+        Args:
+            team (list): Names already on the team
+            banned (iterable): Names that may not be suggested
+            min_speed (int): Minimum base speed of suggestions
+            generations (iterable): Allowed generations of suggestions
+            team_size (int): Full team size
+            beam_width (int): Teams kept per step
+            picks (int): Number of next-member suggestions
+
+        Returns:
+            dict: {'picks': [{'name', 'score', 'patches', 'adds_coverage'}],
+                   'teams': [{'members', 'score', 'weaknesses', 'uncovered'}]}
+        """
+        base = [self.rows[name] for name in team if name in self.rows]
+        allowed = np.flatnonzero(self.candidate_mask(banned, min_speed, generations))
+        free_slots = team_size - len(base)
+        if free_slots <= 0 or not len(allowed):
+            return {'picks': [], 'teams': []}
+
+        beam = [(0.0, tuple(base))]
+        first_scores = None
+        for _ in range(free_slots):
+            expanded = {}
+            for _, rows in beam:
+                taken_species = self.species[list(rows)] if rows else np.array([], dtype=int)
+                candidates = allowed[~np.isin(self.species[allowed], taken_species)]
+                if not len(candidates):
+                    continue
+                scores = self.score_additions(rows, candidates)
+                if first_scores is None:
+                    first_scores = (candidates, scores)
+                best = np.argsort(scores)[::-1][:beam_width]
+                for i in best:
+                    new_rows = tuple(sorted(rows + (int(candidates[i]),)))
+                    if new_rows not in expanded or expanded[new_rows] < scores[i]:
+                        expanded[new_rows] = float(scores[i])
+            if not expanded:
+                break
+            beam = sorted(((score, rows) for rows, score in expanded.items()), reverse=True)[:beam_width]
+
+        result = {'picks': [], 'teams': []}
+        if first_scores is not None:
+            candidates, scores = first_scores
+            before = self.team_report(base)
+            for i in np.argsort(scores)[::-1][:picks]:
+                row = int(candidates[i])
+                after = self.team_report(base + [row])
+                result['picks'].append({
+                    'name': self.names[row],
+                    'score': float(scores[i]),
+                    'patches': [t for t in before['weaknesses'] if t not in after['weaknesses']],
+                    'adds_coverage': [t for t in before['uncovered'] if t not in after['uncovered']],
+                })
+        for score, rows in beam:
+            report = self.team_report(list(rows))
+            ordered = base + [r for r in rows if r not in base]
+            result['teams'].append({
+                'members': [self.names[r] for r in ordered],
+                'score': score,
+                'weaknesses': report['weaknesses'],
+                'uncovered': report['uncovered'],
+            })
+        return result
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_team_index(dex_key):
+    return TeamIndex(get_dex_table().snapshot(), get_type_chart())
+
+
+def get_team_index():
+    """
+    Get the team index for the current dex table
+
+    Returns:
+        TeamIndex: Rebuilt only when the dex table changes
+    """
+    return _build_team_index(get_dex_index_key())
@@ -0,0 +1,148 @@
+"""
+Tier Service
+Sorted stat arrays over the whole dex for speed tiers and percentiles
+"""
+import bisect
+import math
+
+import streamlit as st
+
+from src.config.constants import STAT_CONFIG
+from src.services.dex_service import get_dex_table, get_dex_index_key
+from src.services.stats_service import calculate_stat
+
+LEVELS = (50, 100)
+
+# Standard spreads: (IV, EV, nature modifier); HP ignores the nature
+SPREADS = {
+    "min": (0, 0, 0.9),
+    "neutral": (31, 0, 1.0),
+    "max_neutral": (31, 252, 1.0),
+    "max_plus": (31, 252, 1.1),
+    "scarf": (31, 252, 1.1),
+}
+SPREAD_LABELS = {
+    "min": "Min (0 IV, -Nature)",
+    "neutral": "Neutral, 0 EVs",
+    "max_neutral": "Max EVs, Neutral",
+    "max_plus": "Max EVs, +Nature",
+    "scarf": "Max EVs, +Nature, Scarf",
+}
+
+
+def spread_stat(stat_name, base, level, spread):
+    """
+    Real stat of a base stat under a standard spread
+
+    Args:
+        stat_name (str): Stat name (e.g. 'speed')
+        base (int): Base stat
+        level (int): Pokemon level
+        spread (str): Key of SPREADS
+
+    Returns:
+        int: Real stat
+    """
+    iv, ev, modifier = SPREADS[spread]
+    value = calculate_stat(stat_name, base, iv, ev, level, 1.0 if stat_name == "hp" else modifier)
+    if spread == "scarf" and stat_name == "speed":
+        value = math.floor(value * 1.5)
+    return value
+
+
+class TierIndex:
+    """
+    Sorted arrays of real and base stats for every Pokemon
+
+    tiers[(level, stat, spread)] holds (values, names) sorted by value,
+    and base[stat] holds the sorted base stats, so every question is a
+    binary search.
+    """
+
+    def __init__(self, records):
+        self.size = len(records)
+        self.base = {}
+        self.tiers = {}
+        for stat in STAT_CONFIG:
+            self.base[stat] = sorted(r['stats'].get(stat, 0) for r in records)
+            for level in LEVELS:
+                for spread in SPREADS:
+                    pairs = sorted((spread_stat(stat, r['stats'].get(stat, 0), level, spread), r['name'])
+                                   for r in records)
+                    self.tiers[(level, stat, spread)] = ([v for v, _ in pairs], [n for _, n in pairs])
+
+    def base_percentile(self, stat, base_value):
+        """
+        Share of the dex with a lower base stat
+
+        Args:
+            stat (str): Stat name
+            base_value (int): Base stat
+
+        Returns:
+            float: Percentile from 0 to 100
+        """
+        values = self.base.get(stat)
+        if not values:
+            return 0.0
+        return bisect.bisect_left(values, base_value) / len(values) * 100
+
+    def compare(self, value, level=50, stat="speed", spread="max_neutral"):
+        """
+        Count how many Pokemon a real stat beats, ties and loses to
+
+        Args:
+            value (int): Real stat of the set in question
+            level (int): 50 or 100
+            stat (str): Stat name
+            spread (str): Spread everyone else is assumed to run
+
+        Returns:
+            dict: {'below', 'ties', 'above', 'percentile'}
+        """
+        values, _ = self.tiers[(level, stat, spread)]
+        low = bisect.bisect_left(values, value)
+        high = bisect.bisect_right(values, value)
+        return {
+            'below': low,
+            'ties': high - low,
+            'above': len(values) - high,
+            'percentile': low / len(values) * 100 if values else 0.0,
+        }
+
+    def outspeeds(self, speed, level=50, spread="max_neutral", limit=10):
+        """
+        The fastest Pokemon a speed still outspeeds
+
+        Returns:
+            list: [(speed, name), ...] fastest first
+        """
+        values, names = self.tiers[(level, "speed", spread)]
+        end = bisect.bisect_left(values, speed)
+        return [(values[i], names[i]) for i in range(end - 1, max(end - limit, 0) - 1, -1)]
+
+    def outsped_by(self, speed, level=50, spread="max_neutral", limit=10):
+        """
+        The slowest Pokemon that outspeed a speed
+
+        Returns:
+            list: [(speed, name), ...] slowest first
+        """
+        values, names = self.tiers[(level, "speed", spread)]
+        start = bisect.bisect_right(values, speed)
+        return [(values[i], names[i]) for i in range(start, min(start + limit, len(values)))]
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_tier_index(dex_key):
+    return TierIndex(get_dex_table().snapshot())
+
+
+def get_tier_index():
+    """
+    Get the tier index for the current dex table
+
+    Returns:
+        TierIndex: Rebuilt only when the dex table changes
+    """
+    return _build_tier_index(get_dex_index_key())
@@ -0,0 +1,248 @@
+"""
+Tournament Service
+Round-robin 1v1 tournaments between configured sets, without the LLM
+"""
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+import numpy as np
+
+from src.config.constants import TOURNAMENT_WORKERS, TOURNAMENT_CHUNKS_PER_WORKER
+from src.config.natures import NATURES
+from src.api.pokeapi_client import get_pokemon_data, PokeAPIError
+from src.services.dex_service import get_dex_table
+from src.services.stats_service import calculate_all_stats
+from src.services.type_service import get_type_chart
+from src.services.matchup_service import make_side, side_moves, move_damage, effective_speed
+
+
+def _title(name):
+    return name.replace('-', ' ').title()
+
+
+def prepare_side(pokemon_set):
+    """
+    Turn a configured set into a battle side with its moves resolved
+
+    Args:
+        pokemon_set (dict): {'name', 'nature', 'evs', 'moves', 'item'} as built by the
+                            battle card; 'stats' (Lv. 50 real stats), 'ivs' and 'label'
+                            are optional
+
+    Returns:
+        dict: make_side() plus 'label', 'move_records' and 'assumed', or None if
+              the Pokemon is unknown
+
+    Raises:
+        ValueError: If the set has no name, an unknown nature or moves that
+                    aren't a list of move names
+    """
+    if not isinstance(pokemon_set, dict) or not pokemon_set.get('name'):
+        raise ValueError("set has no name")
+    name = str(pokemon_set['name']).strip().lower().replace(' ', '-')
+    nature = str(pokemon_set.get('nature') or "Hardy").strip().title()
+    if nature not in NATURES:
+        raise ValueError(f"unknown nature {pokemon_set['nature']!r}")
+    moves = pokemon_set.get('moves') or []
+    if not isinstance(moves, list) or not all(isinstance(m, str) for m in moves):
+        raise ValueError("moves must be a list of move names")
+    record = get_dex_table().get(name)
+    if record:
+        base_stats = record['stats']
+        side = {
+            'name': name,
+            'types': record['types'],
+            'abilities': record['abilities'] + ([record['hidden_ability']] if record['hidden_ability'] else []),
+            'moves': list(moves),
+            'item': pokemon_set.get('item') or "None",
+            'nature': nature,
+        }
+    else:
+        data = get_pokemon_data(name)
+        if not data:
+            return None
+        base_stats = {s['stat']['name']: s['base_stat'] for s in data['stats']}
+        side = make_side(name, data, moves, pokemon_set.get('item'), None, nature)
+
+    side['stats'] = pokemon_set.get('stats') or calculate_all_stats(
+        base_stats, pokemon_set.get('evs') or {}, NATURES[nature], ivs=pokemon_set.get('ivs', 31))
+    side['label'] = pokemon_set.get('label') or (
+        _title(name) + (f" @ {side['item']}" if side['item'] != "None" else ""))
+    side['move_records'], side['assumed'] = side_moves(side)
+    return side
+
+
+def _unique_labels(sides):
+    counts = {}
+    for side in sides:
+        counts[side['label']] = counts.get(side['label'], 0) + 1
+        if counts[side['label']] > 1:
+            side['label'] = f"{side['label']} #{counts[side['label']]}"
+
+
+def prepare_sides(sets):
+    """
+    Prepare a pool of sets; invalid sets, unknown Pokemon and ones PokeAPI
+    can't serve right now are dropped
+
+    Returns:
+        tuple: (sides, skipped) with one "name: reason" string per dropped set
+    """
+    sides, skipped = [], []
+    for pokemon_set in sets:
+        name = pokemon_set.get('name') if isinstance(pokemon_set, dict) else None
+        try:
+            side = prepare_side(pokemon_set)
+            reason = "unknown Pokemon"
+        except (ValueError, TypeError, AttributeError) as e:
+            side, reason = None, f"invalid set ({e})"
+        except PokeAPIError:
+            side, reason = None, "PokeAPI unavailable"
+        if side is None:
+            skipped.append(f"{name or '(unnamed)'}: {reason}")
+        else:
+            sides.append(side)
+    _unique_labels(sides)
+    return sides, skipped
+
+
+# --- Battle model (runs in worker processes; no Streamlit or network access) ---
+
+def _best_move(attacker, defender, chart):
+    """The move that KOs in the fewest max-roll hits, or None without damaging moves"""
+    rows = [r for r in (move_damage(attacker, defender, m, chart) for m in attacker['move_records'])
+            if r and r['hits_to_ko'][0]]
+    if not rows:
+        return None
+    return min(rows, key=lambda r: (r['hits_to_ko'][0], r['hits_to_ko'][1], -r['max_percent']))
+
+
+def _outcome(a_hits, b_hits, a_speed, b_speed):
+    """A's result (1, 0.5 or 0) when A needs a_hits and B needs b_hits to KO"""
+    if a_hits == b_hits == math.inf:
+        return 0.5
+    if a_speed > b_speed:
+        return 1.0 if a_hits <= b_hits else 0.0
+    if a_speed < b_speed:
+        return 1.0 if a_hits < b_hits else 0.0
+    if a_hits == b_hits:
+        return 0.5  # speed tie: either side moves first
+    return 1.0 if a_hits < b_hits else 0.0
+
+
+def play_matchup(a, b, chart):
+    """
+    Deterministic 1v1 between two prepared sides
+
+    Both sides spam the move that KOs fastest, the faster side moving
+    first. The fight is played under both the highest and lowest damage
+    roll for each side, and A's score is the average of the four results.
+
+    Returns:
+        dict: {'score' (A's share, 0 to 1), 'a_move', 'b_move', 'a_hits', 'b_hits'}
+              with hits as (max roll, min roll)
+    """
+    a_move, b_move = _best_move(a, b, chart), _best_move(b, a, chart)
+    a_hits = a_move['hits_to_ko'] if a_move else (math.inf, math.inf)
+    b_hits = b_move['hits_to_ko'] if b_move else (math.inf, math.inf)
+    a_speed, b_speed = effective_speed(a), effective_speed(b)
+    score = sum(_outcome(ah, bh, a_speed, b_speed) for ah in a_hits for bh in b_hits) / 4
+    return {
+        'score': score,
+        'a_move': a_move['move'] if a_move else None,
+        'b_move': b_move['move'] if b_move else None,
+        'a_hits': a_hits if a_move else None,
+        'b_hits': b_hits if b_move else None,
+    }
+
+
+_worker_sides = None
+_worker_chart = None
+
+
+def _init_worker(sides, chart):
+    global _worker_sides, _worker_chart
+    _worker_sides = sides
+    _worker_chart = chart
+
+
+def _play_chunk(pairs):
+    return [(i, j, play_matchup(_worker_sides[i], _worker_sides[j], _worker_chart)) for i, j in pairs]
+
+
+def iter_tournament(sides, workers=TOURNAMENT_WORKERS, chunks_per_worker=TOURNAMENT_CHUNKS_PER_WORKER):
+    """
+    Play every pair of sides, yielding results as chunks finish
+
+    Pairs are split into workers * chunks_per_worker chunks so each
+    process gets a few batches (keeps per-task overhead low while
+    still balancing load). With one worker everything runs in-process.
+
+    Args:
+        sides (list): From prepare_sides
+        workers (int): Worker processes
+        chunks_per_worker (int): Chunks handed to each worker
+
+    Yields:
+        list: [(i, j, play_matchup result), ...] for one finished chunk
+    """
+    chart = get_type_chart()
+    pairs = list(combinations(range(len(sides)), 2))
+    if not pairs:
+        return
+    if workers <= 1:
+        _init_worker(sides, chart)
+        chunk_size = max(1, math.ceil(len(pairs) / chunks_per_worker))
+        for start in range(0, len(pairs), chunk_size):
+            yield _play_chunk(pairs[start:start + chunk_size])
+        return
+
+    chunk_size = max(1, math.ceil(len(pairs) / (workers * chunks_per_worker)))
+    chunks = [pairs[start:start + chunk_size] for start in range(0, len(pairs), chunk_size)]
+    # Spawn, not fork: the Streamlit server is multi-threaded and a forked
+    # child can inherit locks held by other threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(sides, chart)) as executor:
+        futures = [executor.submit(_play_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(sides, results):
+    """
+    Win-rate matrix and ranking from played matchups
+
+    Args:
+        sides (list): From prepare_sides
+        results (iterable): (i, j, play_matchup result) tuples
+
+    Returns:
+        dict: {'matrix': [[row's score against column, None on the diagonal]],
+               'ranking': [{'label', 'name', 'wins', 'draws', 'losses', 'win_rate'}, ...]}
+              A win is a matchup scored above 0.5 and a loss one below it.
+    """
+    n = len(sides)
+    matrix = np.full((n, n), np.nan)
+    for i, j, result in results:
+        matrix[i, j] = result['score']
+        matrix[j, i] = 1 - result['score']
+
+    ranking = []
+    for i, side in enumerate(sides):
+        row = matrix[i][~np.isnan(matrix[i])]
+        ranking.append({
+            'label': side['label'],
+            'name': side['name'],
+            'wins': int((row > 0.5).sum()),
+            'draws': int((row == 0.5).sum()),
+            'losses': int((row < 0.5).sum()),
+            'win_rate': float(row.mean()) if len(row) else 0.0,
+        })
+    ranking.sort(key=lambda r: (r['win_rate'], r['wins']), reverse=True)
+    return {
+        'matrix': [[None if np.isnan(v) else float(v) for v in row] for row in matrix],
+        'ranking': ranking,
+    }
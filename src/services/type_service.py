@@ -2,30 +2,81 @@
 Type Service
 Handles type effectiveness calculations and type-related operations
 """
-import streamlit as st
 import requests
-from src.config.constants import TYPE_ID_MAP
+from src.config.constants import TYPE_ID_MAP, TYPE_CHART_TTL
+from src.api.pokeapi_client import fetch_json, PokeAPIError
+from src.api.shared_cache import shared_cache_data
 
 
-@st.cache_data
+def get_type_data(type_name):
+    """
+    Fetch damage relations for a single type
+    
+    Args:
+        type_name (str): Type name (e.g., 'fire')
+        
+    Returns:
+        dict: Damage relations or None if failed
+    """
+    try:
+        return fetch_json(f"https://pokeapi.co/api/v2/type/{type_name}")['damage_relations']
+    except requests.RequestException:
+        return None
+
+
+def _require_type_data(type_name):
+    """Damage relations of a type; raises so derived results are never cached half-built"""
+    try:
+        return fetch_json(f"https://pokeapi.co/api/v2/type/{type_name}")['damage_relations']
+    except requests.RequestException as e:
+        raise PokeAPIError(f"Could not load type {type_name}: {e}") from e
+
+
+@shared_cache_data(ttl=TYPE_CHART_TTL, show_spinner=False)
+def get_type_chart():
+    """
+    Build the full attacking type chart
+    
+    Returns:
+        dict: {attacking_type: {defending_type: multiplier}} with only
+              non-neutral multipliers listed
+        
+    Raises:
+        PokeAPIError: If any type could not be fetched (nothing is cached)
+    """
+    chart = {}
+    for attacking in TYPE_ID_MAP:
+        data = _require_type_data(attacking)
+        row = {}
+        for type_node in data['double_damage_to']:
+            row[type_node['name']] = 2.0
+        for type_node in data['half_damage_to']:
+            row[type_node['name']] = 0.5
+        for type_node in data['no_damage_to']:
+            row[type_node['name']] = 0.0
+        chart[attacking] = row
+    return chart
+
+
+@shared_cache_data(ttl=TYPE_CHART_TTL, show_spinner=False)
 def get_type_effectiveness(types):
     """
     Calculate type effectiveness (weaknesses, resistances, immunities)
     
     Args:
-        types (list): List of type names (e.g., ['fire', 'flying'])
+        types (list): List of type names (e.g., ['fire', 'flying']); unknown names are ignored
         
     Returns:
         dict: Dictionary mapping type names to damage multipliers
+        
+    Raises:
+        PokeAPIError: If a type could not be fetched (nothing is cached)
     """
     damage_relations = {}
     
     for t in types:
-        url = f"https://pokeapi.co/api/v2/type/{t}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()['damage_relations']
-            
+        if t in TYPE_ID_MAP:
+            data = _require_type_data(t)
             # Double Damage From (Weakness)
             for type_node in data['double_damage_from']:
                 name = type_node['name']
@@ -0,0 +1,343 @@
+"""
+Warm-up Service
+Prefetches common data in the background so users never hit cold caches
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from src.config.constants import (
+    DATA_DIR,
+    GENERATIONS,
+    WARMUP_WORKERS,
+    WARMUP_TASKS_PER_SECOND,
+    WARMUP_TOP_N,
+    ACCESS_LOG_FLUSH_EVERY,
+    API_CACHE_TTL,
+    PREFETCH_WORKERS,
+    PREFETCH_MAX_PER_PAGE,
+    PREFETCH_SESSION_BUDGET,
+    PREFETCH_BUDGET_WINDOW,
+    PREFETCH_MAX_SESSIONS,
+)
+from src.api.pokeapi_client import (
+    get_all_pokemon_names,
+    get_pokemon_list,
+    get_pokemon_data,
+    get_species_data,
+)
+from src.services.pokemon_service import get_evolution_chain
+from src.services.evolution_service import build_evolution_index
+from src.services.dex_service import build_dex_table, build_move_table
+from src.services.type_service import get_type_chart
+from src.api.rate_limiter import request_priority, PRIORITY_BACKGROUND, PRIORITY_PREFETCH
+
+logger = logging.getLogger(__name__)
+
+ACCESS_LOG_PATH = os.path.join(DATA_DIR, "access_log.json")
+
+# --- Popularity Log ---
+_access_lock = threading.Lock()
+_access_counts = None
+_unflushed = 0
+
+
+def _load_access_counts():
+    """Load persisted access counts (caller holds the lock)"""
+    global _access_counts
+    if _access_counts is None:
+        _access_counts = Counter()
+        try:
+            with open(ACCESS_LOG_PATH) as f:
+                _access_counts.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+    return _access_counts
+
+
+def flush_access_log():
+    """Persist access counts to disk"""
+    global _unflushed
+    with _access_lock:
+        if _access_counts is None or not _unflushed:
+            return
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp_path = ACCESS_LOG_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(_access_counts), f)
+        os.replace(tmp_path, ACCESS_LOG_PATH)
+        _unflushed = 0
+
+
+atexit.register(flush_access_log)
+
+
+def record_access(pokemon_name):
+    """
+    Record a detail page view for popularity ranking
+
+    Args:
+        pokemon_name (str): Pokemon name
+    """
+    global _unflushed
+    with _access_lock:
+        _load_access_counts()[pokemon_name] += 1
+        _unflushed += 1
+        should_flush = _unflushed >= ACCESS_LOG_FLUSH_EVERY
+    if should_flush:
+        flush_access_log()
+
+
+def get_popular_pokemon(n=WARMUP_TOP_N):
+    """
+    Get the most viewed Pokemon
+
+    Args:
+        n (int): Number of Pokemon to return
+
+    Returns:
+        list: Pokemon names, most popular first
+    """
+    with _access_lock:
+        return [name for name, _ in _load_access_counts().most_common(n)]
+
+
+# --- Warm-up Scheduler ---
+class WarmupScheduler:
+    """Runs rate-limited prefetch tasks on a background thread pool"""
+
+    def __init__(self, workers=WARMUP_WORKERS, tasks_per_second=WARMUP_TASKS_PER_SECOND):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup")
+        self.interval = 1.0 / tasks_per_second
+        self.status = {"total": 0, "done": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def _throttle(self):
+        """Block until the next request slot is available"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _run(self, fn, *args):
+        self._throttle()
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                fn(*args)
+            key = "done"
+        except Exception:
+            logger.exception("Warm-up task %s%r failed", fn.__name__, args)
+            key = "failed"
+        with self._lock:
+            self.status[key] += 1
+
+    def submit(self, fn, *args):
+        """Queue a prefetch task"""
+        with self._lock:
+            self.status["total"] += 1
+        return self.executor.submit(self._run, fn, *args)
+
+    def start(self):
+        """Queue the boot warm-up tasks and return immediately"""
+        self.submit(get_all_pokemon_names)
+        for gen_params in GENERATIONS.values():
+            self.submit(get_pokemon_list, gen_params['limit'], gen_params['offset'])
+        self.submit(get_type_chart)
+        self.submit(build_evolution_index)
+        self.submit(build_dex_table)
+        self.submit(build_move_table)
+        for name in get_popular_pokemon():
+            self.submit(prefetch_pokemon_bundle, name)
+        return self
+
+
+def prefetch_pokemon_bundle(name):
+    """
+    Warm every cache the detail page reads for a Pokemon
+
+    Args:
+        name (str): Pokemon name
+    """
+    data = get_pokemon_data(name)
+    if not data:
+        return
+    species_url = data['species']['url']
+    get_species_data(species_url)
+    get_evolution_chain(species_url)
+
+
+# --- Speculative Prefetch ---
+class SpeculativePrefetcher:
+    """
+    Warms caches for the pages a user is likely to open next
+
+    Each session has a generation counter: a new page bumps it and
+    cancels whatever the previous page queued, so only the current page's
+    neighbours are fetched. Sessions spend from a budget that refills
+    every PREFETCH_BUDGET_WINDOW, and Pokemon warmed recently by any
+    session are skipped.
+    """
+
+    def __init__(self, workers=PREFETCH_WORKERS, session_budget=PREFETCH_SESSION_BUDGET,
+                 budget_window=PREFETCH_BUDGET_WINDOW):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self.session_budget = session_budget
+        self.budget_window = budget_window
+        self.status = {"queued": 0, "done": 0, "failed": 0, "cancelled": 0, "over_budget": 0}
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # session_id -> state, least recent first
+        self._warmed = OrderedDict()  # name -> time queued, oldest first
+
+    def _session_state(self, session_id, now):
+        """Get a session's state, refreshing its budget window (caller holds the lock)"""
+        state = self._sessions.pop(session_id, None)
+        if state is None:
+            state = {"generation": 0, "pending": [], "spent": 0, "window_start": now}
+        elif now - state["window_start"] >= self.budget_window:
+            state["spent"] = 0
+            state["window_start"] = now
+        self._sessions[session_id] = state
+        while len(self._sessions) > PREFETCH_MAX_SESSIONS:
+            self._sessions.popitem(last=False)
+        return state
+
+    def _recently_warmed(self, name, now):
+        """Whether a Pokemon's caches are still fresh (caller holds the lock)"""
+        while self._warmed and now - next(iter(self._warmed.values())) > API_CACHE_TTL:
+            self._warmed.popitem(last=False)
+        return name in self._warmed
+
+    def prefetch(self, session_id, names, limit=PREFETCH_MAX_PER_PAGE):
+        """
+        Replace a session's pending prefetches with a new page's neighbours
+
+        Args:
+            session_id (str): Session the page belongs to
+            names (iterable): Pokemon names, most likely next click first
+            limit (int): Most Pokemon to queue for this page
+
+        Returns:
+            int: Number of Pokemon queued
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._session_state(session_id, now)
+
+            # Cancel whatever the previous page queued and hasn't started,
+            # refunding it to the budget
+            for name, future in state["pending"]:
+                if future.cancel():
+                    self._warmed.pop(name, None)
+                    state["spent"] -= 1
+                    self.status["cancelled"] += 1
+            state["generation"] += 1
+            generation = state["generation"]
+
+            pending = []
+            for name in dict.fromkeys(names):
+                if len(pending) >= limit:
+                    break
+                if not name or self._recently_warmed(name, now):
+                    continue
+                if state["spent"] >= self.session_budget:
+                    self.status["over_budget"] += 1
+                    break
+                state["spent"] += 1
+                self._warmed[name] = now
+                future = self.executor.submit(self._run, session_id, generation, name)
+                pending.append((name, future))
+            state["pending"] = pending
+            self.status["queued"] += len(pending)
+        return len(pending)
+
+    def _run(self, session_id, generation, name):
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None or state["generation"] != generation:
+                # The session moved on before this task started
+                self._warmed.pop(name, None)
+                self.status["cancelled"] += 1
+                return
+        try:
+            with request_priority(PRIORITY_PREFETCH):
+                prefetch_pokemon_bundle(name)
+            key = "done"
+        except Exception:
+            logger.debug("Prefetch of %s failed", name, exc_info=True)
+            key = "failed"
+        with self._lock:
+            if key == "failed":
+                self._warmed.pop(name, None)
+            self.status[key] += 1
+
+
+@st.cache_resource(show_spinner=False)
+def get_prefetcher():
+    """
+    Get the process-wide speculative prefetcher
+
+    Returns:
+        SpeculativePrefetcher: Shared by all sessions
+    """
+    return SpeculativePrefetcher()
+
+
+def prefetch_detail_neighbours(session_id, data, species_data, evolution_family, similar=()):
+    """
+    Queue the Pokemon a detail page links to, most likely click first
+
+    The order is the evolution family (next stages first), varieties and
+    forms, the previous and next national dex numbers, then similar
+    Pokemon.
+
+    Args:
+        session_id (str): Session viewing the page
+        data (dict): Pokemon data of the page
+        species_data (dict): Species data of the page (may be None)
+        evolution_family (list): Output of get_evolution_chain
+        similar (iterable): Output of get_similar_pokemon
+
+    Returns:
+        int: Number of Pokemon queued
+    """
+    species_name = data['species']['name']
+    current = next((m for m in evolution_family if m['name'] == species_name), None)
+    current_stage = current['stage'] if current else 0
+    family = sorted(evolution_family, key=lambda m: (m['stage'] <= current_stage, abs(m['stage'] - current_stage)))
+
+    names = [m['name'] for m in family]
+    if species_data:
+        names += [v['pokemon']['name'] for v in species_data.get('varieties', [])]
+
+    # The name list is in national dex order up to the last species
+    species_id = int(data['species']['url'].split('/')[-2])
+    all_names = get_all_pokemon_names()
+    last_species = min(len(all_names), max(p['offset'] + p['limit'] for p in GENERATIONS.values()))
+    for neighbour_id in (species_id + 1, species_id - 1):
+        if 1 <= neighbour_id <= last_species:
+            names.append(all_names[neighbour_id - 1])
+
+    names += [s['name'] for s in similar]
+    names = [n for n in names if n != data['name']]
+    return get_prefetcher().prefetch(session_id, names)
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """
+    Start the background warm-up once per process
+
+    Returns:
+        WarmupScheduler: The running scheduler
+    """
+    return WarmupScheduler().start()
@@ -1,239 +1,446 @@
 import streamlit as st
-from src.api.pokeapi_client import get_all_pokemon_names, get_pokemon_data
-from src.services.ai_service import PokemonChatbot
+from src.api.pokeapi_client import get_all_pokemon_names, get_pokemon_data, PokeAPIError
+from src.services.ai_service import get_chatbot
 from src.config.items import COMPETITIVE_ITEMS
 from src.config.natures import NATURES
-from src.services.stats_service import calculate_all_stats
+from src.services.stats_service import calculate_all_stats, infer_spreads, STAT_NAMES, MAX_IV
+from src.services.learnset_service import get_learnset_index
+from src.services.dex_service import is_dex_ready
+from src.services.tier_service import get_tier_index, SPREAD_LABELS
+from src.services.damage_service import is_threat_scan_ready
+from src.ui.components.threats import render_threat_panel
+from src.services.matchup_service import build_matchup_facts, make_side
+from src.services.sprite_service import sprite_url
+from src.services.chat_store import get_session_id
+
+def _load_card(p_name, key_suffix):
+    """
+    Get the per-card data that only changes with the selected Pokemon
+    
+    Kept in session_state so slider, nature and move changes reuse it
+    without touching PokeAPI or rebuilding the move list.
+    
+    Returns:
+        dict: {'name', 'sprite', 'base_stats', 'types', 'moves'} or None
+    """
+    card_key = f"card_{key_suffix}"
+    card = st.session_state.get(card_key)
+    if card and card['name'] == p_name:
+        return card
+    
+    try:
+        p_data = get_pokemon_data(p_name)
+    except PokeAPIError:
+        st.warning("PokeAPI is busy right now. Please try again in a moment.")
+        return None
+    if not p_data:
+        return None
+    
+    # Showdown GIF if it exists, else static artwork (no client-side fallbacks)
+    sprite = sprite_url(p_data['id'], ("gif", "artwork", "png"), pokemon_data=p_data)
+    
+    learnsets = get_learnset_index()
+    if learnsets.has_pokemon(p_name):
+        all_moves = learnsets.get_moves(p_name)
+    else:
+        all_moves = [m['move']['name'] for m in p_data['moves']]
+    
+    card = {
+        'name': p_name,
+        'sprite': sprite,
+        'base_stats': {s['stat']['name']: s['base_stat'] for s in p_data['stats']},
+        'types': [t['type']['name'].title() for t in p_data['types']],
+        'moves': all_moves,
+    }
+    st.session_state[card_key] = card
+    return card
+
+
+@st.fragment
+def render_battle_card(title, key_suffix, default_index, all_pokemon):
+    """
+    Render one side of the battle as an independently rerunning fragment
+    
+    The resulting set is stored in st.session_state[f"battle_set_{key_suffix}"]
+    for the Analyze button.
+    """
+    st.subheader(title)
+    # Select Pokemon
+    p_name = st.selectbox(
+        "Select Pokemon", 
+        all_pokemon, 
+        index=default_index, 
+        key=f"p_select_{key_suffix}",
+        label_visibility="collapsed"
+    )
+    
+    card = _load_card(p_name, key_suffix)
+    
+    if card:
+        # 1. Fixed Height Image Container (200px)
+        st.markdown(f"""
+        <div style="height: 220px; display: flex; align-items: center; justify-content: center; border-radius: 10px; margin-bottom: 10px;">
+            <img src="{card['sprite']}" style="max-height: 200px; max-width: 100%; object-fit: contain;">
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # 2. Stats & Info
+        base_stats = card['base_stats']
+        
+        # Type Badges
+        st.markdown(f"**Types:** {', '.join(card['types'])}")
+        
+        # --- Advanced Stats (Nature & EVs) ---
+        with st.expander("📊 Stats, Nature & EVs", expanded=False):
+            nature_name = st.selectbox("Nature", list(NATURES.keys()), index=list(NATURES.keys()).index("Hardy"), key=f"nature_{key_suffix}")
+            
+            # Dynamic EV Sliders (Prevent > 510 Total)
+            # Map full stat names to session state keys
+            stat_map = {
+                'hp': 'hp', 'attack': 'atk', 'defense': 'def',
+                'special-attack': 'spa', 'special-defense': 'spd', 'speed': 'spe'
+            }
+            
+            # 1. Get current values from session state to calculate budget
+            current_evs = {}
+            for stat, short_key in stat_map.items():
+                key = f"ev_{short_key}_{key_suffix}"
+                current_evs[stat] = st.session_state.get(key, 0)
+            
+            total_used = sum(current_evs.values())
+            remaining_global = 510 - total_used
+            
+            st.caption(f"Total EVs: {total_used}/510")
+            
+            cols = st.columns(3)
+            
+            # Helper to render slider with dynamic max
+            def render_ev_slider(col_idx, label, stat_name):
+                short_key = stat_map[stat_name]
+                key = f"ev_{short_key}_{key_suffix}"
+                current_val = current_evs[stat_name]
+                
+                # Max allowed is current value + whatever is left globally
+                # But never more than 252
+                dynamic_max = min(252, current_val + remaining_global)
+                
+                # Ensure current value doesn't exceed new max (sanity check)
+                safe_val = min(current_val, dynamic_max)
+                
+                if dynamic_max == 0:
+                    # Avoid Streamlit error: min_value must be < max_value
+                    # If budget is full, lock this slider at 0
+                    return cols[col_idx].slider(label, 0, 252, 0, key=key, disabled=True)
+                else:
+                    return cols[col_idx].slider(label, 0, dynamic_max, safe_val, key=key)
+
+            evs = {}
+            evs['hp'] = render_ev_slider(0, "HP", 'hp')
+            evs['attack'] = render_ev_slider(1, "Atk", 'attack')
+            evs['defense'] = render_ev_slider(2, "Def", 'defense')
+            evs['special-attack'] = render_ev_slider(0, "SpA", 'special-attack')
+            evs['special-defense'] = render_ev_slider(1, "SpD", 'special-defense')
+            evs['speed'] = render_ev_slider(2, "Spd", 'speed')
+        
+        # Calculate Real Stats (Level 50)
+        real_stats = calculate_all_stats(base_stats, evs, NATURES[nature_name])
+        
+        # Stats Grid (Show Real Stats)
+        st.markdown("##### Real Stats (Lv. 50)")
+        s_col1, s_col2 = st.columns(2)
+        with s_col1:
+            st.write(f"❤️ **HP:** {real_stats['hp']} (Base: {base_stats['hp']})")
+            st.write(f"⚔️ **Atk:** {real_stats['attack']} (Base: {base_stats['attack']})")
+            st.write(f"🛡️ **Def:** {real_stats['defense']} (Base: {base_stats['defense']})")
+        with s_col2:
+            st.write(f"✨ **SpA:** {real_stats['special-attack']} (Base: {base_stats['special-attack']})")
+            st.write(f"🔰 **SpD:** {real_stats['special-defense']} (Base: {base_stats['special-defense']})")
+            st.write(f"💨 **Spd:** {real_stats['speed']} (Base: {base_stats['speed']})")
+        
+        render_scouting(base_stats, key_suffix, stat_map)
+        
+        if is_dex_ready():
+            render_speed_tiers(real_stats['speed'])
+        if is_threat_scan_ready():
+            render_threat_panel(p_name, [t.lower() for t in card['types']], real_stats)
+
+        # 3. Moves & Items
+        st.markdown("---")
+        selected_moves = st.multiselect(
+            "Select Moves (Max 4)", 
+            card['moves'], 
+            max_selections=4,
+            key=f"moves_{key_suffix}"
+        )
+        
+        selected_item = st.selectbox(
+            "Held Item",
+            COMPETITIVE_ITEMS,
+            key=f"item_{key_suffix}"
+        )
+        
+    else:
+        selected_moves = []
+        selected_item = "None"
+        real_stats = {}
+        nature_name = "Hardy"
+        evs = {}
+    
+    st.session_state[f"battle_set_{key_suffix}"] = {
+        'name': p_name if card else None,
+        'moves': selected_moves,
+        'item': selected_item,
+        'stats': real_stats,
+        'nature': nature_name,
+        'evs': evs,
+    }
+
+
+STAT_LABELS = {'hp': "HP", 'attack': "Atk", 'defense': "Def",
+               'special-attack': "SpA", 'special-defense': "SpD", 'speed': "Spe"}
+
+
+def _apply_spread(key_suffix, stat_map, nature_name, evs):
+    """Copy a scouted set into the card's nature and EV widgets (runs before the rerun)"""
+    st.session_state[f"nature_{key_suffix}"] = nature_name
+    for stat, ev in evs.items():
+        st.session_state[f"ev_{stat_map[stat]}_{key_suffix}"] = ev
+
+
+def render_scouting(base_stats, key_suffix, stat_map):
+    """Reverse-calculate nature, EV and IV spreads from stats seen in battle"""
+    with st.expander("🔍 Scout a Set", expanded=False):
+        st.caption("Enter the real stats you've seen (leave 0 when unknown) to list every nature, "
+                   "EV and IV combination that produces them.")
+        level = st.number_input("Level", 1, 100, 50, key=f"scout_level_{key_suffix}")
+        cols = st.columns(3)
+        observed = {}
+        for i, stat in enumerate(STAT_NAMES):
+            value = cols[i % 3].number_input(STAT_LABELS[stat], 0, 999, 0, key=f"scout_{stat_map[stat]}_{key_suffix}")
+            if value:
+                observed[stat] = value
+        perfect_ivs = st.checkbox("Assume 31 IVs", value=True, key=f"scout_ivs_{key_suffix}")
+        if not observed:
+            return
+
+        results = infer_spreads(base_stats, observed, level=level,
+                                iv_range=(MAX_IV, MAX_IV) if perfect_ivs else (0, MAX_IV))
+        if not results:
+            st.warning("No nature, EV and IV combination produces these stats.")
+            return
+
+        def nature_label(r):
+            if r['plus'] is None:
+                return "Neutral"
+            return f"{'/'.join(r['natures'])} (+{STAT_LABELS[r['plus']]} -{STAT_LABELS[r['minus']]})"
+
+        def stat_range(bounds):
+            return str(bounds[0]) if bounds[0] == bounds[1] else f"{bounds[0]}–{bounds[1]}"
+
+        st.dataframe(
+            [
+                {
+                    'Nature': nature_label(r),
+                    'Likely EVs': " / ".join(f"{ev} {STAT_LABELS[stat]}" for stat, ev in r['likely'].items() if ev)
+                                  if r['likely'] else "—",
+                    **{f"{STAT_LABELS[stat]} EVs": stat_range(r['stats'][stat]['ev']) for stat in STAT_NAMES},
+                    **({} if perfect_ivs else
+                       {f"{STAT_LABELS[stat]} IVs": stat_range(r['stats'][stat]['iv']) for stat in STAT_NAMES}),
+                    'Spreads': f"{r['spreads']:,}" if r['spreads'] < 1e6 else f"{r['spreads']:.1e}",
+                }
+                for r in results
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        best = next((r for r in results if r['likely']), None)
+        if best and level == 50:
+            st.button(
+                f"Use {best['natures'][0]} with the likely EVs", key=f"scout_apply_{key_suffix}",
+                on_click=_apply_spread, args=(key_suffix, stat_map, best['natures'][0], best['likely']),
+            )
+
+
+def render_speed_tiers(speed):
+    """Show where a Lv. 50 speed stat sits against the whole dex"""
+    tier_index = get_tier_index()
+    with st.expander("⚡ Speed Tiers (Lv. 50)", expanded=False):
+        for spread in ("max_neutral", "max_plus", "scarf"):
+            result = tier_index.compare(speed, spread=spread)
+            st.write(f"vs **{SPREAD_LABELS[spread]}**: outspeeds {result['percentile']:.0f}% "
+                     f"({result['below']}), ties {result['ties']}, slower than {result['above']}")
+        
+        t_col1, t_col2 = st.columns(2)
+        with t_col1:
+            st.caption("Fastest it outspeeds (Max EVs, Neutral)")
+            for value, name in tier_index.outspeeds(speed, limit=5):
+                st.write(f"{name.title()} ({value})")
+        with t_col2:
+            st.caption("Slowest that outspeed it (Max EVs, Neutral)")
+            for value, name in tier_index.outsped_by(speed, limit=5):
+                st.write(f"{name.title()} ({value})")
+
+
+def render_matchup_facts(facts):
+    """Render the locally computed speed, type and damage sections of a matchup"""
+    p1, p2 = facts['p1'], facts['p2']
+    speed = facts['speed']
+    
+    st.markdown("### ⚡ Speed & Turn Order")
+    if speed['first']:
+        owner = "yours" if speed['first'] == 'p1' else "opponent's"
+        st.write(f"**{facts[speed['first']]['name'].title()}** ({owner}) moves first ({speed['p1']} vs {speed['p2']}).")
+    else:
+        st.write(f"Speed tie at {speed['p1']}: turn order is random.")
+    for side in (p1, p2):
+        if side['item'] == "Choice Scarf":
+            st.caption(f"{side['name'].title()}'s Choice Scarf is included.")
+    
+    st.markdown("### 🛡️ Type Interaction")
+    for attacker, defender, key in ((p1, p2, 'p1_to_p2'), (p2, p1, 'p2_to_p1')):
+        hits = ", ".join(f"{t.title()} ×{m:g}" for t, m in facts['types'][key].items())
+        st.write(f"**{attacker['name'].title()}** STAB vs {defender['name'].title()}: {hits}")
+    
+    st.markdown("### ⚔️ Damage Potential")
+    for attacker, defender, key in ((p1, p2, 'p1_to_p2'), (p2, p1, 'p2_to_p1')):
+        table = facts['damage'][key]
+        st.write(f"**{attacker['name'].title()} → {defender['name'].title()}**")
+        if table['assumed'] and table['moves']:
+            st.caption("No moves selected: using the best STAB moves it learns.")
+        if not table['moves']:
+            st.caption("No damaging moves to calculate.")
+            continue
+        st.dataframe(
+            [
+                {
+                    'Move': r['move'].replace('-', ' ').title(),
+                    'Type': f"{r['type'].title()} ×{r['multiplier']:g}",
+                    'Damage': f"{r['min_percent']:.1f}–{r['max_percent']:.1f}%",
+                    'KO': (f"{r['hits_to_ko'][0]}HKO" if r['hits_to_ko'][0] == r['hits_to_ko'][1]
+                           else f"{r['hits_to_ko'][0]}–{r['hits_to_ko'][1]}HKO") if r['hits_to_ko'][0] else "—",
+                }
+                for r in table['moves']
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
 
 def show_battle_view():
     st.title("⚔️ AI Battle Analyzer")
     st.markdown("Select two Pokemon to analyze their matchup using AI.")
 
-    # Initialize AI Service
-    if 'chatbot' not in st.session_state:
-        st.session_state.chatbot = PokemonChatbot()
-
-    # Fetch all Pokemon names for autocomplete
-    all_pokemon = get_all_pokemon_names()
-
     # Fetch all Pokemon names for autocomplete
     all_pokemon = get_all_pokemon_names()
 
     col1, col2 = st.columns(2)
 
-    def render_battle_card(col, title, key_suffix, default_index):
-        with col:
-            st.subheader(title)
-            # Select Pokemon
-            p_name = st.selectbox(
-                "Select Pokemon", 
-                all_pokemon, 
-                index=default_index, 
-                key=f"p_select_{key_suffix}",
-                label_visibility="collapsed"
-            )
-            
-            p_data = get_pokemon_data(p_name)
-            
-            if p_data:
-                # 1. Fixed Height Image Container (200px)
-                # Try Showdown GIF first, fallback to static
-                sprite = p_data['sprites']['other']['showdown']['front_default']
-                if not sprite:
-                    sprite = p_data['sprites']['other']['official-artwork']['front_default']
-                
-                st.markdown(f"""
-                <div style="height: 220px; display: flex; align-items: center; justify-content: center; border-radius: 10px; margin-bottom: 10px;">
-                    <img src="{sprite}" style="max-height: 200px; max-width: 100%; object-fit: contain;">
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # 2. Stats & Info
-                # 2. Stats & Info
-                base_stats = {s['stat']['name']: s['base_stat'] for s in p_data['stats']}
-                types = [t['type']['name'].title() for t in p_data['types']]
-                
-                # Type Badges
-                st.markdown(f"**Types:** {', '.join(types)}")
-                
-                # --- Advanced Stats (Nature & EVs) ---
-                with st.expander("📊 Stats, Nature & EVs", expanded=False):
-                    nature_name = st.selectbox("Nature", list(NATURES.keys()), index=list(NATURES.keys()).index("Hardy"), key=f"nature_{key_suffix}")
-                    
-                    # Dynamic EV Sliders (Prevent > 510 Total)
-                    # Map full stat names to session state keys
-                    stat_map = {
-                        'hp': 'hp', 'attack': 'atk', 'defense': 'def',
-                        'special-attack': 'spa', 'special-defense': 'spd', 'speed': 'spe'
-                    }
-                    
-                    # 1. Get current values from session state to calculate budget
-                    current_evs = {}
-                    for stat, short_key in stat_map.items():
-                        key = f"ev_{short_key}_{key_suffix}"
-                        current_evs[stat] = st.session_state.get(key, 0)
-                    
-                    total_used = sum(current_evs.values())
-                    remaining_global = 510 - total_used
-                    
-                    st.caption(f"Total EVs: {total_used}/510")
-                    
-                    cols = st.columns(3)
-                    
-                    # Helper to render slider with dynamic max
-                    def render_ev_slider(col_idx, label, stat_name):
-                        short_key = stat_map[stat_name]
-                        key = f"ev_{short_key}_{key_suffix}"
-                        current_val = current_evs[stat_name]
-                        
-                        # Max allowed is current value + whatever is left globally
-                        # But never more than 252
-                        dynamic_max = min(252, current_val + remaining_global)
-                        
-                        # Ensure current value doesn't exceed new max (sanity check)
-                        safe_val = min(current_val, dynamic_max)
-                        
-                        if dynamic_max == 0:
-                            # Avoid Streamlit error: min_value must be < max_value
-                            # If budget is full, lock this slider at 0
-                            return cols[col_idx].slider(label, 0, 252, 0, key=key, disabled=True)
-                        else:
-                            return cols[col_idx].slider(label, 0, dynamic_max, safe_val, key=key)
-
-                    evs = {}
-                    evs['hp'] = render_ev_slider(0, "HP", 'hp')
-                    evs['attack'] = render_ev_slider(1, "Atk", 'attack')
-                    evs['defense'] = render_ev_slider(2, "Def", 'defense')
-                    evs['special-attack'] = render_ev_slider(0, "SpA", 'special-attack')
-                    evs['special-defense'] = render_ev_slider(1, "SpD", 'special-defense')
-                    evs['speed'] = render_ev_slider(2, "Spd", 'speed')
-                
-                # Calculate Real Stats (Level 50)
-                real_stats = calculate_all_stats(base_stats, evs, NATURES[nature_name])
-                
-                # Stats Grid (Show Real Stats)
-                st.markdown("##### Real Stats (Lv. 50)")
-                s_col1, s_col2 = st.columns(2)
-                with s_col1:
-                    st.write(f"❤️ **HP:** {real_stats['hp']} (Base: {base_stats['hp']})")
-                    st.write(f"⚔️ **Atk:** {real_stats['attack']} (Base: {base_stats['attack']})")
-                    st.write(f"🛡️ **Def:** {real_stats['defense']} (Base: {base_stats['defense']})")
-                with s_col2:
-                    st.write(f"✨ **SpA:** {real_stats['special-attack']} (Base: {base_stats['special-attack']})")
-                    st.write(f"🔰 **SpD:** {real_stats['special-defense']} (Base: {base_stats['special-defense']})")
-                    st.write(f"💨 **Spd:** {real_stats['speed']} (Base: {base_stats['speed']})")
-
-                # 3. Moves & Items
-
-                # 3. Moves & Items
-                st.markdown("---")
-                all_moves = [m['move']['name'] for m in p_data['moves']]
-                selected_moves = st.multiselect(
-                    "Select Moves (Max 4)", 
-                    all_moves, 
-                    max_selections=4,
-                    key=f"moves_{key_suffix}"
-                )
-                
-                selected_item = st.selectbox(
-                    "Held Item",
-                    COMPETITIVE_ITEMS,
-                    key=f"item_{key_suffix}"
-                )
-                
-            else:
-                selected_moves = []
-                selected_item = "None"
-                real_stats = {}
-                nature_name = "Hardy"
-                evs = {}
-                
-            return p_name, p_data, selected_moves, selected_item, real_stats, nature_name, evs
-
-    # Render both cards
-    p1_name, p1_data, p1_moves, p1_item, p1_stats, p1_nature, p1_evs = render_battle_card(col1, "My Pokemon", "1", all_pokemon.index("charizard") if "charizard" in all_pokemon else 0)
-    p2_name, p2_data, p2_moves, p2_item, p2_stats, p2_nature, p2_evs = render_battle_card(col2, "Opponent", "2", all_pokemon.index("blastoise") if "blastoise" in all_pokemon else 1)
+    # Render both cards (each reruns on its own when its widgets change)
+    with col1:
+        render_battle_card("My Pokemon", "1", all_pokemon.index("charizard") if "charizard" in all_pokemon else 0, all_pokemon)
+    with col2:
+        render_battle_card("Opponent", "2", all_pokemon.index("blastoise") if "blastoise" in all_pokemon else 1, all_pokemon)
 
     st.markdown("---")
 
     if st.button("🚀 Analyze Matchup", type="primary", use_container_width=True):
-        if p1_data and p2_data:
-            with st.spinner("🤖 AI is analyzing the battle..."):
-                analysis, win_probability = st.session_state.chatbot.analyze_matchup(
-                    p1_name, p1_data, p1_moves, p1_item, p1_stats, p1_nature,
-                    p2_name, p2_data, p2_moves, p2_item, p2_stats, p2_nature
-                )
-                
-                # Visual Storytelling Section
-                st.markdown("### 📊 Battle Analysis")
-                
-                # 1. Radar Chart (Stats Comparison)
-                import plotly.graph_objects as go
-                
-                categories = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
-                p1_values = [p1_stats['hp'], p1_stats['attack'], p1_stats['defense'], 
-                             p1_stats['special-attack'], p1_stats['special-defense'], p1_stats['speed']]
-                p2_values = [p2_stats['hp'], p2_stats['attack'], p2_stats['defense'],
-                             p2_stats['special-attack'], p2_stats['special-defense'], p2_stats['speed']]
-                
-                radar_fig = go.Figure()
-                
-                radar_fig.add_trace(go.Scatterpolar(
-                    r=p1_values,
-                    theta=categories,
-                    fill='toself',
-                    name=p1_name.title(),
-                    line_color='#FF6B6B'
-                ))
-                
-                radar_fig.add_trace(go.Scatterpolar(
-                    r=p2_values,
-                    theta=categories,
-                    fill='toself',
-                    name=p2_name.title(),
-                    line_color='#4ECDC4'
-                ))
-                
-                radar_fig.update_layout(
-                    polar=dict(radialaxis=dict(visible=True, range=[0, max(max(p1_values), max(p2_values)) + 20])),
-                    showlegend=True,
-                    title="Stats Comparison (Lv. 50)",
-                    height=400
-                )
-                
-                # 2. Win Rate Gauge
-                gauge_fig = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=win_probability,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': f"{p1_name.title()}'s Win Probability"},
-                    gauge={
-                        'axis': {'range': [None, 100]},
-                        'bar': {'color': "darkblue"},
-                        'steps': [
-                            {'range': [0, 40], 'color': "#FFB6B6"},
-                            {'range': [40, 60], 'color': "#FFF4B0"},
-                            {'range': [60, 100], 'color': "#B6FFB6"}
-                        ],
-                        'threshold': {
-                            'line': {'color': "red", 'width': 4},
-                            'thickness': 0.75,
-                            'value': 50
-                        }
+        p1_set = st.session_state.get("battle_set_1", {})
+        p2_set = st.session_state.get("battle_set_2", {})
+        if p1_set.get('name') and p2_set.get('name'):
+            p1_name, p1_moves, p1_item, p1_stats, p1_nature = (p1_set[k] for k in ('name', 'moves', 'item', 'stats', 'nature'))
+            p2_name, p2_moves, p2_item, p2_stats, p2_nature = (p2_set[k] for k in ('name', 'moves', 'item', 'stats', 'nature'))
+            try:
+                p1_data = get_pokemon_data(p1_name)
+                p2_data = get_pokemon_data(p2_name)
+                # Stage 1: exact facts, shown straight away
+                facts = build_matchup_facts(
+                    make_side(p1_name, p1_data, p1_moves, p1_item, p1_stats, p1_nature),
+                    make_side(p2_name, p2_data, p2_moves, p2_item, p2_stats, p2_nature),
+                ) if p1_data and p2_data else None
+            except PokeAPIError:
+                st.warning("PokeAPI is busy right now. Please try again in a moment.")
+                return
+            if facts is None:
+                st.error("Could not load one of the Pokemon. Please pick again.")
+                return
+            
+            # Visual Storytelling Section
+            st.markdown("### 📊 Battle Analysis")
+            
+            # 1. Radar Chart (Stats Comparison)
+            import plotly.graph_objects as go
+            
+            categories = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+            p1_values = [p1_stats['hp'], p1_stats['attack'], p1_stats['defense'], 
+                         p1_stats['special-attack'], p1_stats['special-defense'], p1_stats['speed']]
+            p2_values = [p2_stats['hp'], p2_stats['attack'], p2_stats['defense'],
+                         p2_stats['special-attack'], p2_stats['special-defense'], p2_stats['speed']]
+            
+            radar_fig = go.Figure()
+            
+            radar_fig.add_trace(go.Scatterpolar(
+                r=p1_values,
+                theta=categories,
+                fill='toself',
+                name=p1_name.title(),
+                line_color='#FF6B6B'
+            ))
+            
+            radar_fig.add_trace(go.Scatterpolar(
+                r=p2_values,
+                theta=categories,
+                fill='toself',
+                name=p2_name.title(),
+                line_color='#4ECDC4'
+            ))
+            
+            radar_fig.update_layout(
+                polar=dict(radialaxis=dict(visible=True, range=[0, max(max(p1_values), max(p2_values)) + 20])),
+                showlegend=True,
+                title="Stats Comparison (Lv. 50)",
+                height=400
+            )
+            
+            # Display the radar now; the gauge fills in once the verdict is back
+            chart_col1, chart_col2 = st.columns(2)
+            with chart_col1:
+                st.plotly_chart(radar_fig, use_container_width=True)
+            
+            render_matchup_facts(facts)
+            
+            # Stage 2: strategy and verdict from the compact fact sheet
+            with st.spinner("🤖 AI is writing the strategy..."):
+                analysis, win_probability = get_chatbot().analyze_matchup(facts, session_id=get_session_id())
+            
+            # 2. Win Rate Gauge
+            gauge_fig = go.Figure(go.Indicator(
+                mode="gauge+number",
+                value=win_probability,
+                domain={'x': [0, 1], 'y': [0, 1]},
+                title={'text': f"{p1_name.title()}'s Win Probability"},
+                gauge={
+                    'axis': {'range': [None, 100]},
+                    'bar': {'color': "darkblue"},
+                    'steps': [
+                        {'range': [0, 40], 'color': "#FFB6B6"},
+                        {'range': [40, 60], 'color': "#FFF4B0"},
+                        {'range': [60, 100], 'color': "#B6FFB6"}
+                    ],
+                    'threshold': {
+                        'line': {'color': "red", 'width': 4},
+                        'thickness': 0.75,
+                        'value': 50
                     }
-                ))
-                
-                gauge_fig.update_layout(height=300)
-                
-                # Display Charts
-                chart_col1, chart_col2 = st.columns(2)
-                with chart_col1:
-                    st.plotly_chart(radar_fig, use_container_width=True)
-                with chart_col2:
-                    st.plotly_chart(gauge_fig, use_container_width=True)
-                
-                # 3. AI Analysis Text
-                st.markdown("---")
-                st.markdown(analysis)
+                }
+            ))
+            
+            gauge_fig.update_layout(height=300)
+            with chart_col2:
+                st.plotly_chart(gauge_fig, use_container_width=True)
+            
+            # 3. AI Analysis Text
+            st.markdown("---")
+            st.markdown(analysis)
         else:
             st.error("Please select both Pokemon to analyze.")
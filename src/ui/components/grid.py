@@ -0,0 +1,64 @@
+"""
+UI Components - Pokemon Grid
+Single-component, virtualized Pokemon grid rendered client-side
+"""
+import os
+import streamlit.components.v1 as components
+
+from src.services.sprite_service import (
+    best_variant,
+    get_sprite_manifest,
+    SPRITE_BASE_URL,
+    SPRITE_PATHS,
+    GRID_VARIANTS,
+)
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "pokemon_grid")
+_pokemon_grid = components.declare_component("pokemon_grid", path=_FRONTEND_DIR)
+
+
+def entries_from_list(pokemon_list):
+    """
+    Convert a PokeAPI list ({'name', 'url'}) to compact grid entries
+
+    Returns:
+        list: [[id, name], ...]
+    """
+    return [[int(p['url'].split('/')[-2]), p['name']] for p in pokemon_list]
+
+
+def pokemon_grid(entries, data_key, key, prefetch_ids=(), columns=5, height=640, row_height=160):
+    """
+    Render a Pokemon grid as one component
+
+    The whole list is sent once as compact [id, name, sprite variant]
+    triples; the browser only builds DOM nodes for the rows in view.
+    Each tile requests the one sprite the manifest says exists (the
+    showdown GIF, else the PNG). Clicks come back through the component
+    value.
+
+    Args:
+        entries (list): [[id, name], ...]
+        data_key (str): Identifies the dataset; scroll resets when it changes
+        key (str): Streamlit widget key
+        prefetch_ids (iterable): Ids whose sprites the browser should preload
+        columns (int): Tiles per row
+        height (int): Viewport height in pixels
+        row_height (int): Row height in pixels
+
+    Returns:
+        dict: {'name': str, 'nonce': int} for the last click, or None
+    """
+    manifest = get_sprite_manifest()
+    return _pokemon_grid(
+        entries=[[pid, name, best_variant(pid, GRID_VARIANTS, manifest)] for pid, name in entries],
+        data_key=data_key,
+        prefetch=[[pid, best_variant(pid, GRID_VARIANTS, manifest)] for pid in prefetch_ids],
+        columns=columns,
+        height=height,
+        row_height=row_height,
+        sprite_base=SPRITE_BASE_URL,
+        sprite_paths={variant: SPRITE_PATHS[variant] for variant in GRID_VARIANTS},
+        key=key,
+        default=None,
+    )
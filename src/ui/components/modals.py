@@ -3,6 +3,7 @@ UI Components - Modals
 Reusable modal components
 """
 import streamlit as st
+from src.api.pokeapi_client import PokeAPIError
 from src.services.type_service import get_type_effectiveness, get_type_icon_url
 
 
@@ -14,7 +15,11 @@ def show_effectiveness_modal(types):
     Args:
         types (list): List of Pokemon types
     """
-    effectiveness = get_type_effectiveness(types)
+    try:
+        effectiveness = get_type_effectiveness(types)
+    except PokeAPIError:
+        st.warning("PokeAPI is busy right now. Please try again in a moment.")
+        return
     
     weaknesses = []
     resistances = []
@@ -0,0 +1,47 @@
+"""
+UI Components - Threat Panel
+Dex-wide "biggest threats" and "best targets" rankings
+"""
+import streamlit as st
+from src.api.pokeapi_client import PokeAPIError
+from src.services.damage_service import get_threat_index
+from src.services.tier_service import SPREAD_LABELS
+
+
+def _rows(results):
+    return [
+        {
+            'Pokemon': r['name'].replace('-', ' ').title(),
+            'Best STAB': f"{r['move_type'].title()} ({r['damage_class'].title()})",
+            'Damage': f"{r['min_percent']:.0f}–{r['max_percent']:.0f}%",
+        }
+        for r in results
+    ]
+
+
+def render_threat_panel(name, types, stats, level=50, limit=10):
+    """
+    Show which Pokemon hit a set hardest and which it hits hardest
+
+    Args:
+        name (str): Pokemon name
+        types (list): Lowercase type names
+        stats (dict): Real stats of the set (calculate_all_stats)
+        level (int): Level of everyone involved
+        limit (int): Rows per ranking
+    """
+    try:
+        index = get_threat_index()
+    except PokeAPIError:
+        st.caption("Threat rankings are unavailable while PokeAPI is busy.")
+        return
+    with st.expander(f"☠️ Biggest Threats (Lv. {level})", expanded=False):
+        st.caption(f"Best STAB move each Pokemon learns, attackers with {SPREAD_LABELS['max_plus']}. "
+                   "Abilities, items and weather are not counted.")
+        st.dataframe(_rows(index.threats_to(types, stats, level=level, limit=limit, exclude=[name])),
+                     use_container_width=True, hide_index=True)
+
+        targets = index.targets_of(name, stats, level=level, limit=limit)
+        if targets:
+            st.caption(f"Hardest hit by its own best STAB move, targets with {SPREAD_LABELS['max_neutral']}.")
+            st.dataframe(_rows(targets), use_container_width=True, hide_index=True)
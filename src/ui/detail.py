@@ -3,8 +3,8 @@ Detail View
 Pokemon detail page with stats, description, varieties, and evolution chain
 """
 import streamlit as st
-from src.config.constants import STAT_CONFIG
-from src.api.pokeapi_client import get_pokemon_data, get_species_data
+from src.config.constants import STAT_CONFIG, CHAT_RENDER_WINDOW
+from src.api.pokeapi_client import get_pokemon_data, get_species_data, PokeAPIError
 from src.services.pokemon_service import (
     get_pokemon_description, 
     get_pokemon_varieties, 
@@ -15,6 +15,17 @@ from src.services.pokemon_service import (
     get_base_happiness
 )
 from src.services.type_service import get_type_icon_url
+from src.services.warmup_service import record_access, prefetch_detail_neighbours
+from src.services.chat_store import get_chat_store, get_session_id
+from src.services.ai_service import get_chatbot
+from src.services.tier_service import get_tier_index
+from src.services.dex_service import get_dex_table, is_dex_ready
+from src.services.similarity_service import get_similar_pokemon
+from src.services.sprite_service import sprite_url
+from src.services.damage_service import is_threat_scan_ready
+from src.services.stats_service import calculate_all_stats
+from src.config.natures import NATURES
+from src.ui.components.threats import render_threat_panel
 from src.ui.components.modals import show_effectiveness_modal
 
 
@@ -37,9 +48,19 @@ def show_detail_view():
         st.rerun()
         
     name = st.session_state.selected_pokemon
-    data = get_pokemon_data(name)
+    try:
+        data = get_pokemon_data(name)
+    except PokeAPIError:
+        st.warning("PokeAPI is busy right now. Please try again in a moment.")
+        return
     
     if data:
+        # Count each page view once (not every rerun) for warm-up popularity
+        new_view = st.session_state.get('last_viewed') != data['name']
+        if new_view:
+            st.session_state.last_viewed = data['name']
+            record_access(data['name'])
+        
         st.title(f"#{data['id']} {data['name'].title()}")
         
         # Layout: 2 Columns
@@ -50,16 +71,10 @@ def show_detail_view():
             is_shiny = st.toggle("✨ Shiny Version")
             
             # Display Image (Static High Quality)
-            if is_shiny:
-                sprite_url = data['sprites']['other']['official-artwork']['front_shiny']
-                if not sprite_url:
-                    sprite_url = data['sprites']['front_shiny']
-            else:
-                sprite_url = data['sprites']['other']['official-artwork']['front_default']
-                if not sprite_url:
-                    sprite_url = data['sprites']['front_default']
-                
-            st.image(sprite_url, use_container_width=True)
+            variants = ("shiny_artwork", "shiny") if is_shiny else ("artwork", "png")
+            image_url = sprite_url(data['id'], variants, pokemon_data=data)
+            if image_url:
+                st.image(image_url, use_container_width=True)
             
             # Audio (Cries)
             cries = data.get('cries', {})
@@ -114,6 +129,7 @@ def show_detail_view():
 
             # Stats
             st.subheader("Base Stats")
+            tier_index = get_tier_index() if is_dex_ready() else None
             for stat in data['stats']:
                 stat_key = stat['stat']['name']
                 config = STAT_CONFIG.get(stat_key, {"color": "#888888", "name": stat_key})
@@ -123,6 +139,11 @@ def show_detail_view():
                 base_stat = stat['base_stat']
                 percentage = min(base_stat / 255 * 100, 100)
                 
+                # Standing in the whole dex (share of Pokemon with a lower base stat)
+                rank_label = ""
+                if tier_index:
+                    rank_label = f"Top {100 - tier_index.base_percentile(stat_key, base_stat):.0f}%"
+                
                 st.markdown(f"""
                 <div style="display: flex; align-items: center; margin-bottom: 5px;">
                     <div style="width: 80px; font-weight: bold; color: #555;">{stat_name}</div>
@@ -130,11 +151,20 @@ def show_detail_view():
                     <div style="flex-grow: 1; background-color: #f0f0f0; border-radius: 10px; height: 10px;">
                         <div style="width: {percentage}%; background-color: {color}; height: 100%; border-radius: 10px;"></div>
                     </div>
+                    <div style="width: 70px; text-align: right; font-size: 12px; color: #888;">{rank_label}</div>
                 </div>
                 """, unsafe_allow_html=True)
 
+        # Dex-wide threats for a neutral Lv. 50 set (31 IVs, no EVs)
+        if is_threat_scan_ready():
+            base_stats = {s['stat']['name']: s['base_stat'] for s in data['stats']}
+            real_stats = calculate_all_stats(base_stats, {}, NATURES["Hardy"])
+            render_threat_panel(data['name'], [t['type']['name'] for t in data['types']], real_stats)
+        
         # Evolution Chain & Varieties
         st.divider()
+        evo_list = []
+        similar = []
         
         if species_data:
             # --- Varieties (Mega, Gmax, etc.) ---
@@ -148,10 +178,11 @@ def show_detail_view():
                     v_url_name = variety['pokemon']['name']
                     # Get ID for image
                     v_id = variety['pokemon']['url'].split('/')[-2]
-                    v_img = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{v_id}.png"
+                    v_img = sprite_url(v_id)
                     
                     with v_cols[i % 5]:
-                        st.image(v_img, width=80)
+                        if v_img:
+                            st.image(v_img, width=80)
                         if st.button(v_name, key=f"var_{v_id}"):
                             navigate_to_detail(v_url_name)
                             st.rerun()
@@ -162,16 +193,41 @@ def show_detail_view():
             evo_list = get_evolution_chain(species_url)
             
             if evo_list:
-                evo_cols = st.columns(len(evo_list))
-                for i, evo in enumerate(evo_list):
+                # One column per stage so branching families (Eevee, Tyrogue) stay readable
+                stages = {}
+                for evo in evo_list:
+                    stages.setdefault(evo['stage'], []).append(evo)
+                
+                evo_cols = st.columns(len(stages))
+                for i, stage in enumerate(sorted(stages)):
                     with evo_cols[i]:
-                        evo_id = evo['id']
-                        evo_name = evo['name'].title()
-                        evo_img = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{evo_id}.png"
-                        
-                        st.image(evo_img, width=100)
-                        if st.button(evo_name, key=f"evo_{evo_id}"):
-                            navigate_to_detail(evo['name'])
+                        for evo in stages[stage]:
+                            evo_id = evo['id']
+                            evo_name = evo['name'].title()
+                            evo_img = sprite_url(evo_id)
+                            
+                            if evo_img:
+                                st.image(evo_img, width=100)
+                            if st.button(evo_name, key=f"evo_{evo_id}"):
+                                navigate_to_detail(evo['name'])
+                                st.rerun()
+                            if evo['condition']:
+                                st.caption(evo['condition'])
+        
+        # Similar Pokemon (stat, type and ability neighbours across the dex)
+        if is_dex_ready():
+            similar = get_similar_pokemon(data['name'], k=5, dex_revision=get_dex_table().revision)
+            if similar:
+                st.divider()
+                st.subheader("Similar Pokemon")
+                sim_cols = st.columns(len(similar))
+                for i, sim in enumerate(similar):
+                    with sim_cols[i]:
+                        sim_img = sprite_url(sim['id'])
+                        if sim_img:
+                            st.image(sim_img, width=80)
+                        if st.button(sim['name'].replace('-', ' ').title(), key=f"sim_{sim['id']}"):
+                            navigate_to_detail(sim['name'])
                             st.rerun()
         
         # AI Chat Section
@@ -179,20 +235,29 @@ def show_detail_view():
         st.subheader("💬 Chat with AI about " + data['name'].title())
         st.caption("Ask me anything about this Pokemon!")
         
-        # Initialize chat history for this Pokemon
-        chat_key = f"chat_{data['name']}"
-        if chat_key not in st.session_state:
-            st.session_state[chat_key] = []
+        # Chat history lives in the chat store; only the rendered window is loaded
+        chat_store = get_chat_store()
+        session_id = get_session_id()
+        chat_history = chat_store.load_window(session_id, data['name'], CHAT_RENDER_WINDOW)
+        
+        total_messages = chat_store.count(session_id, data['name'])
+        if total_messages > len(chat_history):
+            st.caption(f"Showing the last {len(chat_history)} of {total_messages} messages")
         
         # Display chat history
-        for message in st.session_state[chat_key]:
+        for message in chat_history:
             with st.chat_message(message["role"]):
                 st.write(message["content"])
         
+        # Warm the pages this one links to while the user reads it
+        if new_view:
+            prefetch_detail_neighbours(session_id, data, species_data, evo_list, similar)
+        
         # Chat input
         if user_input := st.chat_input("Ask me anything about this Pokemon..."):
             # Add user message to history
-            st.session_state[chat_key].append({"role": "user", "content": user_input})
+            chat_store.append(session_id, data['name'], "user", user_input)
+            chat_history.append({"role": "user", "content": user_input})
             
             # Display user message
             with st.chat_message("user"):
@@ -201,18 +266,17 @@ def show_detail_view():
             # Get AI response
             with st.chat_message("assistant"):
                 with st.spinner("Thinking..."):
-                    from src.services.ai_service import PokemonChatbot
-                    chatbot = PokemonChatbot()
-                    ai_response = chatbot.chat(
+                    ai_response = get_chatbot().chat(
                         pokemon_name=data['name'],
                         pokemon_data=data,
                         user_message=user_input,
-                        chat_history=st.session_state[chat_key]
+                        chat_history=chat_history,
+                        session_id=session_id
                     )
                     st.write(ai_response)
             
             # Add AI response to history
-            st.session_state[chat_key].append({"role": "assistant", "content": ai_response})
+            chat_store.append(session_id, data['name'], "assistant", ai_response)
             st.rerun()
             
     else:
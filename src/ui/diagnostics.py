@@ -0,0 +1,184 @@
+"""
+Diagnostics View
+Admin page for cache, session and allocation memory
+"""
+import time
+
+import streamlit as st
+
+from src.services.diagnostics_service import (
+    get_cache_stats,
+    get_counter_stats,
+    get_session_stats,
+    get_process_memory,
+    get_snapshot_times,
+    is_tracing,
+    start_tracing,
+    stop_tracing,
+    take_snapshot,
+    top_allocators,
+    snapshot_diff,
+)
+from src.services.llm_usage_service import get_usage_ledger
+
+
+def _format_bytes(n):
+    if n is None:
+        return "—"
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def _usage_row(label, summary):
+    return {
+        '': label,
+        'Calls': summary['calls'],
+        'Errors': summary['outcomes']['error'] + summary['outcomes']['rate_limited'],
+        'Over budget': summary['outcomes']['over_budget'],
+        'Prompt tokens': summary['prompt_tokens'],
+        'Completion tokens': summary['completion_tokens'],
+        'Avg queue (ms)': summary['avg_queue_ms'],
+        'Avg response (ms)': summary['avg_response_ms'],
+        'Max response (ms)': summary['max_response_ms'],
+    }
+
+
+def render_llm_usage():
+    """LLM calls, tokens and latency globally, per feature and per session"""
+    ledger = get_usage_ledger()
+    usage = ledger.stats()
+    st.subheader("🤖 LLM Usage")
+    st.caption(f"Per-session budget: {ledger.token_budget or 'unlimited'} tokens and "
+               f"{ledger.call_budget or 'unlimited'} calls per {ledger.window // 60} minutes.")
+    st.dataframe(
+        [_usage_row("All", usage['global'])]
+        + [_usage_row(f"Feature: {name}", summary) for name, summary in sorted(usage['features'].items())],
+        use_container_width=True,
+        hide_index=True,
+    )
+    if usage['sessions']:
+        with st.expander("Heaviest sessions"):
+            st.dataframe([_usage_row(session_id[:12], summary) for session_id, summary in usage['sessions']],
+                         use_container_width=True, hide_index=True)
+    if usage['recent']:
+        with st.expander("Recent calls"):
+            st.dataframe(
+                [dict(call, time=time.strftime('%H:%M:%S', time.localtime(call['time'])),
+                      session=call['session'][:12]) for call in usage['recent']],
+                use_container_width=True,
+                hide_index=True,
+            )
+
+
+def show_diagnostics_view():
+    """Render the memory diagnostics page"""
+    st.title("🩺 Diagnostics")
+    st.caption("Memory held by this server process. Every number is a point-in-time reading.")
+
+    memory = get_process_memory()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Resident memory", _format_bytes(memory['rss_bytes']))
+    col2.metric("Peak resident memory", _format_bytes(memory['peak_rss_bytes']))
+    col3.metric("Live sessions", memory['sessions'])
+
+    st.subheader("🗄️ Caches")
+    measure = st.checkbox("Measure st.cache_resource objects (walks every cached object, may be slow)")
+    st.dataframe(
+        [
+            {'Cache': row['name'], 'Kind': row['kind'], 'Entries': row['entries'],
+             'Approx. size': _format_bytes(row['bytes'])}
+            for row in get_cache_stats(measure_resources=measure)
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    counters = get_counter_stats()
+    chat = counters['chat_store']
+    st.caption(
+        f"Stale-while-revalidate: {counters['swr']['fresh']} fresh, {counters['swr']['stale']} stale, "
+        f"{counters['swr']['miss']} misses, {counters['swr']['refreshes']} refreshes "
+        f"({counters['swr']['refresh_failures']} failed). "
+        f"Chat store (on disk): {chat['messages']} messages in {chat['sessions']} sessions, "
+        f"{_format_bytes(chat['content_bytes'])} of text, {_format_bytes(chat['file_bytes'])} file."
+    )
+    with st.expander("Rate limiters and circuit breakers"):
+        st.json({'limiters': counters['limiters'], 'breakers': counters['breakers']})
+
+    render_llm_usage()
+
+    st.subheader("👥 Sessions")
+    sessions = get_session_stats()
+    if not sessions:
+        st.info("No live sessions found (session stats need a running Streamlit server).")
+    else:
+        st.caption("Size of each session's session_state. Objects shared between sessions are "
+                   "counted once per session.")
+        st.dataframe(
+            [
+                {
+                    'Session': s['session'][:8],
+                    'Keys': s['keys'],
+                    'Approx. size': _format_bytes(s['bytes']),
+                    'Largest keys': ", ".join(f"{k} ({_format_bytes(b)})" for k, b in s['largest']),
+                }
+                for s in sessions
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    st.subheader("🔬 Allocations")
+    st.caption("tracemalloc records where memory is allocated. Tracing slows the whole process "
+               "down, so turn it off when done.")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if is_tracing():
+            if st.button("Stop tracing"):
+                stop_tracing()
+                st.rerun()
+        elif st.button("Start tracing"):
+            start_tracing()
+            st.rerun()
+    with col2:
+        if st.button("Take baseline snapshot"):
+            take_snapshot('baseline')
+    with col3:
+        if st.button("Take latest snapshot"):
+            take_snapshot('latest')
+
+    taken = get_snapshot_times()
+    if not taken:
+        st.info("Take a snapshot to see the top allocators. Take a baseline, use the app, then "
+                "take a latest snapshot to see what grew in between.")
+        return
+    st.caption(" · ".join(
+        f"{label.title()}: {time.strftime('%H:%M:%S', time.localtime(t))}" for label, t in sorted(taken.items())
+    ))
+
+    label = 'latest' if 'latest' in taken else 'baseline'
+    st.write(f"**Top allocators ({label} snapshot)**")
+    st.dataframe(
+        [
+            {'Location': row['location'], 'Size': _format_bytes(row['bytes']), 'Blocks': row['count']}
+            for row in top_allocators(label)
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    diff = snapshot_diff()
+    if diff:
+        st.write("**Growth since baseline**")
+        st.dataframe(
+            [
+                {'Location': row['location'], 'Size': _format_bytes(row['bytes']),
+                 'Change': ("+" if row['bytes_diff'] >= 0 else "") + _format_bytes(row['bytes_diff']),
+                 'Blocks change': row['count_diff']}
+                for row in diff
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
@@ -3,8 +3,11 @@ Home View
 Pokemon grid and generation filter
 """
 import streamlit as st
-from src.config.constants import GENERATIONS
+from src.config.constants import GENERATIONS, STAT_CONFIG, TYPE_ID_MAP, BROWSE_PAGE_SIZE
 from src.api.pokeapi_client import get_pokemon_list, get_all_pokemon_names
+from src.services.dex_service import is_dex_ready
+from src.services.browse_service import get_browse_index, SORT_KEYS
+from src.ui.components.grid import pokemon_grid, entries_from_list
 
 
 def navigate_to_detail(pokemon_name):
@@ -26,34 +29,90 @@ def show_home_view():
         navigate_to_detail(search_query)
         st.rerun()
 
+    browse_mode = st.radio("Browse:", ["By Generation", "All Pokemon"], horizontal=True)
+    if browse_mode == "All Pokemon":
+        show_browse_all()
+        return
+
     # Generation Selector
     selected_gen = st.selectbox("Select Generation:", list(GENERATIONS.keys()))
     gen_params = GENERATIONS[selected_gen]
-    # Pokemon Grid
+    # Pokemon Grid (one component; tiles are rendered client-side)
     with st.spinner(f"Loading {selected_gen}..."):
         pokemon_list = get_pokemon_list(limit=gen_params['limit'], offset=gen_params['offset'])
-        
-        cols = st.columns(5)  # 5 columns grid
-        for i, pokemon in enumerate(pokemon_list):
-            # Extract ID from URL for image
-            p_id = pokemon['url'].split('/')[-2]
-            p_name = pokemon['name'].title()
-            
-            # URLs
-            gif_url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/showdown/{p_id}.gif"
-            png_url = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{p_id}.png"
-            
-            with cols[i % 5]:
-                # Use HTML object tag for fallback (avoids React onerror issues)
-                # Fixed height container for grid consistency
-                st.markdown(f"""
-                    <div style="display: flex; justify-content: center; align-items: center; height: 120px; margin-bottom: 10px;">
-                        <object data="{gif_url}" type="image/gif" style="max-width: 100px; max-height: 100px;">
-                            <img src="{png_url}" style="max-width: 100px; max-height: 100px;" />
-                        </object>
-                    </div>
-                """, unsafe_allow_html=True)
-                
-                if st.button(f"#{p_id} {p_name}", key=f"btn_{p_id}"):
-                    navigate_to_detail(pokemon['name'])
-                    st.rerun()
+    
+    selection = pokemon_grid(entries_from_list(pokemon_list), data_key=selected_gen, key="pokemon_grid")
+    handle_grid_selection(selection)
+
+
+def handle_grid_selection(selection):
+    """Navigate on a grid click (the component keeps its last value across reruns)"""
+    if selection and selection['nonce'] != st.session_state.get('grid_nonce'):
+        st.session_state.grid_nonce = selection['nonce']
+        navigate_to_detail(selection['name'])
+        st.rerun()
+
+
+def show_browse_all():
+    """Render the whole dex with server-side filtering, sorting and paging"""
+    if not is_dex_ready():
+        st.info("The full dex index is still being built in the background. Please check back shortly.")
+        return
+    
+    index = get_browse_index()
+    
+    # Filters
+    f_col1, f_col2, f_col3 = st.columns(3)
+    with f_col1:
+        types = st.multiselect("Types", sorted(TYPE_ID_MAP.keys()), format_func=str.title, max_selections=2)
+    with f_col2:
+        generations = st.multiselect("Generations", list(GENERATIONS.keys()))
+    with f_col3:
+        sort_labels = {"id": "Dex Number", "name": "Name", "total": "Base Stat Total"}
+        sort_labels.update({k: v['name'] for k, v in STAT_CONFIG.items()})
+        sort = st.selectbox("Sort by", SORT_KEYS, format_func=sort_labels.get)
+    
+    s_col1, s_col2, s_col3 = st.columns([1, 2, 1])
+    with s_col1:
+        range_stat = st.selectbox("Stat range", ["total"] + list(STAT_CONFIG.keys()), format_func=sort_labels.get)
+    with s_col2:
+        max_value = 800 if range_stat == "total" else 255
+        stat_range = st.slider("Range", 0, max_value, (0, max_value), label_visibility="hidden")
+    with s_col3:
+        descending = st.toggle("Descending")
+    
+    filters = {
+        'types': tuple(types),
+        'generations': tuple(generations),
+        'stat_ranges': {range_stat: stat_range} if stat_range != (0, max_value) else None,
+        'sort': sort,
+        'descending': descending,
+    }
+    
+    # Any filter change goes back to the first page
+    filter_key = repr(filters)
+    if st.session_state.get('browse_filters') != filter_key:
+        st.session_state.browse_filters = filter_key
+        st.session_state.browse_page = 0
+    
+    result = index.query(page=st.session_state.browse_page, page_size=BROWSE_PAGE_SIZE, **filters)
+    next_page = index.query(page=result['page'] + 1, page_size=BROWSE_PAGE_SIZE, **filters)
+    
+    st.caption(f"{result['total']} Pokemon · page {result['page'] + 1} of {result['pages']}")
+    
+    entries = [[r['id'], r['name']] for r in result['results']]
+    prefetch_ids = [r['id'] for r in next_page['results']] if next_page['page'] != result['page'] else []
+    selection = pokemon_grid(entries, data_key=f"{filter_key}:{result['page']}", key="browse_grid",
+                             prefetch_ids=prefetch_ids)
+    handle_grid_selection(selection)
+    
+    # Pager
+    p_col1, p_col2, p_col3 = st.columns([1, 3, 1])
+    with p_col1:
+        if st.button("← Previous", disabled=result['page'] == 0):
+            st.session_state.browse_page = result['page'] - 1
+            st.rerun()
+    with p_col3:
+        if st.button("Next →", disabled=result['page'] >= result['pages'] - 1):
+            st.session_state.browse_page = result['page'] + 1
+            st.rerun()
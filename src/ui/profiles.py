@@ -0,0 +1,87 @@
+"""
+Profiles View
+Admin page for browsing captured per-rerun profiles
+"""
+import time
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from src.services.profiling_service import list_profiles, load_profile, load_flame_graph
+
+
+def show_profiles_view():
+    """Render the captured profiles browser"""
+    st.title("⏱️ Profiles")
+    st.caption("Turn profiling on for a session with `?profile=1` (cProfile + sampling) "
+               "or `?profile=sampling`, and off with `?profile=off`.")
+
+    profiles = list_profiles()
+    if not profiles:
+        st.info("No profiles captured yet.")
+        return
+
+    views = sorted({p['view'] for p in profiles})
+    col1, col2 = st.columns(2)
+    with col1:
+        view_filter = st.multiselect("View", views, default=views)
+    with col2:
+        session_filter = st.text_input("Session id contains", "")
+    profiles = [
+        p for p in profiles
+        if p['view'] in view_filter and session_filter in (p.get('session') or "")
+    ]
+    if not profiles:
+        st.info("No profiles match the filters.")
+        return
+
+    st.dataframe(
+        [
+            {
+                'Captured': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(p['started'])),
+                'View': p['view'],
+                'Mode': p['mode'],
+                'Duration (ms)': round(p['duration'] * 1000, 1),
+                'Samples': p['samples'],
+                'Session': (p.get('session') or "")[:8],
+            }
+            for p in profiles
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    labels = {
+        p['id']: f"{p['id']} — {p['view']}, {p['duration'] * 1000:.0f} ms ({p['mode']})"
+        for p in profiles
+    }
+    selected = st.selectbox("Profile", list(labels), format_func=labels.get)
+    profile = load_profile(selected)
+    if not profile:
+        st.warning("This profile is no longer available.")
+        return
+
+    st.subheader("🔥 Flame Graph")
+    flame_graph = load_flame_graph(selected)
+    if flame_graph:
+        st.caption("Width is time on the stack; hover a frame for its share of samples.")
+        components.html(f'<div style="overflow-x: auto">{flame_graph}</div>', height=420, scrolling=True)
+    else:
+        st.caption("The rerun finished before any stack samples were taken.")
+
+    st.subheader("🔝 Hot Functions")
+    if profile['mode'] == "sampling":
+        st.caption("Estimated from stack samples; call counts are not available.")
+    st.dataframe(
+        [
+            {
+                'Function': row['function'],
+                'Calls': row['calls'],
+                'Own (ms)': round(row['own'] * 1000, 2),
+                'Cumulative (ms)': round(row['cumulative'] * 1000, 2),
+            }
+            for row in profile['top']
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
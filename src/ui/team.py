@@ -0,0 +1,80 @@
+"""
+Team Builder View
+Suggests team members that patch weaknesses and coverage gaps
+"""
+import streamlit as st
+
+from src.api.pokeapi_client import PokeAPIError
+from src.config.constants import GENERATIONS, TEAM_SIZE
+from src.services.dex_service import get_dex_table, is_dex_ready
+from src.services.team_service import get_team_index
+from src.services.sprite_service import sprite_url
+
+
+def _title(name):
+    return name.replace('-', ' ').title()
+
+
+def show_team_view():
+    """Render the team builder"""
+    st.title("🧩 Team Builder")
+    st.caption("Pick part of a team and get suggestions that cover its weaknesses and offensive gaps.")
+
+    if not is_dex_ready():
+        st.info("The full dex index is still being built in the background. Please check back shortly.")
+        return
+
+    table = get_dex_table()
+    names = sorted(r['name'] for r in table.snapshot())
+
+    team = st.multiselect("Current team", names, format_func=_title, max_selections=TEAM_SIZE - 1)
+    with st.expander("Constraints"):
+        col1, col2 = st.columns(2)
+        with col1:
+            banned = st.multiselect("Banned Pokemon", names, format_func=_title)
+            generations = st.multiselect("Generations", list(GENERATIONS.keys()))
+        with col2:
+            min_speed = st.slider("Minimum base Speed", 0, 200, 0, step=5)
+
+    try:
+        index = get_team_index()
+    except PokeAPIError:
+        st.warning("PokeAPI is busy right now. Please try again in a moment.")
+        return
+    result = index.suggest(team, banned=banned, min_speed=min_speed, generations=generations)
+
+    if team:
+        report = index.team_report([index.rows[n] for n in team if n in index.rows])
+        st.write("**Shared weaknesses:** " + (", ".join(t.title() for t in report['weaknesses']) or "None"))
+        st.write("**Not hit super effectively:** " + (", ".join(t.title() for t in report['uncovered']) or "None"))
+
+    if not result['picks']:
+        st.warning("No Pokemon match the constraints.")
+        return
+
+    st.subheader("Best Next Picks")
+    pick_cols = st.columns(len(result['picks']))
+    for i, pick in enumerate(result['picks']):
+        with pick_cols[i]:
+            img = sprite_url(table.get(pick['name'])['id'])
+            if img:
+                st.image(img, width=80)
+            st.write(f"**{_title(pick['name'])}**")
+            if pick['patches']:
+                st.caption("Covers: " + ", ".join(t.title() for t in pick['patches']))
+            if pick['adds_coverage']:
+                st.caption("Hits: " + ", ".join(t.title() for t in pick['adds_coverage']))
+
+    st.subheader("Suggested Teams")
+    for team_result in result['teams'][:3]:
+        with st.container(border=True):
+            member_cols = st.columns(TEAM_SIZE)
+            for i, member in enumerate(team_result['members']):
+                with member_cols[i]:
+                    img = sprite_url(table.get(member)['id'])
+                    if img:
+                        st.image(img, width=64)
+                    st.caption(_title(member))
+            weaknesses = ", ".join(t.title() for t in team_result['weaknesses']) or "None"
+            uncovered = ", ".join(t.title() for t in team_result['uncovered']) or "None"
+            st.caption(f"Score {team_result['score']:.1f} · Weak to: {weaknesses} · Not covered: {uncovered}")
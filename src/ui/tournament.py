@@ -0,0 +1,144 @@
+"""
+Tournament View
+Round-robin 1v1s between a pool of configured sets
+"""
+import json
+
+import streamlit as st
+
+from src.api.pokeapi_client import PokeAPIError
+from src.config.constants import TOURNAMENT_MAX_SETS
+from src.services.tournament_service import prepare_sides, iter_tournament, summarize
+
+
+def _title(name):
+    return name.replace('-', ' ').title()
+
+
+def _pool():
+    if 'tournament_pool' not in st.session_state:
+        st.session_state.tournament_pool = []
+    return st.session_state.tournament_pool
+
+
+def _add_to_pool(pokemon_set):
+    """
+    Add a battle card set ({'name', 'nature', 'evs', 'moves', 'item', ...}) to the pool
+
+    Returns:
+        bool: False if the set has no name, its moves aren't a list of names,
+              or the pool is full
+    """
+    pool = _pool()
+    if not isinstance(pokemon_set, dict) or not isinstance(pokemon_set.get('name'), str) or not pokemon_set['name']:
+        return False
+    moves = pokemon_set.get('moves') or []
+    if not isinstance(moves, list) or not all(isinstance(m, str) for m in moves):
+        return False
+    if len(pool) >= TOURNAMENT_MAX_SETS:
+        return False
+    pool.append({k: pokemon_set.get(k) for k in ('name', 'nature', 'evs', 'moves', 'item', 'stats')})
+    return True
+
+
+def _render_pool_editor(pool):
+    col1, col2 = st.columns(2)
+    with col1:
+        battle_sets = [st.session_state.get(f"battle_set_{k}") for k in ("1", "2")]
+        battle_sets = [s for s in battle_sets if s and s.get('name')]
+        if st.button("➕ Add Battle Analyzer sets", disabled=not battle_sets):
+            for pokemon_set in battle_sets:
+                _add_to_pool(pokemon_set)
+            st.rerun()
+    with col2:
+        if st.button("🗑️ Clear pool", disabled=not pool):
+            pool.clear()
+            st.rerun()
+
+    uploaded = st.file_uploader("Or load sets from JSON (a list of sets)", type="json")
+    if uploaded is not None and st.button("Load file"):
+        # No rerun here: the pool table below already shows the new sets, and a
+        # rerun would hide the messages
+        try:
+            sets = json.load(uploaded)
+        except ValueError:
+            sets = None
+        if not isinstance(sets, list):
+            st.error("The file must be a JSON list of sets with at least a 'name' each.")
+            return
+        rejected = sum(1 for pokemon_set in sets if not _add_to_pool(pokemon_set))
+        if rejected:
+            st.warning(f"{rejected} of {len(sets)} sets were not added (no 'name', 'moves' not a list "
+                       f"of move names, or the pool already holds {TOURNAMENT_MAX_SETS} sets).")
+
+
+def show_tournament_view():
+    """Render the tournament runner"""
+    st.title("🏆 Tournament")
+    st.caption("Every set fights every other set in a 1v1 using damage math only (no AI calls): "
+               "both sides use their fastest KO move, and high and low damage rolls are averaged.")
+
+    pool = _pool()
+    _render_pool_editor(pool)
+
+    if not pool:
+        st.info("Add sets from the Battle Analyzer or load a JSON file to start.")
+        return
+
+    st.dataframe(
+        [
+            {
+                'Pokemon': _title(s['name']),
+                'Nature': s.get('nature') or "Hardy",
+                'Item': s.get('item') or "None",
+                'Moves': ", ".join(_title(m) for m in s.get('moves') or []) or "Best STAB (assumed)",
+            }
+            for s in pool
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    if len(pool) < 2 or not st.button("🚀 Run Tournament", type="primary"):
+        return
+
+    sides, skipped = prepare_sides(pool)
+    if skipped:
+        st.warning(f"Skipped sets: {'; '.join(skipped)}")
+    if len(sides) < 2:
+        st.info("At least two valid sets are needed to run a tournament.")
+        return
+    total = len(sides) * (len(sides) - 1) // 2
+    progress = st.progress(0.0, text=f"0/{total} matchups")
+    results = []
+    try:
+        for chunk in iter_tournament(sides):
+            results.extend(chunk)
+            progress.progress(len(results) / total, text=f"{len(results)}/{total} matchups")
+    except PokeAPIError:
+        st.warning("PokeAPI is busy right now. Please try again in a moment.")
+        return
+    summary = summarize(sides, results)
+
+    st.subheader("Ranking")
+    st.dataframe(
+        [
+            {'#': rank, 'Set': row['label'], 'Win rate': f"{row['win_rate'] * 100:.1f}%",
+             'W': row['wins'], 'D': row['draws'], 'L': row['losses']}
+            for rank, row in enumerate(summary['ranking'], 1)
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    st.subheader("Win-Rate Matrix")
+    st.caption("Row's share of the 1v1 against the column.")
+    import plotly.graph_objects as go
+    labels = [side['label'] for side in sides]
+    fig = go.Figure(go.Heatmap(z=summary['matrix'], x=labels, y=labels, zmin=0, zmax=1,
+                               colorscale="RdYlGn", hovertemplate="%{y} vs %{x}: %{z:.2f}<extra></extra>"))
+    fig.update_layout(height=max(400, 18 * len(labels)), yaxis=dict(autorange="reversed"))
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.download_button("Download results (JSON)", json.dumps({'labels': labels, **summary}),
+                       file_name="tournament.json", mime="application/json")
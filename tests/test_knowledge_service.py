@@ -0,0 +1,72 @@
+"""
+Tests for the local fact router in knowledge_service
+"""
+import pytest
+
+from src.services import knowledge_service
+from src.services.knowledge_service import BM25Index, build_fact_documents, answer_locally
+
+CHARIZARD = {
+    'name': 'charizard',
+    'height': 17,
+    'weight': 905,
+    'species': {'name': 'charizard', 'url': "https://pokeapi.co/api/v2/pokemon-species/6/"},
+    'types': [{'slot': 1, 'type': {'name': 'fire'}}, {'slot': 2, 'type': {'name': 'flying'}}],
+    'abilities': [
+        {'ability': {'name': 'blaze'}, 'is_hidden': False},
+        {'ability': {'name': 'solar-power'}, 'is_hidden': True},
+    ],
+    'stats': [{'stat': {'name': name}, 'base_stat': value} for name, value in (
+        ('hp', 78), ('attack', 84), ('defense', 78),
+        ('special-attack', 109), ('special-defense', 85), ('speed', 100),
+    )],
+}
+
+CHARIZARD_SPECIES = {
+    'name': 'charizard',
+    'capture_rate': 45,
+    'gender_rate': 1,
+    'flavor_text_entries': [
+        {'flavor_text': "Spits fire that is hot enough to melt boulders.", 'language': {'name': 'en'}},
+    ],
+}
+
+CHARIZARD_FAMILY = [
+    {'name': 'charmander', 'id': 4, 'stage': 0, 'from': None, 'condition': None},
+    {'name': 'charmeleon', 'id': 5, 'stage': 1, 'from': 'charmander', 'condition': "level-up, level 16"},
+    {'name': 'charizard', 'id': 6, 'stage': 2, 'from': 'charmeleon', 'condition': "level-up, level 36"},
+]
+
+
+@pytest.fixture(autouse=True)
+def charizard_index(monkeypatch):
+    index = BM25Index(build_fact_documents(CHARIZARD, CHARIZARD_SPECIES, CHARIZARD_FAMILY))
+    monkeypatch.setattr(knowledge_service, "get_fact_index", lambda name: index)
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("what type is charizard", "is **Fire / Flying** type"),
+    ("how tall is it", "**1.7 m** tall"),
+    ("how heavy is charizard", "weighs **90.5 kg**"),
+    ("what is its hidden ability", "hidden ability is **Solar Power**"),
+    ("what is charizard's base speed", "base Speed is **100**"),
+    ("what is its catch rate", "capture rate is **45**"),
+    ("what does it evolve from", "evolves from **Charmeleon**"),
+    ("what does it evolve into", "does not evolve any further"),
+])
+def test_answers_simple_fact_questions(question, expected):
+    assert expected in answer_locally("charizard", question)
+
+
+@pytest.mark.parametrize("question", [
+    "what types is it weak to?",
+    "which type resists it",
+    "what is its weakness to water type",
+    "what attack moves does it learn",
+    "where can i catch it",
+    "what level does it evolve",
+    "is charizard a good pick for my team",
+    "",
+])
+def test_leaves_other_questions_to_the_llm(question):
+    assert answer_locally("charizard", question) is None